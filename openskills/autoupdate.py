@@ -0,0 +1,161 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import click
+
+from openskills.dirs import get_locks_dir, get_state_dir
+from openskills.locks import file_lock
+
+AUTO_UPDATE_ENV = 'OPENSKILLS_AUTO_UPDATE'
+AUTO_UPDATE_INTERVAL_ENV = 'OPENSKILLS_AUTO_UPDATE_INTERVAL'
+DEFAULT_AUTO_UPDATE_INTERVAL = 6 * 3600
+WORKER_ENV = 'OPENSKILLS_AUTO_UPDATE_WORKER'
+
+STAMP_FILE_NAME = 'autoupdate.stamp'
+SUMMARY_FILE_NAME = 'autoupdate.json'
+
+
+def is_auto_update_enabled() -> bool:
+    if os.environ.get(WORKER_ENV):
+        return False
+    return os.environ.get(AUTO_UPDATE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_auto_update_interval() -> int:
+    raw = os.environ.get(AUTO_UPDATE_INTERVAL_ENV, '').strip()
+    if not raw:
+        return DEFAULT_AUTO_UPDATE_INTERVAL
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return DEFAULT_AUTO_UPDATE_INTERVAL
+
+
+def get_stamp_path() -> str:
+    return os.path.join(get_state_dir(), STAMP_FILE_NAME)
+
+
+def get_summary_path() -> str:
+    return os.path.join(get_state_dir(), SUMMARY_FILE_NAME)
+
+
+def touch_stamp() -> None:
+    with open(get_stamp_path(), 'a', encoding='utf-8'):
+        pass
+    os.utime(get_stamp_path())
+
+
+def is_stamp_fresh(interval: int | None = None) -> bool:
+    interval = get_auto_update_interval() if interval is None else interval
+    try:
+        return time.time() - os.stat(get_stamp_path()).st_mtime < interval
+    except OSError:
+        return False
+
+
+def spawn_worker() -> None:
+    env = dict(os.environ, **{WORKER_ENV: '1'})
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+
+    subprocess.Popen(
+        [sys.executable, '-m', 'openskills.autoupdate'],
+        cwd=os.getcwd(),
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs
+    )
+
+
+def maybe_spawn_auto_update() -> bool:
+    # Called after every command, so the common path is one stat() call.
+    if not is_auto_update_enabled() or is_stamp_fresh():
+        return False
+
+    # Stamp first so concurrent commands don't each start a worker.
+    touch_stamp()
+    try:
+        spawn_worker()
+    except OSError:
+        return False
+    return True
+
+
+def write_summary(summary: dict) -> None:
+    path = get_summary_path()
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_summary() -> dict | None:
+    try:
+        with open(get_summary_path(), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def run_worker() -> None:
+    from openskills.updater import run_quiet_update
+
+    with file_lock(os.path.join(get_locks_dir(), 'autoupdate.lock'), blocking=False) as acquired:
+        if not acquired:
+            return
+
+        started_at = time.time()
+        try:
+            summary = run_quiet_update()
+        except SystemExit as e:
+            # Update code paths shared with the CLI may sys.exit on fatal errors.
+            summary = {'updated': [], 'up_to_date': 0, 'failed': [], 'error': f"update exited with status {e.code}"}
+        except Exception as e:
+            summary = {'updated': [], 'up_to_date': 0, 'failed': [], 'error': str(e)}
+
+        summary.update({
+            'cwd': os.getcwd(),
+            'started_at': started_at,
+            'finished_at': time.time(),
+            'shown': False,
+        })
+        write_summary(summary)
+        touch_stamp()
+
+
+def show_summary() -> None:
+    summary = read_summary()
+    # The worker updated the project skills of the directory it ran in, so its
+    # summary belongs to that directory only.
+    if not summary or summary.get('shown') or summary.get('cwd') != os.getcwd():
+        return
+
+    updated = summary.get('updated') or []
+    failed = summary.get('failed') or []
+    if summary.get('error'):
+        click.echo(click.style(f"\nBackground update failed: {summary['error']}", fg='yellow'))
+    elif updated or failed:
+        parts = []
+        if updated:
+            parts.append(f"{len(updated)} updated ({', '.join(updated)})")
+        if failed:
+            parts.append(f"{len(failed)} failed ({', '.join(failed)})")
+        click.echo(click.style(f"\nBackground update: {'; '.join(parts)}", fg='cyan'))
+
+    summary['shown'] = True
+    write_summary(summary)
+
+
+if __name__ == '__main__':
+    run_worker()
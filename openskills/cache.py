@@ -0,0 +1,350 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+import click
+
+from openskills.dirs import get_cache_dir
+from openskills.locks import cache_lock
+from openskills.models import CacheEntry
+
+CACHE_TTL_ENV = 'OPENSKILLS_CACHE_TTL'
+DEFAULT_CACHE_TTL = 300
+CACHE_MAX_BYTES_ENV = 'OPENSKILLS_CACHE_MAX_BYTES'
+DEFAULT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+REMOTE_HEAD_TIMEOUT = 15
+CACHE_ENTRY_SUFFIX = '.json'
+
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def get_cache_key(repo_url: str) -> str:
+    return hashlib.sha256(repo_url.encode()).hexdigest()[:16]
+
+
+def get_cache_path(repo_url: str) -> str:
+    return os.path.join(get_cache_dir(), get_cache_key(repo_url))
+
+
+def get_cache_ttl() -> int:
+    raw = os.environ.get(CACHE_TTL_ENV, '').strip()
+    if not raw:
+        return DEFAULT_CACHE_TTL
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return DEFAULT_CACHE_TTL
+
+
+def parse_size(text: str) -> int:
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*', text.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def get_cache_max_bytes() -> int:
+    raw = os.environ.get(CACHE_MAX_BYTES_ENV, '').strip()
+    if not raw:
+        return DEFAULT_CACHE_MAX_BYTES
+    try:
+        return parse_size(raw)
+    except ValueError:
+        return DEFAULT_CACHE_MAX_BYTES
+
+
+def get_repo_commit(repo_dir: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=repo_dir,
+            check=True,
+            capture_output=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.decode().strip() or None
+
+
+def get_remote_head(repo_url: str) -> tuple[str | None, str]:
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+    try:
+        result = subprocess.run(
+            ['git', 'ls-remote', repo_url, 'HEAD'],
+            check=True,
+            capture_output=True,
+            timeout=REMOTE_HEAD_TIMEOUT,
+            env=env
+        )
+    except subprocess.TimeoutExpired:
+        return None, 'timed out'
+    except subprocess.CalledProcessError as e:
+        return None, e.stderr.decode().strip().splitlines()[-1] if e.stderr else 'ls-remote failed'
+
+    output = result.stdout.decode().split()
+    return (output[0], '') if output else (None, 'no HEAD on remote')
+
+
+def has_commit(repo_dir: str, commit: str) -> bool:
+    result = subprocess.run(
+        ['git', 'cat-file', '-e', f'{commit}^{{commit}}'],
+        cwd=repo_dir,
+        capture_output=True
+    )
+    return result.returncode == 0
+
+
+def _entry_path(cache_path: str) -> str:
+    return os.path.normpath(cache_path) + CACHE_ENTRY_SUFFIX
+
+
+def read_cache_entry(cache_path: str) -> dict:
+    try:
+        with open(_entry_path(cache_path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def write_cache_entry(cache_path: str, **fields) -> dict:
+    entry = read_cache_entry(cache_path)
+    entry.update(fields)
+
+    entry_path = _entry_path(cache_path)
+    tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, indent=2)
+    os.replace(tmp_path, entry_path)
+    return entry
+
+
+def _measure_tree(path: str) -> int:
+    size = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return size
+
+
+def mark_cache_fetched(cache_path: str, repo_url: str) -> None:
+    now = time.time()
+    write_cache_entry(
+        cache_path,
+        repo_url=repo_url,
+        fetched_at=now,
+        accessed_at=now,
+        size=_measure_tree(cache_path),
+    )
+
+
+def touch_cache_entry(cache_path: str) -> None:
+    write_cache_entry(cache_path, accessed_at=time.time())
+
+
+def get_cache_age(cache_path: str) -> float | None:
+    fetched_at = read_cache_entry(cache_path).get('fetched_at')
+    if not isinstance(fetched_at, (int, float)):
+        return None
+    return max(time.time() - fetched_at, 0.0)
+
+
+def is_cache_fresh(cache_path: str, ttl: int | None = None) -> bool:
+    if not os.path.isdir(cache_path):
+        return False
+    ttl = get_cache_ttl() if ttl is None else ttl
+    if ttl <= 0:
+        return False
+    age = get_cache_age(cache_path)
+    return age is not None and age < ttl
+
+
+def remove_cache_entry(cache_path: str) -> None:
+    try:
+        os.remove(_entry_path(cache_path))
+    except FileNotFoundError:
+        pass
+
+
+def _entry_from_ledger(cache_dir: str, key: str) -> CacheEntry:
+    cache_path = os.path.join(cache_dir, key)
+    data = read_cache_entry(cache_path)
+
+    if not isinstance(data.get('size'), int):
+        # Clones made before the ledger existed are measured once and recorded.
+        data = write_cache_entry(cache_path, size=_measure_tree(cache_path))
+
+    accessed_at = data.get('accessed_at')
+    if not isinstance(accessed_at, (int, float)):
+        accessed_at = data.get('fetched_at')
+
+    return CacheEntry(
+        key=key,
+        path=cache_path,
+        repo_url=data.get('repo_url'),
+        size=data['size'],
+        fetched_at=data.get('fetched_at'),
+        accessed_at=accessed_at,
+    )
+
+
+def list_cache_entries() -> list[CacheEntry]:
+    cache_dir = get_cache_dir()
+    entries = []
+
+    with os.scandir(cache_dir) as it:
+        keys = sorted(e.name for e in it if e.is_dir(follow_symlinks=False))
+
+    for key in keys:
+        entries.append(_entry_from_ledger(cache_dir, key))
+
+    return entries
+
+
+def evict_cache_entry(entry: CacheEntry) -> bool:
+    # Entries being fetched or read by another process are skipped, not waited on.
+    with cache_lock(entry.path, blocking=False) as acquired:
+        if not acquired:
+            return False
+        shutil.rmtree(entry.path, ignore_errors=True)
+        remove_cache_entry(entry.path)
+        return True
+
+
+def gc_cache_entries(max_bytes: int | None = None, keep: set[str] | None = None) -> list[CacheEntry]:
+    budget = get_cache_max_bytes() if max_bytes is None else max_bytes
+    keep = keep or set()
+
+    entries = list_cache_entries()
+    total = sum(e.size for e in entries)
+    evicted = []
+
+    for entry in sorted(entries, key=lambda e: e.accessed_at or 0):
+        if total <= budget:
+            break
+        if os.path.normpath(entry.path) in keep:
+            continue
+        if not evict_cache_entry(entry):
+            continue
+        evicted.append(entry)
+        total -= entry.size
+
+    return evicted
+
+
+def enforce_cache_budget(in_use: str) -> list[CacheEntry]:
+    return gc_cache_entries(keep={os.path.normpath(in_use)})
+
+
+def refresh_cached_repo(repo_url: str, cache_path: str) -> None:
+    # Callers hold cache_lock(cache_path). Raises CalledProcessError when the
+    # repository cannot be cloned.
+    if os.path.isdir(cache_path):
+        try:
+            # Fetching origin's HEAD works whatever the default branch is called.
+            subprocess.run(
+                ['git', 'fetch', '--quiet', '--depth', '1', 'origin', 'HEAD'],
+                cwd=cache_path,
+                check=True,
+                capture_output=True
+            )
+            subprocess.run(
+                ['git', 'reset', '--quiet', '--hard', 'FETCH_HEAD'],
+                cwd=cache_path,
+                check=True,
+                capture_output=True
+            )
+        except subprocess.CalledProcessError:
+            shutil.rmtree(cache_path, ignore_errors=True)
+            remove_cache_entry(cache_path)
+
+    if not os.path.isdir(cache_path):
+        subprocess.run(
+            ['git', 'clone', '--depth', '1', '--quiet', repo_url, cache_path],
+            check=True,
+            capture_output=True
+        )
+
+    mark_cache_fetched(cache_path, repo_url)
+    enforce_cache_budget(cache_path)
+
+
+def clear_cache_entries() -> list[CacheEntry]:
+    return [entry for entry in list_cache_entries() if evict_cache_entry(entry)]
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
+
+
+def _format_age(timestamp: float | None) -> str:
+    if not timestamp:
+        return 'never'
+    seconds = int(max(time.time() - timestamp, 0))
+    if seconds < 60:
+        return f'{seconds}s ago'
+    if seconds < 3600:
+        return f'{seconds // 60}m ago'
+    if seconds < 86400:
+        return f'{seconds // 3600}h ago'
+    return f'{seconds // 86400}d ago'
+
+
+def cache_list() -> None:
+    entries = list_cache_entries()
+
+    if not entries:
+        click.echo("Cache is empty.")
+        return
+
+    for entry in sorted(entries, key=lambda e: e.accessed_at or 0, reverse=True):
+        label = entry.repo_url or click.style('(unknown repo)', dim=True)
+        click.echo(f"  {entry.key}  {_format_size(entry.size).rjust(8)}  {_format_age(entry.accessed_at).rjust(8)}  {label}")
+
+    total = sum(e.size for e in entries)
+    budget = get_cache_max_bytes()
+    click.echo(click.style(
+        f"\nSummary: {len(entries)} cached repo(s), {_format_size(total)} of {_format_size(budget)} budget",
+        dim=True
+    ))
+
+
+def cache_gc(max_size: str | None = None) -> None:
+    max_bytes = parse_size(max_size) if max_size else None
+    evicted = gc_cache_entries(max_bytes)
+
+    if not evicted:
+        click.echo(click.style("Cache is within budget, nothing to evict.", fg='green'))
+        return
+
+    for entry in evicted:
+        click.echo(f"  Evicted: {entry.repo_url or entry.key} ({_format_size(entry.size)})")
+    freed = sum(e.size for e in evicted)
+    click.echo(click.style(f"\n✅ Evicted {len(evicted)} repo(s), freed {_format_size(freed)}", fg='green'))
+
+
+def cache_clear() -> None:
+    removed = clear_cache_entries()
+    freed = sum(e.size for e in removed)
+    click.echo(click.style(f"✅ Cleared {len(removed)} cached repo(s), freed {_format_size(freed)}", fg='green'))
@@ -1,12 +1,24 @@
+import json
+
 import click
 
 from openskills.models import InstallOptions
 from openskills.finder import find_all_skills, find_skill
-from openskills.installer import install_skill
-from openskills.updater import update_skills
+from openskills.installer import install_from_lockfile, install_missing_recommendations, install_skill
+from openskills.updater import update_skills, check_updates
+from openskills.verifier import verify_skills
 from openskills.remover import remove_skill, manage_skills
 from openskills.market import market_list, market_search
-from openskills.recommends import resolve_recommendation_tree, check_recommendations
+from openskills.recommends import (
+    build_recommendation_graph,
+    check_recommendation_graph,
+    check_recommendations,
+    export_recommendation_graph,
+    graph_recommendation_trees,
+)
+from openskills.cache import cache_list, cache_gc, cache_clear
+from openskills.sync import sync_skills, MANIFEST_FILE_NAME
+from openskills.autoupdate import is_auto_update_enabled, maybe_spawn_auto_update, show_summary, touch_stamp
 
 
 def _terminal_link(url: str, text: str | None = None) -> str:
@@ -47,21 +59,35 @@ def cli(ctx, version):
 
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
+        return
+
+    # Runs after the command finishes; the refresh itself happens in a detached process.
+    ctx.call_on_close(maybe_spawn_auto_update)
 
 
 @cli.command('list')
 def list_cmd():
     """List all installed skills"""
     _list_skills()
+    show_summary()
 
 
 @cli.command()
-@click.argument('source')
+@click.argument('source', required=False)
 @click.option('--global', 'global_install', is_flag=True, help='Install globally (default: project)')
 @click.option('--yes', '-y', is_flag=True, help='Skip interactive selection, install all')
-def install(source, global_install, yes):
+@click.option('--offline', is_flag=True, help='Install strictly from the local repository cache')
+@click.option('--frozen', is_flag=True, help='Install exactly the skills pinned in openskills.lock')
+def install(source, global_install, yes, offline, frozen):
     """Install skill from git URL, local path, or market name"""
-    options = InstallOptions(global_install=global_install, yes=yes)
+    options = InstallOptions(global_install=global_install, yes=yes, offline=offline)
+    if frozen:
+        if source or global_install:
+            raise click.UsageError("--frozen installs the project lockfile and takes no SOURCE or --global")
+        install_from_lockfile(options)
+        return
+    if not source:
+        raise click.UsageError("Missing argument 'SOURCE'.")
     install_skill(source, options)
 
 
@@ -81,9 +107,34 @@ def rm(skill_name):
 
 @cli.command()
 @click.argument('skill_names', nargs=-1)
-def update(skill_names):
+@click.option('--check', is_flag=True, help='Only report skills with upstream changes (no downloads)')
+@click.option('--verify', is_flag=True, help='Re-hash installed files instead of trusting recorded fingerprints')
+def update(skill_names, check, verify):
     """Update installed skills from their source (default: all)"""
-    update_skills(list(skill_names) if skill_names else None)
+    if check:
+        check_updates(list(skill_names) if skill_names else None)
+        return
+    update_skills(list(skill_names) if skill_names else None, verify=verify)
+    if is_auto_update_enabled():
+        touch_stamp()
+
+
+@cli.command()
+@click.argument('skill_names', nargs=-1)
+@click.option('--deep', is_flag=True, help='Re-hash every file, even those whose size and mtime are unchanged')
+def verify(skill_names, deep):
+    """Check installed skills against the file hashes recorded at install"""
+    verify_skills(list(skill_names) if skill_names else None, deep=deep)
+
+
+@cli.command()
+@click.option('--file', '-f', 'manifest', default=MANIFEST_FILE_NAME, show_default=True, help='Manifest declaring the skill set')
+@click.option('--yes', '-y', is_flag=True, help='Remove undeclared skills without confirmation')
+@click.option('--dry-run', is_flag=True, help='Show the plan without changing anything')
+@click.option('--offline', is_flag=True, help='Install strictly from the local repository cache')
+def sync(manifest, yes, dry_run, offline):
+    """Install, update and remove skills to match a manifest"""
+    sync_skills(manifest, yes=yes, dry_run=dry_run, offline=offline)
 
 
 @cli.command()
@@ -112,6 +163,38 @@ def search(keyword):
     market_search(keyword)
 
 
+@cli.group()
+def cache():
+    """Manage the local git repository cache"""
+    pass
+
+
+@cache.command('ls')
+def cache_ls_cmd():
+    """List cached repositories by last use"""
+    cache_list()
+
+
+@cache.command('gc')
+@click.option('--max-size', help='Byte budget to shrink to, e.g. 500MB (default: OPENSKILLS_CACHE_MAX_BYTES)')
+def cache_gc_cmd(max_size):
+    """Evict least recently used repositories over the size budget"""
+    try:
+        cache_gc(max_size)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='--max-size')
+
+
+@cache.command('clear')
+@click.option('--yes', '-y', is_flag=True, help='Skip confirmation')
+def cache_clear_cmd(yes):
+    """Remove every cached repository"""
+    if not yes and not click.confirm("Remove all cached repositories?", default=False):
+        click.echo(click.style("Aborted.", fg='yellow'))
+        return
+    cache_clear()
+
+
 @cli.group()
 def recommends():
     """Manage skill recommendations"""
@@ -139,20 +222,27 @@ def recommends_check(skill_name):
             click.echo(f"  {skill_name} has no recommendations")
     else:
         skills = find_all_skills()
+        # One graph for every installed skill; no per-recommendation lookups.
+        report = check_recommendation_graph(build_recommendation_graph(skills))
         issues = 0
         ok = 0
         for skill in skills:
-            results = check_recommendations(skill.path)
-            if results["missing"]:
+            missing = report["missing"].get(skill.name)
+            if missing:
                 issues += 1
                 click.echo(click.style(f"✗ {skill.name} has uninstalled recommendations:", fg='red'))
-                for rec in results["missing"]:
+                for rec in missing:
                     link = _terminal_link(rec.source, _format_source(rec.source))
                     click.echo(f"    - {click.style(rec.name, bold=True)} ({link})")
-            elif results["satisfied"]:
+            elif report["satisfied"].get(skill.name):
                 ok += 1
                 click.echo(click.style(f"✓ {skill.name} - all recommendations satisfied", fg='green'))
-        click.echo(click.style(f"\nSummary: {issues} skill(s) with uninstalled recommendations, {ok} skill(s) OK", dim=True))
+        for cycle in report["cycles"]:
+            click.echo(click.style(f"⟳ Circular recommendation between: {', '.join(cycle)}", fg='yellow'))
+        summary = f"\nSummary: {issues} skill(s) with uninstalled recommendations, {ok} skill(s) OK"
+        if report["cycles"]:
+            summary += f", {len(report['cycles'])} cycle(s)"
+        click.echo(click.style(summary, dim=True))
 
 
 @recommends.command('tree')
@@ -164,21 +254,33 @@ def recommends_tree(skill_name):
         if not skill:
             click.echo(f"Error: Skill '{skill_name}' not found")
             return
-        tree = resolve_recommendation_tree(skill.base_dir)
-        click.echo(_format_tree(tree))
+        # Same graph as the full listing, so cycles render instead of raising.
+        graph = build_recommendation_graph()
+        click.echo(_format_tree(graph_recommendation_trees(graph, [skill_name])[0]))
     else:
-        skills = find_all_skills()
-        for skill in sorted(skills, key=lambda s: s.name):
-            tree = resolve_recommendation_tree(skill.path)
+        skills = sorted(find_all_skills(), key=lambda s: s.name)
+        graph = build_recommendation_graph(skills)
+        for tree in graph_recommendation_trees(graph, [skill.name for skill in skills]):
             click.echo(_format_tree(tree))
 
 
+@recommends.command('graph')
+@click.option('--format', 'fmt', type=click.Choice(['dot', 'json']), default='dot', show_default=True, help='Output format')
+def recommends_graph(fmt):
+    """Export the recommendation graph of all installed skills"""
+    data = export_recommendation_graph(build_recommendation_graph())
+    if fmt == 'json':
+        click.echo(json.dumps(data, indent=2))
+    else:
+        click.echo(_format_dot(data))
+
+
 @recommends.command('install')
 @click.argument('skill_name')
 @click.option('--yes', '-y', is_flag=True, help='Skip confirmation')
-def recommends_install(skill_name, yes):
+@click.option('--offline', is_flag=True, help='Install strictly from the local repository cache')
+def recommends_install(skill_name, yes, offline):
     """Install missing recommendations for a skill"""
-    from openskills.installer import prompt_for_selection
     skill = find_skill(skill_name)
     if not skill:
         click.echo(f"Error: Skill '{skill_name}' not found")
@@ -188,40 +290,11 @@ def recommends_install(skill_name, yes):
         click.echo(click.style("All recommendations already satisfied.", fg='green'))
         return
 
-    click.echo(click.style("Missing recommendations:", bold=True))
-    for rec in results["missing"]:
-        link = _terminal_link(rec.source, _format_source(rec.source))
-        click.echo(f"  - {click.style(rec.name, bold=True)} ({link})")
-
-    satisfied = results.get("satisfied", [])
-    if satisfied:
-        click.echo(click.style("Already installed:", fg='green'))
-        for rec in satisfied:
-            click.echo(f"  ✓ {rec.name}")
-
-    if yes:
-        to_install = [rec.name for rec in results["missing"]]
-    else:
-        choices = [
-            {
-                'name': f"{rec.name} ({_format_source(rec.source)})",
-                'value': rec.name,
-                'checked': True
-            }
-            for rec in results["missing"]
-        ]
-        to_install = prompt_for_selection('Select recommendations to install', choices)
-
-    if not to_install:
-        click.echo(click.style("No recommendations selected.", fg='yellow'))
-        return
-
-    options = InstallOptions(yes=yes)
-    source_map = {rec.name: rec.source for rec in results["missing"]}
-    for name in to_install:
-        source = source_map.get(name, "")
-        click.echo(f"  Installing: {click.style(name, bold=True)}")
-        install_skill(source, options)
+    install_missing_recommendations(
+        [{'name': rec.name, 'source': rec.source} for rec in results["missing"]],
+        [rec.name for rec in results.get("satisfied", [])],
+        InstallOptions(yes=yes, offline=offline),
+    )
 
 
 @recommends.command('add')
@@ -285,8 +358,13 @@ def recommends_add(skill_name):
 def _format_tree(node: dict, prefix: str = "", is_last: bool = True) -> str:
     lines = []
     connector = "└── " if is_last else "├── "
+    label = node['name']
+    if node.get('cycle'):
+        label += " (cycle)"
+    elif node.get('seen'):
+        label += " (see above)"
     if prefix:
-        lines.append(f"{prefix}{connector}{node['name']}")
+        lines.append(f"{prefix}{connector}{label}")
     else:
         lines.append(node['name'])
 
@@ -306,6 +384,18 @@ def _format_tree(node: dict, prefix: str = "", is_last: bool = True) -> str:
     return "\n".join(lines)
 
 
+def _format_dot(data: dict) -> str:
+    lines = ["digraph recommends {", "  rankdir=LR;"]
+    for node in data["nodes"]:
+        attrs = ' [style=dashed, color=red]' if node["status"] == "missing" else ''
+        lines.append(f"  {json.dumps(node['name'])}{attrs};")
+    for edge in data["edges"]:
+        attrs = f" [tooltip={json.dumps(edge['source'])}]" if edge["source"] else ''
+        lines.append(f"  {json.dumps(edge['from'])} -> {json.dumps(edge['to'])}{attrs};")
+    lines.append("}")
+    return "\n".join(lines)
+
+
 def _list_skills():
     click.echo(click.style('Available Skills:\n', bold=True))
 
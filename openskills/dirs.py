@@ -17,7 +17,25 @@ def get_search_dirs() -> list[str]:
     ]
 
 
+def get_state_dir() -> str:
+    state_dir = os.path.join(str(Path.home()), '.openskills')
+    os.makedirs(state_dir, exist_ok=True)
+    return state_dir
+
+
 def get_cache_dir() -> str:
     cache_dir = os.path.join(str(Path.home()), '.openskills', 'cache')
     os.makedirs(cache_dir, exist_ok=True)
     return cache_dir
+
+
+def get_locks_dir() -> str:
+    locks_dir = os.path.join(str(Path.home()), '.openskills', 'locks')
+    os.makedirs(locks_dir, exist_ok=True)
+    return locks_dir
+
+
+def get_registry_dir() -> str:
+    registry_dir = os.path.join(str(Path.home()), '.openskills', 'registry')
+    os.makedirs(registry_dir, exist_ok=True)
+    return registry_dir
@@ -2,7 +2,8 @@ import os
 
 from openskills.models import Skill, SkillLocationInfo
 from openskills.dirs import get_search_dirs
-from openskills.yaml_utils import extract_yaml_field
+from openskills.registry import scan_directory
+from openskills.skilldb import list_indexed_skills
 
 
 def normalize_skill_names(skill_names: str | list[str]) -> list[str]:
@@ -34,31 +35,25 @@ def find_all_skills() -> list[Skill]:
         if not os.path.exists(directory):
             continue
 
-        try:
-            entries = os.scandir(directory)
-        except OSError:
-            continue
-
-        for entry in entries:
-            if is_directory_or_symlink_to_directory(entry, directory):
-                if entry.name in seen:
-                    continue
+        is_project_local = os.getcwd() in directory
 
-                skill_path = os.path.join(directory, entry.name, 'SKILL.md')
-                if os.path.exists(skill_path):
-                    with open(skill_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+        # Only skills whose SKILL.md changed since the last scan are re-read.
+        entries = list_indexed_skills(directory)
+        if entries is None:
+            entries = scan_directory(directory)
 
-                    is_project_local = os.getcwd() in directory
+        for name, description in entries:
+            if name in seen:
+                continue
 
-                    skills.append(Skill(
-                        name=entry.name,
-                        description=extract_yaml_field(content, 'description'),
-                        location='project' if is_project_local else 'global',
-                        path=os.path.join(directory, entry.name)
-                    ))
+            skills.append(Skill(
+                name=name,
+                description=description,
+                location='project' if is_project_local else 'global',
+                path=os.path.join(directory, name)
+            ))
 
-                    seen.add(entry.name)
+            seen.add(name)
 
     return skills
 
@@ -0,0 +1,136 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from openskills.metadata import SKILL_METADATA_FILE
+
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = 8
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    digest = hashlib.sha256()
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        if not os.path.islink(path):
+            raise
+        # A dangling symlink has no content; its target stands in for it.
+        digest.update(b'symlink\0' + os.fsencode(os.readlink(path)))
+        return digest.hexdigest()
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def walk_tree(directory: str) -> Iterator[tuple[str, os.DirEntry | None]]:
+    # Yields (relative path, entry) for files and (relative path, None) for
+    # directories. Symlinked directories are descended into, as shutil.copytree
+    # does; a directory reached again through a link loop is not re-walked.
+    stack = ['']
+    seen = set()
+
+    while stack:
+        rel_dir = stack.pop()
+        abs_dir = os.path.join(directory, rel_dir) if rel_dir else directory
+        st = os.stat(abs_dir)
+        if (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        with os.scandir(abs_dir) as entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir():
+                    stack.append(rel_path)
+                    yield rel_path, None
+                else:
+                    yield rel_path, entry
+
+
+def list_tree_files(directory: str, exclude: tuple[str, ...] = (SKILL_METADATA_FILE,)) -> list[str]:
+    return sorted(rel_path for rel_path, entry in walk_tree(directory) if entry is not None and rel_path not in exclude)
+
+
+def snapshot_tree(directory: str, exclude: tuple[str, ...] = (SKILL_METADATA_FILE,)) -> dict[str, list[int]]:
+    # Cheap change detector: (size, mtime_ns) per file from a single scandir walk,
+    # without reading any file contents.
+    snapshot = {}
+    for rel_path, entry in walk_tree(directory):
+        if entry is None or rel_path in exclude:
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            # A dangling symlink is recorded as the link itself.
+            stat = entry.stat(follow_symlinks=False)
+        snapshot[rel_path] = [stat.st_size, stat.st_mtime_ns]
+    return snapshot
+
+
+def combine_file_hashes(file_hashes: dict[str, str]) -> str:
+    # Merkle-style root: hash over the sorted (relative path, file hash) leaves,
+    # so renames and content changes both change the fingerprint.
+    digest = hashlib.sha256()
+    for rel_path in sorted(file_hashes):
+        digest.update(rel_path.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(file_hashes[rel_path].encode('ascii'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def hash_files(directory: str, rel_paths: list[str]) -> dict[str, str]:
+    # hashlib releases the GIL on large updates, so chunked reads of several
+    # files overlap on a thread pool.
+    if len(rel_paths) < 2:
+        return {rel_path: hash_file(os.path.join(directory, rel_path)) for rel_path in rel_paths}
+    with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(rel_paths))) as pool:
+        digests = pool.map(lambda rel_path: hash_file(os.path.join(directory, rel_path)), rel_paths)
+        return dict(zip(rel_paths, digests))
+
+
+def hash_tree(directory: str, exclude: tuple[str, ...] = (SKILL_METADATA_FILE,)) -> dict[str, str]:
+    return hash_files(directory, list_tree_files(directory, exclude))
+
+
+def compute_tree_hash(directory: str, exclude: tuple[str, ...] = (SKILL_METADATA_FILE,)) -> str:
+    return combine_file_hashes(hash_tree(directory, exclude))
+
+
+def build_file_manifest(directory: str, file_hashes: dict[str, str]) -> dict[str, list]:
+    # [sha256, size, mtime_ns] per file; the stat part lets verify skip
+    # re-hashing files that were not touched since they were recorded.
+    manifest = {}
+    for rel_path, digest in sorted(file_hashes.items()):
+        try:
+            st = os.stat(os.path.join(directory, rel_path))
+        except OSError:
+            continue
+        manifest[rel_path] = [digest, st.st_size, st.st_mtime_ns]
+    return manifest
+
+
+def verify_file_manifest(directory: str, manifest: dict[str, list], deep: bool = False) -> dict[str, list[str]]:
+    current = snapshot_tree(directory)
+    missing = sorted(manifest.keys() - current.keys())
+    extra = sorted(current.keys() - manifest.keys())
+    modified = []
+    to_hash = []
+
+    for rel_path in sorted(manifest.keys() & current.keys()):
+        digest, size, mtime_ns = manifest[rel_path]
+        if current[rel_path][0] != size:
+            modified.append(rel_path)
+        elif deep or current[rel_path][1] != mtime_ns:
+            to_hash.append(rel_path)
+
+    for rel_path, digest in hash_files(directory, to_hash).items():
+        if digest != manifest[rel_path][0]:
+            modified.append(rel_path)
+
+    return {'modified': sorted(modified), 'missing': missing, 'extra': extra}
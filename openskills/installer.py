@@ -1,18 +1,36 @@
+import io
 import os
 import sys
-import shutil
 import subprocess
-import hashlib
+import tarfile
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any
 
 import click
 
-from openskills.models import SkillSourceType, SkillSourceMetadata, InstallOptions
-from openskills.yaml_utils import has_valid_frontmatter, extract_yaml_field
-from openskills.metadata import write_skill_metadata, read_skill_metadata
-from openskills.dirs import get_skills_dir, get_cache_dir
-from openskills.market import find_skill_by_name
+from openskills.models import SkillSourceType, SkillSourceMetadata, InstallOptions, LockedSkill
+from openskills.yaml_utils import read_skill_frontmatter
+from openskills.metadata import read_skill_metadata
+from openskills.dirs import get_skills_dir
+from openskills.cache import (
+    get_cache_path,
+    get_cache_age,
+    is_cache_fresh,
+    mark_cache_fetched,
+    touch_cache_entry,
+    refresh_cached_repo,
+    get_repo_commit,
+    has_commit,
+)
+from openskills.hashing import build_file_manifest, combine_file_hashes, compute_tree_hash, hash_tree, snapshot_tree
+from openskills.lockfile import read_lockfile, record_locked_skill, is_project_target, get_lockfile_path
+from openskills.locks import cache_lock, target_lock
+from openskills.staging import install_tree
+from openskills.market import MarketSkill, find_skill_by_name, index_market_skills
 from openskills.finder import find_skill
 from openskills.recommends import resolve_recommendation_tree
 
@@ -39,6 +57,25 @@ def _format_source(source: str) -> str:
     return source
 
 
+SCAN_PRUNE_DIRS = {
+    '.git',
+    '.hg',
+    '.svn',
+    'node_modules',
+    '__pycache__',
+    '.venv',
+    'venv',
+    '.tox',
+    '.nox',
+    '.mypy_cache',
+    '.pytest_cache',
+    '.ruff_cache',
+}
+
+SCAN_WORKERS_ENV = 'OPENSKILLS_SCAN_WORKERS'
+
+INSTALL_WORKERS = 8
+
 ANTHROPIC_MARKETPLACE_SKILLS = [
     'xlsx',
     'docx',
@@ -117,15 +154,6 @@ def get_repo_name(repo_url: str) -> str | None:
     return maybe_repo or None
 
 
-def get_directory_size(dir_path: str) -> int:
-    size = 0
-    for root, dirs, files in os.walk(dir_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            size += os.path.getsize(file_path)
-    return size
-
-
 def format_size(bytes: int) -> str:
     if bytes < 1024:
         return f'{bytes}B'
@@ -138,62 +166,46 @@ def print_post_install_hints(is_project: bool) -> None:
     click.echo(f"\n{click.style('Use', dim=True)} {click.style('openskills list', fg='cyan')} {click.style('to see installed skills', dim=True)}")
 
 
-def get_cache_key(repo_url: str) -> str:
-    return hashlib.sha256(repo_url.encode()).hexdigest()[:16]
+def get_cached_repo(repo_url: str, offline: bool = False) -> str:
+    cache_path = get_cache_path(repo_url)
 
+    # Only one process refreshes a given repo at a time; the others wait here
+    # and then usually find the entry fresh.
+    with cache_lock(cache_path):
+        return _refresh_cached_repo(repo_url, cache_path, offline)
 
-def clone_to_cache(repo_url: str, cache_path: str) -> str:
-    try:
+
+def _refresh_cached_repo(repo_url: str, cache_path: str, offline: bool) -> str:
+    if os.path.exists(cache_path):
+        if offline:
+            touch_cache_entry(cache_path)
+            click.echo(click.style("Using cached repository (offline)", dim=True))
+            return cache_path
+
+        if is_cache_fresh(cache_path):
+            touch_cache_entry(cache_path)
+            age = get_cache_age(cache_path) or 0
+            click.echo(click.style(f"Using cached repository (fetched {int(age)}s ago)", dim=True))
+            return cache_path
+
+        click.echo(click.style(f"Updating cached repository...", dim=True))
+    else:
+        if offline:
+            click.echo(click.style(f"Error: Repository not in cache (offline): {repo_url}", fg='red'))
+            click.echo("Run the install once without --offline to populate the cache.")
+            sys.exit(1)
         click.echo(click.style(f"Cloning repository to cache...", dim=True))
-        subprocess.run(
-            ['git', 'clone', '--depth', '1', '--quiet', repo_url, cache_path],
-            check=True,
-            capture_output=True
-        )
-        click.echo(click.style(f"Repository cloned to cache", fg='green'))
-        return cache_path
+
+    try:
+        refresh_cached_repo(repo_url, cache_path)
     except subprocess.CalledProcessError as e:
         click.echo(click.style("Failed to clone repository", fg='red'))
         if e.stderr:
             click.echo(click.style(e.stderr.decode().strip(), dim=True))
         sys.exit(1)
 
-
-def get_cached_repo(repo_url: str) -> str:
-    cache_dir = get_cache_dir()
-    cache_key = get_cache_key(repo_url)
-    cache_path = os.path.join(cache_dir, cache_key)
-
-    if os.path.exists(cache_path):
-        try:
-            click.echo(click.style(f"Updating cached repository...", dim=True))
-            subprocess.run(
-                ['git', 'fetch', '--quiet'],
-                cwd=cache_path,
-                check=True,
-                capture_output=True
-            )
-            subprocess.run(
-                ['git', 'checkout', '--quiet', 'main'],
-                cwd=cache_path,
-                check=True,
-                capture_output=True
-            )
-            subprocess.run(
-                ['git', 'pull', '--quiet'],
-                cwd=cache_path,
-                check=True,
-                capture_output=True
-            )
-            click.echo(click.style(f"Cache updated", fg='green'))
-        except subprocess.CalledProcessError:
-            click.echo(click.style("Cache update failed, recloning...", fg='yellow'))
-            shutil.rmtree(cache_path, ignore_errors=True)
-            return clone_to_cache(repo_url, cache_path)
-
-        return cache_path
-    else:
-        return clone_to_cache(repo_url, cache_path)
+    click.echo(click.style(f"Repository cached", fg='green'))
+    return cache_path
 
 
 def prompt_for_selection(message: str, choices: list[dict[str, Any]]) -> list[str]:
@@ -219,52 +231,134 @@ def prompt_for_selection(message: str, choices: list[dict[str, Any]]) -> list[st
             return [choice['value'] for choice in choices]
 
 
-def find_skills_in_repo(repo_dir: str) -> list[dict]:
+def _get_scan_workers() -> int:
+    try:
+        return max(int(os.environ.get(SCAN_WORKERS_ENV, '1')), 1)
+    except ValueError:
+        return 1
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _scan_repo(repo_dir: str, workers: int) -> tuple[list[str], dict[str, int]]:
+    skill_dirs = []
+    visited = []
+    own_sizes: dict[str, int] = {}
+    pending_files: list[tuple[str, str]] = []
+    stack = [repo_dir]
+
+    while stack:
+        current = stack.pop()
+        visited.append(current)
+        own_sizes[current] = 0
+        subdirs = []
+
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if entry.name not in SCAN_PRUNE_DIRS:
+                            subdirs.append(entry.path)
+                        continue
+                    if entry.name == 'SKILL.md':
+                        skill_dirs.append(current)
+                    if workers > 1:
+                        pending_files.append((current, entry.path))
+                    else:
+                        own_sizes[current] += _file_size(entry.path)
+        except OSError:
+            continue
+
+        # Reversed so directories pop in listing order, matching os.walk's top-down order.
+        stack.extend(reversed(subdirs))
+
+    if pending_files:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            sizes = pool.map(_file_size, [path for _, path in pending_files], chunksize=64)
+            for (parent, _), size in zip(pending_files, sizes):
+                own_sizes[parent] += size
+
+    # Children always come after their parent in `visited`, so one reverse
+    # pass rolls every subtree size up into its ancestors.
+    totals = dict(own_sizes)
+    for path in reversed(visited):
+        if path != repo_dir:
+            parent = os.path.dirname(path)
+            if parent in totals:
+                totals[parent] += totals[path]
+
+    return skill_dirs, totals
+
+
+def find_skills_in_repo(repo_dir: str, workers: int | None = None) -> list[dict]:
     skill_infos = []
+    workers = _get_scan_workers() if workers is None else max(workers, 1)
+    skill_dirs, sizes = _scan_repo(repo_dir, workers)
 
-    root_skill_path = os.path.join(repo_dir, 'SKILL.md')
-    if os.path.exists(root_skill_path):
-        with open(root_skill_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    for skill_dir in skill_dirs:
+        try:
+            fields = read_skill_frontmatter(os.path.join(skill_dir, 'SKILL.md'))
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        if fields is None:
+            continue
 
-        if has_valid_frontmatter(content):
-            frontmatter_name = extract_yaml_field(content, 'name')
+        if skill_dir == repo_dir:
+            frontmatter_name = fields.get('name', '').strip()
             skill_name = frontmatter_name or get_repo_name(repo_dir) or os.path.basename(repo_dir)
+        else:
+            skill_name = os.path.basename(skill_dir)
 
-            skill_infos.append({
-                'skill_dir': repo_dir,
-                'skill_name': skill_name,
-                'description': extract_yaml_field(content, 'description'),
-                'size': get_directory_size(repo_dir)
-            })
-
-    for root, dirs, files in os.walk(repo_dir):
-        if 'SKILL.md' in files and root != repo_dir:
-            skill_md_path = os.path.join(root, 'SKILL.md')
-            with open(skill_md_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            if has_valid_frontmatter(content):
-                skill_name = os.path.basename(root)
-                description = extract_yaml_field(content, 'description')
-
-                skill_infos.append({
-                    'skill_dir': root,
-                    'skill_name': skill_name,
-                    'description': description,
-                    'size': get_directory_size(root)
-                })
+        skill_infos.append({
+            'skill_dir': skill_dir,
+            'skill_name': skill_name,
+            'description': fields.get('description', '').strip(),
+            'size': sizes.get(skill_dir, 0)
+        })
 
     return skill_infos
 
 
+def copy_skill(source_dir: str, target_path: str, metadata: SkillSourceMetadata, commit: str | None = None) -> None:
+    if commit:
+        metadata.commit = commit
+    file_hashes = hash_tree(source_dir)
+    metadata.tree_hash = combine_file_hashes(file_hashes)
+    metadata.file_manifest = build_file_manifest(source_dir, file_hashes)
+    if metadata.source_type == SkillSourceType.LOCAL:
+        metadata.source_manifest = snapshot_tree(source_dir)
+    with target_lock(target_path):
+        install_tree(source_dir, target_path, metadata)
+
+    if commit and metadata.source_type == SkillSourceType.GIT and is_project_target(target_path):
+        record_locked_skill(LockedSkill(
+            name=os.path.basename(target_path),
+            repo_url=metadata.repo_url,
+            commit=commit,
+            subpath=metadata.subpath or '',
+            tree_hash=metadata.tree_hash,
+        ))
+
+
 def install_from_repo(
     repo_dir: str,
     target_dir: str,
     options,
     repo_name: str | None,
     source_info: dict
-) -> None:
+) -> str | None:
+    # Returns the skill whose recommendations should be offered, if exactly
+    # one was installed; the caller does that once the repo is no longer in use.
     skill_infos = find_skills_in_repo(repo_dir)
 
     if not skill_infos:
@@ -289,7 +383,7 @@ def install_from_repo(
 
         if not selected:
             click.echo(click.style("No skills selected. Installation cancelled.", fg='yellow'))
-            return
+            return None
 
         skills_to_install = [info for info in skill_infos if info['skill_name'] in selected]
 
@@ -311,10 +405,6 @@ def install_from_repo(
             click.echo(click.style("Security error: Installation path outside target directory", fg='red'))
             continue
 
-        if os.path.exists(target_path):
-            shutil.rmtree(target_path)
-        shutil.copytree(info['skill_dir'], target_path)
-
         if source_info['source_type'] == 'local':
             metadata = SkillSourceMetadata(
                 source=source_info['source'],
@@ -333,7 +423,7 @@ def install_from_repo(
                 installed_at=None
             )
 
-        write_skill_metadata(target_path, metadata)
+        copy_skill(info['skill_dir'], target_path, metadata, source_info.get('commit'))
 
         click.echo(click.style(f"[OK] Installed: {skill_name}", fg='green'))
         installed_count += 1
@@ -341,8 +431,8 @@ def install_from_repo(
     click.echo(click.style(f"\n[OK] Installation complete: {installed_count} skill(s) installed", fg='green'))
 
     if installed_count == 1 and skills_to_install:
-        installed_skill_dir = os.path.join(target_dir, skills_to_install[0]['skill_name'])
-        _install_recommendations(installed_skill_dir, options)
+        return os.path.join(target_dir, skills_to_install[0]['skill_name'])
+    return None
 
 
 def install_single_local_skill(
@@ -352,12 +442,7 @@ def install_single_local_skill(
     options,
     source_info: dict
 ) -> None:
-    skill_md_path = os.path.join(skill_dir, 'SKILL.md')
-
-    with open(skill_md_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    if not has_valid_frontmatter(content):
+    if read_skill_frontmatter(os.path.join(skill_dir, 'SKILL.md')) is None:
         click.echo(click.style("Error: Invalid SKILL.md (missing YAML frontmatter)", fg='red'))
         sys.exit(1)
 
@@ -375,17 +460,13 @@ def install_single_local_skill(
         click.echo(click.style("Security error: Installation path outside target directory", fg='red'))
         sys.exit(1)
 
-    if os.path.exists(target_path):
-        shutil.rmtree(target_path)
-    shutil.copytree(skill_dir, target_path)
-
     metadata = SkillSourceMetadata(
         source=source_info['source'],
         source_type=SkillSourceType.LOCAL,
         local_path=skill_dir,
         installed_at=None
     )
-    write_skill_metadata(target_path, metadata)
+    copy_skill(skill_dir, target_path, metadata)
 
     click.echo(click.style(f"[OK] Installed: {skill_name}", fg='green'))
     click.echo(f"   Location: {target_path}")
@@ -413,7 +494,9 @@ def install_from_local(
         is_project = os.getcwd() in target_dir
         install_single_local_skill(local_path, target_dir, is_project, options, source_info)
     else:
-        install_from_repo(local_path, target_dir, options, None, source_info)
+        installed_skill_dir = install_from_repo(local_path, target_dir, options, None, source_info)
+        if installed_skill_dir:
+            _install_recommendations(installed_skill_dir, options)
 
 
 def try_install_from_market(skill_name: str, options, install_func) -> bool:
@@ -463,58 +546,290 @@ def try_install_from_market(skill_name: str, options, install_func) -> bool:
                 return False
 
 
-def _resolve_missing_recs(tree: dict) -> list[dict]:
+def _resolve_missing_recs(tree: dict, installed: dict[str, bool] | None = None) -> list[dict]:
     missing = []
-    _collect_missing(tree, missing)
+    _collect_missing(tree, missing, {} if installed is None else installed, set())
     return missing
 
 
-def _collect_missing(tree: dict, missing: list[dict]) -> None:
+def _is_installed(name: str, installed: dict[str, bool]) -> bool:
+    if name not in installed:
+        installed[name] = find_skill(name) is not None
+    return installed[name]
+
+
+def _collect_missing(tree: dict, missing: list[dict], installed: dict[str, bool], seen: set) -> None:
     for rec in tree.get("recs", []):
-        if not find_skill(rec["name"]):
+        # Subtrees are shared between parents, so each skill is visited once.
+        if rec["name"] in seen:
+            continue
+        seen.add(rec["name"])
+        if not _is_installed(rec["name"], installed):
             missing.append({"name": rec["name"], "source": rec.get("source", "")})
-        _collect_missing(rec, missing)
+        _collect_missing(rec, missing, installed, seen)
 
 
-def _install_recommendations(skill_dir: str, options: InstallOptions) -> None:
+def _fetch_recommendation_repo(repo_url: str, offline: bool) -> str | None:
     try:
-        tree = resolve_recommendation_tree(skill_dir)
-    except ValueError as e:
-        click.echo(click.style(f"Error: {e}", fg='red'))
-        return
+        return get_cached_repo(repo_url, offline=offline)
+    except SystemExit:
+        # get_cached_repo has already reported why; the skills from this repo fail.
+        return None
 
-    missing = _resolve_missing_recs(tree)
-    satisfied_names = [d["name"] for d in tree.get("recs", []) if find_skill(d["name"])]
 
-    if not missing:
-        if satisfied_names:
-            click.echo(click.style("\nAll recommendations satisfied:", fg='green'))
-            for name in satisfied_names:
-                click.echo(f"  ✓ {name}")
+def _fetch_recommendation_repos(recs: list[dict], repos: dict[str, str | None], offline: bool) -> None:
+    repo_urls = set()
+    for rec in recs:
+        if is_git_url(rec['source']):
+            try:
+                repo_urls.add(split_git_source(rec['source'])[0])
+            except ValueError:
+                continue
+    repo_urls = sorted(repo_urls - repos.keys())
+    if not repo_urls:
         return
 
+    with ThreadPoolExecutor(max_workers=min(INSTALL_WORKERS, len(repo_urls))) as pool:
+        for repo_url, repo_dir in zip(repo_urls, pool.map(lambda url: _fetch_recommendation_repo(url, offline), repo_urls)):
+            repos[repo_url] = repo_dir
+
+
+def _is_market_name(source: str) -> bool:
+    return not source or not (is_git_url(source) or is_local_path(source) or os.path.isdir(expand_path(source)))
+
+
+def _pick_market_variant(matches: list[MarketSkill], repos: dict[str, str | None]) -> MarketSkill | None:
+    if len(matches) == 1:
+        return matches[0]
+    # Several repos ship a skill of this name: take the one that is already
+    # fetched or cached, since it installs without a clone.
+    local = [
+        skill for skill in matches
+        if repos.get(skill.repo) or os.path.isdir(get_cache_path(skill.repo))
+    ]
+    return local[0] if len({skill.repo for skill in local}) == 1 else None
+
+
+def resolve_market_sources(recs: list[dict], repos: dict[str, str | None]) -> dict[str, str]:
+    # Recommendations with no source, or a bare market name as source, are
+    # looked up together against one index of the market catalog.
+    lookups = {rec['name']: rec['source'] or rec['name'] for rec in recs if _is_market_name(rec['source'])}
+    if not lookups:
+        return {}
+
+    index = index_market_skills()
+    errors = {}
+    for rec in recs:
+        if rec['name'] not in lookups:
+            continue
+        name = lookups[rec['name']]
+        matches = index.get(name.lower(), [])
+        variant = _pick_market_variant(matches, repos)
+        if variant is None:
+            errors[rec['name']] = f"'{name}' is {'ambiguous' if matches else 'not found'} in market"
+        else:
+            rec['source'] = variant.source
+    return errors
+
+
+def _locate_recommendation(
+    rec: dict,
+    repos: dict[str, str | None],
+    listings: dict[str, dict[str, str]]
+) -> dict:
+    source = rec['source']
+    repo_url = None
+    subpath = ''
+
+    if is_git_url(source):
+        repo_url, subpath = split_git_source(source)
+        root = repos.get(repo_url)
+        if root is None:
+            raise ValueError(f"could not fetch {repo_url}")
+    elif source and (is_local_path(source) or os.path.isdir(expand_path(source))):
+        root = expand_path(source)
+    else:
+        raise ValueError("no installable source" if not source else f"unsupported source: {source}")
+
+    base = os.path.join(root, subpath) if subpath else root
+    if os.path.exists(os.path.join(base, 'SKILL.md')):
+        skill_dir = base
+    else:
+        if base not in listings:
+            infos = find_skills_in_repo(base) if os.path.isdir(base) else []
+            listings[base] = {info['skill_name']: info['skill_dir'] for info in infos}
+        skill_dir = listings[base].get(rec['name'])
+        if not skill_dir:
+            raise ValueError(f"skill not found in {source}")
+
+    # Recommendations shipped with the source are known before installing.
+    source_metadata = read_skill_metadata(skill_dir)
+    return {
+        'name': rec['name'],
+        'source': source,
+        'repo_url': repo_url,
+        'repo_dir': root,
+        'skill_dir': skill_dir,
+        'recommends': (source_metadata.recommends or []) if source_metadata else [],
+    }
+
+
+def plan_recommendation_installs(
+    missing: list[dict],
+    options: InstallOptions,
+    installed: dict[str, bool] | None = None
+) -> tuple[dict[str, dict], dict[str, dict]]:
+    installed = {} if installed is None else installed
+    repos: dict[str, str | None] = {}
+    listings: dict[str, dict[str, str]] = {}
+    jobs: dict[str, dict] = {}
+    errors: dict[str, dict] = {}
+    pending = [dict(rec) for rec in {rec['name']: rec for rec in missing}.values()]
+
+    # Each round fills in market sources, fetches the repos it needs
+    # concurrently, then queues the not-yet-installed recommendations of what
+    # it found for the next round.
+    while pending:
+        unresolved = resolve_market_sources(pending, repos)
+        for rec in pending:
+            if rec['name'] in unresolved:
+                errors[rec['name']] = dict(rec, error=unresolved[rec['name']])
+        pending = [rec for rec in pending if rec['name'] not in unresolved]
+
+        _fetch_recommendation_repos(pending, repos, options.offline)
+        queued = {rec['name'] for rec in pending} | unresolved.keys()
+        discovered = {}
+        for rec in pending:
+            try:
+                job = _locate_recommendation(rec, repos, listings)
+            except ValueError as e:
+                errors[rec['name']] = dict(rec, error=str(e))
+                continue
+            job['via'] = rec.get('via')
+            jobs[rec['name']] = job
+            for sub in job['recommends']:
+                known = sub.name in jobs or sub.name in errors or sub.name in queued or sub.name in discovered
+                if not known and not _is_installed(sub.name, installed):
+                    discovered[sub.name] = {'name': sub.name, 'source': sub.source, 'via': rec['name']}
+        pending = list(discovered.values())
+
+    return jobs, errors
+
+
+def _install_levels(jobs: dict[str, dict]) -> list[list[str]]:
+    # Kahn's algorithm: recommended skills are installed before the skills
+    # recommending them; anything left in a cycle goes in one final level.
+    deps = {name: {rec.name for rec in job['recommends'] if rec.name in jobs and rec.name != name} for name, job in jobs.items()}
+    levels = []
+    remaining = dict(deps)
+    while remaining:
+        ready = sorted(name for name, needs in remaining.items() if not needs & remaining.keys())
+        if not ready:
+            ready = sorted(remaining)
+        levels.append(ready)
+        for name in ready:
+            del remaining[name]
+    return levels
+
+
+def _install_recommended_skill(job: dict, target_dir: str, commit: str | None) -> None:
+    target_path = os.path.join(target_dir, job['name'])
+    if not is_path_inside(target_path, target_dir):
+        raise ValueError("installation path outside target directory")
+
+    if job['repo_url']:
+        subpath = os.path.relpath(job['skill_dir'], job['repo_dir']).replace('\\', '/')
+        metadata = SkillSourceMetadata(
+            source=job['source'],
+            source_type=SkillSourceType.GIT,
+            repo_url=job['repo_url'],
+            subpath='' if subpath == '.' else subpath,
+            recommends=job['recommends'] or None,
+        )
+    else:
+        metadata = SkillSourceMetadata(
+            source=job['source'],
+            source_type=SkillSourceType.LOCAL,
+            local_path=job['skill_dir'],
+            recommends=job['recommends'] or None,
+        )
+        commit = None
+
+    copy_skill(job['skill_dir'], target_path, metadata, commit)
+
+
+def install_recommended_skills(jobs: dict[str, dict], options: InstallOptions) -> dict[str, str | None]:
+    target_dir = get_skills_dir(options.global_install)
+    os.makedirs(target_dir, exist_ok=True)
+    results: dict[str, str | None] = {}
+
+    with ExitStack() as stack:
+        commits = {}
+        for job in jobs.values():
+            if job['repo_url'] and job['repo_dir'] not in commits:
+                stack.enter_context(cache_lock(job['repo_dir'], shared=True))
+                commits[job['repo_dir']] = get_repo_commit(job['repo_dir'])
+
+        for level in _install_levels(jobs):
+            with ThreadPoolExecutor(max_workers=min(INSTALL_WORKERS, len(level))) as pool:
+                futures = {
+                    name: pool.submit(_install_recommended_skill, jobs[name], target_dir, commits.get(jobs[name]['repo_dir']))
+                    for name in level
+                }
+                for name, future in futures.items():
+                    try:
+                        future.result()
+                        results[name] = None
+                    except (OSError, ValueError) as e:
+                        results[name] = str(e)
+
+    return results
+
+
+def install_missing_recommendations(missing: list[dict], satisfied_names: list[str], options: InstallOptions) -> None:
+    installed = {name: True for name in satisfied_names}
+    jobs, errors = plan_recommendation_installs(missing, options, installed)
+    missing_names = {rec['name'] for rec in missing}
+    planned = [rec for rec in missing if rec['name'] in jobs or rec['name'] in errors]
+    planned += [
+        {'name': name, 'source': job['source'], 'via': job['via']}
+        for name, job in jobs.items() if name not in missing_names
+    ]
+    planned += [rec for name, rec in errors.items() if name not in missing_names]
+
     click.echo(f"\n{click.style('Recommendations:', bold=True)}")
 
     click.echo(click.style("  Missing:", fg='yellow'))
-    for rec in missing:
-        link = _terminal_link(rec['source'], _format_source(rec['source']))
-        click.echo(f"    - {click.style(rec['name'], bold=True)} ({link})")
+    for rec in planned:
+        source = jobs[rec['name']]['source'] if rec['name'] in jobs else rec['source']
+        link = _terminal_link(source, _format_source(source))
+        note = click.style(f" via {rec['via']}", dim=True) if rec.get('via') else ''
+        if rec['name'] in errors:
+            note += click.style(f" [{errors[rec['name']]['error']}]", fg='red')
+        click.echo(f"    - {click.style(rec['name'], bold=True)} ({link}){note}")
 
     if satisfied_names:
         click.echo(click.style("  Already installed:", fg='green'))
         for name in satisfied_names:
             click.echo(f"    ✓ {name}")
 
+    if not jobs:
+        click.echo(click.style(
+            "Warning: none of the missing recommendations can be installed. "
+            "Run 'openskills recommends check' to see details.", fg='yellow'
+        ))
+        return
+
     if options.yes:
-        to_install = [rec['name'] for rec in missing]
+        to_install = list(jobs)
     else:
         choices = [
             {
-                'name': f"{rec['name']} ({_format_source(rec['source'])})",
-                'value': rec['name'],
+                'name': f"{name} ({_format_source(job['source'])})",
+                'value': name,
                 'checked': True
             }
-            for rec in missing
+            for name, job in jobs.items()
         ]
         to_install = prompt_for_selection('Select recommendations to install', choices)
 
@@ -525,15 +840,41 @@ def _install_recommendations(skill_dir: str, options: InstallOptions) -> None:
         ))
         return
 
-    selected_sources = {rec['name']: rec['source'] for rec in missing if rec['name'] in to_install}
+    results = install_recommended_skills({name: jobs[name] for name in to_install}, options)
 
+    failed = 0
     for name in to_install:
-        source = selected_sources.get(name, "")
-        click.echo(f"  Installing: {click.style(name, bold=True)}")
-        install_skill(source, options)
-        click.echo(click.style(f"  ✓ {name} installed", fg='green'))
+        if results.get(name):
+            failed += 1
+            click.echo(click.style(f"  ✗ {name} ({results[name]})", fg='red'))
+        else:
+            click.echo(click.style(f"  ✓ {name} installed", fg='green'))
 
-    click.echo(click.style("\nAll recommendations satisfied.", fg='green'))
+    click.echo(click.style(
+        f"\nSummary: {len(to_install) - failed} recommendation(s) installed, {failed + len(errors)} failed",
+        dim=True
+    ))
+
+
+def _install_recommendations(skill_dir: str, options: InstallOptions) -> None:
+    try:
+        tree = resolve_recommendation_tree(skill_dir)
+    except ValueError as e:
+        click.echo(click.style(f"Error: {e}", fg='red'))
+        return
+
+    installed = {}
+    missing = _resolve_missing_recs(tree, installed)
+    satisfied_names = [d["name"] for d in tree.get("recs", []) if _is_installed(d["name"], installed)]
+
+    if not missing:
+        if satisfied_names:
+            click.echo(click.style("\nAll recommendations satisfied:", fg='green'))
+            for name in satisfied_names:
+                click.echo(f"  ✓ {name}")
+        return
+
+    install_missing_recommendations(missing, satisfied_names, options)
 
 
 def install_skill(source: str, options: InstallOptions) -> None:
@@ -585,48 +926,55 @@ def install_skill(source: str, options: InstallOptions) -> None:
     print_post_install_hints(is_project)
 
 
-def _install_from_git(source: str, target_dir: str, is_project: bool, options: InstallOptions) -> None:
-    repo_url: str
-    skill_subpath = ''
+def split_git_source(source: str) -> tuple[str, str]:
+    if not (source.startswith('http://') or source.startswith('https://')):
+        return source, ''
 
+    parts = source.split('/')
+    if len(parts) < 5:
+        raise ValueError(f"Invalid URL format: {source}")
+
+    remaining = parts[5:]
+    if len(remaining) >= 2 and remaining[0] == 'tree':
+        remaining = remaining[2:]
+    return '/'.join(parts[:5]), '/'.join(remaining)
+
+
+def _install_from_git(source: str, target_dir: str, is_project: bool, options: InstallOptions) -> None:
     if not is_git_url(source):
         click.echo(click.style("Error: Invalid source format", fg='red'))
         click.echo("Expected: complete git URL (e.g., https://github.com/owner/repo) or local path")
         sys.exit(1)
 
-    if source.startswith('http://') or source.startswith('https://'):
-        parts = source.split('/')
-
-        if len(parts) < 5:
-            click.echo(click.style("Error: Invalid URL format", fg='red'))
-            click.echo("Expected: https://domain.com/owner/repo[/skill-path]")
-            sys.exit(1)
-
-        repo_url = '/'.join(parts[:5])
-
-        if len(parts) > 5:
-            remaining = parts[5:]
-            if len(remaining) >= 2 and remaining[0] == 'tree':
-                remaining = remaining[2:]
-            skill_subpath = '/'.join(remaining)
-    elif source.startswith('git@'):
-        repo_url = source
-    else:
-        repo_url = source
+    try:
+        repo_url, skill_subpath = split_git_source(source)
+    except ValueError:
+        click.echo(click.style("Error: Invalid URL format", fg='red'))
+        click.echo("Expected: https://domain.com/owner/repo[/skill-path]")
+        sys.exit(1)
 
-    repo_dir = get_cached_repo(repo_url)
+    repo_dir = get_cached_repo(repo_url, offline=options.offline)
 
-    source_info = {
-        'source': source,
-        'source_type': 'git',
-        'repo_url': repo_url
-    }
+    # Readers share the cache entry; a concurrent fetch of the same repo waits
+    # until the copy below has finished. The commit is read under the same
+    # lock so it names the tree that is copied.
+    with cache_lock(repo_dir, shared=True):
+        source_info = {
+            'source': source,
+            'source_type': 'git',
+            'repo_url': repo_url,
+            'commit': get_repo_commit(repo_dir)
+        }
+        if skill_subpath:
+            installed_skill_dir = _install_from_subpath(skill_subpath, repo_dir, target_dir, is_project, options, source_info)
+        else:
+            repo_name = get_repo_name(repo_url)
+            installed_skill_dir = install_from_repo(repo_dir, target_dir, options, repo_name, source_info)
 
-    if skill_subpath:
-        _install_from_subpath(skill_subpath, repo_dir, target_dir, is_project, options, source_info)
-    else:
-        repo_name = get_repo_name(repo_url)
-        install_from_repo(repo_dir, target_dir, options, repo_name, source_info)
+    # Recommendations are fetched on worker threads, which may need this repo's
+    # exclusive lock, so they run only after the shared lock is released.
+    if installed_skill_dir:
+        _install_recommendations(installed_skill_dir, options)
 
 
 def _install_single_skill_from_subpath(
@@ -636,11 +984,8 @@ def _install_single_skill_from_subpath(
     is_project: bool,
     options: InstallOptions,
     source_info: dict
-) -> None:
-    with open(os.path.join(skill_dir, 'SKILL.md'), 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    if not has_valid_frontmatter(content):
+) -> str | None:
+    if read_skill_frontmatter(os.path.join(skill_dir, 'SKILL.md')) is None:
         click.echo(click.style("Error: Invalid SKILL.md (missing YAML frontmatter)", fg='red'))
         sys.exit(1)
 
@@ -650,7 +995,7 @@ def _install_single_skill_from_subpath(
     should_install = warn_if_conflict(skill_name, target_path, is_project, options.yes)
     if not should_install:
         click.echo(click.style(f"Skipped: {skill_name}", fg='yellow'))
-        return
+        return None
 
     os.makedirs(target_dir, exist_ok=True)
 
@@ -658,10 +1003,6 @@ def _install_single_skill_from_subpath(
         click.echo(click.style("Security error: Installation path outside target directory", fg='red'))
         sys.exit(1)
 
-    if os.path.exists(target_path):
-        shutil.rmtree(target_path)
-    shutil.copytree(skill_dir, target_path)
-
     metadata = SkillSourceMetadata(
         source=source_info['source'],
         source_type=SkillSourceType.GIT,
@@ -669,12 +1010,11 @@ def _install_single_skill_from_subpath(
         subpath=skill_subpath,
         installed_at=None
     )
-    write_skill_metadata(target_path, metadata)
+    copy_skill(skill_dir, target_path, metadata, source_info.get('commit'))
 
     click.echo(click.style(f"[OK] Installed: {skill_name}", fg='green'))
     click.echo(f"   Location: {target_path}")
-
-    _install_recommendations(target_path, options)
+    return target_path
 
 
 def _install_from_subpath(
@@ -684,15 +1024,14 @@ def _install_from_subpath(
     is_project: bool,
     options: InstallOptions,
     source_info: dict
-) -> None:
+) -> str | None:
     skill_dir = os.path.join(repo_dir, skill_subpath)
     skill_md_path = os.path.join(skill_dir, 'SKILL.md')
 
     if os.path.exists(skill_md_path):
-        _install_single_skill_from_subpath(
+        return _install_single_skill_from_subpath(
             skill_dir, skill_subpath, target_dir, is_project, options, source_info
         )
-        return
 
     if not os.path.isdir(skill_dir):
         click.echo(click.style(f"Error: Directory not found at {skill_subpath}", fg='red'))
@@ -718,7 +1057,7 @@ def _install_from_subpath(
             default=True
         ):
             click.echo(click.style("Installation cancelled.", fg='yellow'))
-            return
+            return None
 
     installed_count = 0
     for info in skill_infos:
@@ -736,10 +1075,6 @@ def _install_from_subpath(
             click.echo(click.style("Security error: Installation path outside target directory", fg='red'))
             continue
 
-        if os.path.exists(target_path):
-            shutil.rmtree(target_path)
-        shutil.copytree(info['skill_dir'], target_path)
-
         subpath = os.path.relpath(info['skill_dir'], repo_dir).replace('\\', '/')
         metadata = SkillSourceMetadata(
             source=source_info['source'],
@@ -748,7 +1083,7 @@ def _install_from_subpath(
             subpath=subpath,
             installed_at=None
         )
-        write_skill_metadata(target_path, metadata)
+        copy_skill(info['skill_dir'], target_path, metadata, source_info.get('commit'))
 
         click.echo(click.style(f"[OK] Installed: {skill_name}", fg='green'))
         installed_count += 1
@@ -756,5 +1091,186 @@ def _install_from_subpath(
     click.echo(click.style(f"\n[OK] Installation complete: {installed_count} skill(s) installed", fg='green'))
 
     if installed_count == 1 and skill_infos:
-        installed_skill_dir = os.path.join(target_dir, skill_infos[0]['skill_name'])
-        _install_recommendations(installed_skill_dir, options)
+        return os.path.join(target_dir, skill_infos[0]['skill_name'])
+    return None
+
+
+def _locked_skill_source(entry: LockedSkill) -> str:
+    if entry.subpath and (entry.repo_url.startswith('http://') or entry.repo_url.startswith('https://')):
+        return f"{entry.repo_url}/{entry.subpath}"
+    return entry.repo_url
+
+
+def _is_locked_skill_current(entry: LockedSkill, target_path: str) -> bool:
+    if not entry.tree_hash or not os.path.isdir(target_path):
+        return False
+    try:
+        return compute_tree_hash(target_path) == entry.tree_hash
+    except OSError:
+        return False
+
+
+def _fetch_locked_repo(repo_url: str, commits: set[str], offline: bool) -> str:
+    cache_path = get_cache_path(repo_url)
+
+    with cache_lock(cache_path):
+        if os.path.isdir(cache_path) and all(has_commit(cache_path, c) for c in commits):
+            touch_cache_entry(cache_path)
+            return cache_path
+
+    repo_dir = get_cached_repo(repo_url, offline=offline) if not os.path.isdir(cache_path) else cache_path
+
+    with cache_lock(repo_dir):
+        missing = sorted(c for c in commits if not has_commit(repo_dir, c))
+        if missing:
+            if offline:
+                click.echo(click.style(f"Error: Pinned commit not in cache (offline): {repo_url}@{missing[0][:12]}", fg='red'))
+                sys.exit(1)
+            click.echo(click.style(f"Fetching pinned commit(s) for {repo_url}...", dim=True))
+            try:
+                subprocess.run(
+                    ['git', 'fetch', '--quiet', '--depth', '1', 'origin', *missing],
+                    cwd=repo_dir,
+                    check=True,
+                    capture_output=True
+                )
+            except subprocess.CalledProcessError as e:
+                click.echo(click.style(f"Failed to fetch pinned commit(s) for {repo_url}", fg='red'))
+                if e.stderr:
+                    click.echo(click.style(e.stderr.decode().strip(), dim=True))
+                sys.exit(1)
+            mark_cache_fetched(repo_dir, repo_url)
+
+    return repo_dir
+
+
+def _export_commit(repo_dir: str, commit: str, subpaths: set[str], dest: str) -> None:
+    cmd = ['git', 'archive', '--format=tar', commit]
+    if '' not in subpaths:
+        cmd += ['--', *sorted(subpaths)]
+
+    with cache_lock(repo_dir, shared=True):
+        result = subprocess.run(cmd, cwd=repo_dir, check=True, capture_output=True)
+
+    with tarfile.open(fileobj=io.BytesIO(result.stdout)) as tar:
+        if hasattr(tarfile, 'data_filter'):
+            tar.extractall(dest, filter='data')
+        else:
+            tar.extractall(dest, members=_safe_archive_members(tar, dest))
+
+
+def _safe_archive_members(tar: tarfile.TarFile, dest: str) -> list[tarfile.TarInfo]:
+    # Without extraction filters every member is checked up front: nothing may
+    # land outside dest, and links are refused since they could point anywhere.
+    root = os.path.realpath(dest)
+    members = tar.getmembers()
+    for member in members:
+        if member.issym() or member.islnk():
+            raise ValueError(f"refusing to extract link from archive: {member.name}")
+        target = os.path.realpath(os.path.join(root, member.name))
+        if os.path.isabs(member.name) or (target != root and not is_path_inside(target, root)):
+            raise ValueError(f"refusing to extract path outside destination: {member.name}")
+    return members
+
+
+def _materialize_locked_skill(entry: LockedSkill, export_dir: str, target_dir: str) -> tuple[bool, str]:
+    source_dir = os.path.join(export_dir, entry.subpath) if entry.subpath else export_dir
+    if not os.path.exists(os.path.join(source_dir, 'SKILL.md')):
+        return False, f"SKILL.md not found at {entry.subpath or '.'}@{entry.commit[:12]}"
+
+    target_path = os.path.join(target_dir, entry.name)
+    if not is_path_inside(target_path, target_dir):
+        return False, 'installation path outside target directory'
+
+    file_hashes = hash_tree(source_dir)
+    metadata = SkillSourceMetadata(
+        source=_locked_skill_source(entry),
+        source_type=SkillSourceType.GIT,
+        repo_url=entry.repo_url,
+        subpath=entry.subpath,
+        commit=entry.commit,
+        tree_hash=combine_file_hashes(file_hashes),
+        file_manifest=build_file_manifest(source_dir, file_hashes),
+    )
+    with target_lock(target_path):
+        install_tree(source_dir, target_path, metadata)
+
+    if entry.tree_hash and metadata.tree_hash != entry.tree_hash:
+        return True, 'tree hash differs from lockfile'
+    return True, ''
+
+
+def install_from_lockfile(options: InstallOptions) -> None:
+    lockfile_path = get_lockfile_path()
+    entries = read_lockfile(lockfile_path)
+
+    if not entries:
+        click.echo(click.style(f"Error: No locked skills found in {lockfile_path}", fg='red'))
+        sys.exit(1)
+
+    target_dir = get_skills_dir()
+    os.makedirs(target_dir, exist_ok=True)
+
+    pending = [e for e in entries if not _is_locked_skill_current(e, os.path.join(target_dir, e.name))]
+    up_to_date = len(entries) - len(pending)
+
+    click.echo(f"Installing from: {click.style(os.path.basename(lockfile_path), fg='cyan')} ({len(entries)} locked skill(s))")
+
+    by_repo: dict[str, list[LockedSkill]] = defaultdict(list)
+    for entry in pending:
+        by_repo[entry.repo_url].append(entry)
+
+    results: dict[str, tuple[bool, str]] = {}
+
+    with tempfile.TemporaryDirectory(prefix='openskills-frozen-') as temp_dir:
+        jobs = []
+        for index, (repo_url, repo_entries) in enumerate(by_repo.items()):
+            commits = {e.commit for e in repo_entries}
+            repo_dir = _fetch_locked_repo(repo_url, commits, options.offline)
+
+            for commit in sorted(commits):
+                export_dir = os.path.join(temp_dir, f"{index}-{commit[:12]}")
+                at_commit = [e for e in repo_entries if e.commit == commit]
+                try:
+                    _export_commit(repo_dir, commit, {e.subpath for e in at_commit}, export_dir)
+                except (subprocess.CalledProcessError, ValueError) as e:
+                    if isinstance(e, ValueError):
+                        error = str(e)
+                    else:
+                        error = e.stderr.decode().strip() if e.stderr else 'git archive failed'
+                    for entry in at_commit:
+                        results[entry.name] = (False, error)
+                    continue
+                jobs.extend((entry, export_dir) for entry in at_commit)
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(INSTALL_WORKERS, len(jobs))) as pool:
+                futures = {
+                    entry.name: pool.submit(_materialize_locked_skill, entry, export_dir, target_dir)
+                    for entry, export_dir in jobs
+                }
+                for name, future in futures.items():
+                    try:
+                        results[name] = future.result()
+                    except OSError as e:
+                        results[name] = (False, str(e))
+
+    installed = 0
+    failed = 0
+    for entry in pending:
+        success, note = results[entry.name]
+        if success:
+            installed += 1
+            suffix = click.style(f" ({note})", fg='yellow') if note else ''
+            click.echo(click.style(f"[OK] Installed: {entry.name}", fg='green') + suffix)
+        else:
+            failed += 1
+            click.echo(click.style(f"Failed: {entry.name} ({note})", fg='red'))
+
+    click.echo(click.style(
+        f"\nSummary: {installed} installed, {up_to_date} up to date, {failed} failed ({len(entries)} total)",
+        dim=True
+    ))
+
+    if failed:
+        sys.exit(1)
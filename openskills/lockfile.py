@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+
+from openskills.dirs import get_skills_dir
+from openskills.locks import target_lock
+from openskills.models import LockedSkill
+
+LOCKFILE_NAME = 'openskills.lock'
+LOCKFILE_VERSION = 1
+
+
+def get_lockfile_path() -> str:
+    return os.path.join(os.getcwd(), LOCKFILE_NAME)
+
+
+def is_project_target(target_path: str) -> bool:
+    return os.path.dirname(os.path.abspath(target_path)) == os.path.abspath(get_skills_dir())
+
+
+def read_lockfile(path: str | None = None) -> list[LockedSkill]:
+    path = path or get_lockfile_path()
+    if not os.path.exists(path):
+        return []
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [
+            LockedSkill(
+                name=item['name'],
+                repo_url=item['repo_url'],
+                commit=item['commit'],
+                subpath=item.get('subpath') or '',
+                tree_hash=item.get('tree_hash'),
+            )
+            for item in data.get('skills', [])
+        ]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return []
+
+
+def write_lockfile(entries: list[LockedSkill], path: str | None = None) -> None:
+    path = path or get_lockfile_path()
+    payload = {
+        'version': LOCKFILE_VERSION,
+        'skills': [
+            {
+                'name': e.name,
+                'repo_url': e.repo_url,
+                'commit': e.commit,
+                'subpath': e.subpath,
+                'tree_hash': e.tree_hash,
+            }
+            for e in sorted(entries, key=lambda e: e.name)
+        ],
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def record_locked_skill(entry: LockedSkill, path: str | None = None) -> None:
+    path = path or get_lockfile_path()
+    with target_lock(path):
+        current = read_lockfile(path)
+        if entry in current:
+            return
+        entries = [e for e in current if e.name != entry.name]
+        entries.append(entry)
+        write_lockfile(entries, path)
+
+
+def remove_locked_skill(name: str, path: str | None = None) -> bool:
+    path = path or get_lockfile_path()
+    if not os.path.exists(path):
+        return False
+
+    with target_lock(path):
+        entries = read_lockfile(path)
+        remaining = [e for e in entries if e.name != name]
+        if len(remaining) == len(entries):
+            return False
+        write_lockfile(remaining, path)
+        return True
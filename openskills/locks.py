@@ -0,0 +1,81 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: advisory locking is unavailable, locks become no-ops.
+    fcntl = None
+
+from openskills.dirs import get_locks_dir
+
+LOCK_SUFFIX = '.lock'
+
+_held = threading.local()
+
+
+def _held_locks() -> dict[str, int]:
+    if not hasattr(_held, 'paths'):
+        _held.paths = {}
+    return _held.paths
+
+
+@contextmanager
+def file_lock(lock_path: str, shared: bool = False, blocking: bool = True) -> Iterator[bool]:
+    if fcntl is None:
+        yield True
+        return
+
+    # Re-entrant within one thread only. Another thread of this process gets
+    # its own flock and waits like any other process would, so work handed to
+    # a pool must not need a lock the submitting thread still holds.
+    lock_path = os.path.abspath(lock_path)
+    held = _held_locks()
+    if lock_path in held:
+        if not blocking:
+            # Callers probing with blocking=False (cache eviction) must never
+            # act on something this thread is still using.
+            yield False
+            return
+        held[lock_path] += 1
+        try:
+            yield True
+        finally:
+            held[lock_path] -= 1
+        return
+
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            yield False
+            return
+
+        held[lock_path] = 1
+        try:
+            yield True
+        finally:
+            del held[lock_path]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def cache_lock(cache_path: str, shared: bool = False, blocking: bool = True):
+    return file_lock(os.path.normpath(cache_path) + LOCK_SUFFIX, shared=shared, blocking=blocking)
+
+
+def get_target_lock_path(target_path: str) -> str:
+    key = hashlib.sha256(os.path.abspath(target_path).encode()).hexdigest()[:16]
+    return os.path.join(get_locks_dir(), f"target-{key}{LOCK_SUFFIX}")
+
+
+def target_lock(target_path: str, shared: bool = False, blocking: bool = True):
+    return file_lock(get_target_lock_path(target_path), shared=shared, blocking=blocking)
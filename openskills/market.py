@@ -79,6 +79,13 @@ def find_skill_by_name(name: str) -> List[MarketSkill]:
     return [skill for skill in all_skills if skill.name.lower() == name.lower()]
 
 
+def index_market_skills() -> Dict[str, List[MarketSkill]]:
+    index = defaultdict(list)
+    for skill in load_market_skills():
+        index[skill.name.lower()].append(skill)
+    return index
+
+
 def search_skills(keyword: str) -> List[MarketSkill]:
     all_skills = load_market_skills()
     keyword_lower = keyword.lower()
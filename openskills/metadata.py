@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from datetime import datetime
 
 from openskills.models import SkillRecommendation, SkillSourceMetadata
@@ -7,34 +8,62 @@ from openskills.models import SkillRecommendation, SkillSourceMetadata
 SKILL_METADATA_FILE = '.openskills.json'
 
 
-def read_skill_metadata(skill_dir: str) -> SkillSourceMetadata | None:
-    metadata_path = os.path.join(skill_dir, SKILL_METADATA_FILE)
+# Decoded metadata per path, keyed by the file's (dev, inode, mtime_ns, size),
+# so repeated reads within one command cost a stat instead of a parse.
+_metadata_cache: dict[str, tuple[tuple, dict | None]] = {}
 
-    if not os.path.exists(metadata_path):
-        return None
 
+def _decode_metadata(metadata_path: str) -> dict | None:
     try:
         with open(metadata_path, 'r', encoding='utf-8') as f:
             data = json.loads(f.read())
-            recommends = None
-            if 'recommends' in data and data['recommends']:
-                recommends = [SkillRecommendation(**d) for d in data['recommends']]
-            return SkillSourceMetadata(
-                source=data['source'],
-                source_type=data['source_type'],
-                repo_url=data.get('repo_url'),
-                subpath=data.get('subpath'),
-                local_path=data.get('local_path'),
-                installed_at=data.get('installed_at'),
-                recommends=recommends,
-            )
-    except Exception:
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
         return None
 
 
-def write_skill_metadata(skill_dir: str, metadata: SkillSourceMetadata) -> None:
+def read_skill_metadata(skill_dir: str) -> SkillSourceMetadata | None:
     metadata_path = os.path.join(skill_dir, SKILL_METADATA_FILE)
 
+    try:
+        st = os.stat(metadata_path)
+    except OSError:
+        _metadata_cache.pop(metadata_path, None)
+        return None
+    identity = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    cached = _metadata_cache.get(metadata_path)
+    if cached is None or cached[0] != identity:
+        cached = (identity, _decode_metadata(metadata_path))
+        _metadata_cache[metadata_path] = cached
+
+    data = cached[1]
+    if data is None:
+        return None
+
+    # A fresh object on every call: callers modify what they read.
+    try:
+        recommends = None
+        if 'recommends' in data and data['recommends']:
+            recommends = [SkillRecommendation(**d) for d in data['recommends']]
+        return SkillSourceMetadata(
+            source=data['source'],
+            source_type=data['source_type'],
+            repo_url=data.get('repo_url'),
+            subpath=data.get('subpath'),
+            local_path=data.get('local_path'),
+            installed_at=data.get('installed_at'),
+            recommends=recommends,
+            commit=data.get('commit'),
+            tree_hash=data.get('tree_hash'),
+            source_manifest=data.get('source_manifest'),
+            file_manifest=data.get('file_manifest'),
+        )
+    except Exception:
+        return None
+
+
+def _metadata_payload(metadata: SkillSourceMetadata) -> dict:
     payload = {
         'source': metadata.source,
         'source_type': metadata.source_type,
@@ -44,10 +73,64 @@ def write_skill_metadata(skill_dir: str, metadata: SkillSourceMetadata) -> None:
         'installed_at': metadata.installed_at or datetime.now().isoformat(),
     }
 
+    if metadata.commit:
+        payload['commit'] = metadata.commit
+
+    if metadata.tree_hash:
+        payload['tree_hash'] = metadata.tree_hash
+
+    if metadata.source_manifest is not None:
+        payload['source_manifest'] = metadata.source_manifest
+
+    if metadata.file_manifest is not None:
+        payload['file_manifest'] = metadata.file_manifest
+
     if metadata.recommends is not None:
         payload['recommends'] = [
             {'name': d.name, 'source': d.source} for d in metadata.recommends
         ]
 
-    with open(metadata_path, 'w', encoding='utf-8') as f:
+    return payload
+
+
+def write_skill_metadata(skill_dir: str, metadata: SkillSourceMetadata) -> None:
+    metadata_path = os.path.join(skill_dir, SKILL_METADATA_FILE)
+
+    # Replaced atomically, then evicted: a concurrent reader sees either the
+    # old file or the new one, never a truncated rewrite under the old key.
+    tmp_path = f"{metadata_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(_metadata_payload(metadata), f, indent=2)
+    os.replace(tmp_path, metadata_path)
+    _metadata_cache.pop(metadata_path, None)
+    _record_in_indexes(skill_dir, metadata)
+
+
+def _record_in_indexes(skill_dir: str, metadata: SkillSourceMetadata) -> None:
+    from openskills.registry import record_skill_metadata
+    from openskills.skilldb import record_indexed_metadata
+    try:
+        record_skill_metadata(skill_dir, metadata)
+    except OSError:
+        pass
+    record_indexed_metadata(skill_dir, metadata)
+
+
+def write_skill_metadata_if_changed(skill_dir: str, metadata: SkillSourceMetadata) -> bool:
+    metadata_path = os.path.join(skill_dir, SKILL_METADATA_FILE)
+    payload = _metadata_payload(metadata)
+
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == payload:
+                return False
+    except (OSError, ValueError):
+        pass
+
+    tmp_path = f"{metadata_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(payload, f, indent=2)
+    os.replace(tmp_path, metadata_path)
+    _metadata_cache.pop(metadata_path, None)
+    _record_in_indexes(skill_dir, metadata)
+    return True
@@ -12,6 +12,12 @@ class SkillSourceType(str, Enum):
     LOCAL = "local"
 
 
+class UpdateStatus(str, Enum):
+    UPDATED = "updated"
+    UP_TO_DATE = "up to date"
+    FAILED = "failed"
+
+
 @dataclass
 class SkillRecommendation:
     name: str
@@ -42,9 +48,58 @@ class SkillSourceMetadata:
     local_path: str | None = None
     recommends: list[SkillRecommendation] | None = None
     installed_at: str | None = None
+    commit: str | None = None
+    tree_hash: str | None = None
+    source_manifest: dict[str, list[int]] | None = None
+    file_manifest: dict[str, list] | None = None
+
+
+@dataclass
+class RecommendationGraph:
+    nodes: dict[str, str]
+    edges: dict[str, list[SkillRecommendation]]
 
 
 @dataclass
 class InstallOptions:
     global_install: bool = False
     yes: bool = False
+    offline: bool = False
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    path: str
+    repo_url: str | None = None
+    size: int = 0
+    fetched_at: float | None = None
+    accessed_at: float | None = None
+
+
+@dataclass
+class LockedSkill:
+    name: str
+    repo_url: str
+    commit: str
+    subpath: str = ''
+    tree_hash: str | None = None
+
+
+@dataclass
+class ManifestEntry:
+    source: str
+    names: list[str] | None = None
+    global_install: bool = False
+
+
+@dataclass
+class SyncAction:
+    action: str
+    name: str
+    target_path: str
+    source: str | None = None
+    source_type: SkillSourceType | None = None
+    repo_url: str | None = None
+    subpath: str | None = None
+    skill_dir: str | None = None
@@ -1,34 +1,177 @@
 import os
 
 from openskills.metadata import read_skill_metadata, write_skill_metadata
+from openskills.dirs import get_search_dirs
 from openskills.finder import find_all_skills, find_skill
-from openskills.models import SkillRecommendation, SkillSourceMetadata, SkillSourceType
+from openskills.registry import load_registry
+from openskills.skilldb import find_indexed_recommenders, read_indexed_metadata
+from openskills.models import RecommendationGraph, SkillRecommendation, SkillSourceMetadata, SkillSourceType
 
 
-def resolve_recommendation_tree(skill_dir: str, _visiting: set | None = None) -> dict:
-    if _visiting is None:
-        _visiting = set()
+def _new_resolution() -> dict:
+    # Shared by every tree resolved in one operation: where each skill is
+    # installed, and the finished child list of every skill already resolved.
+    return {'locations': {}, 'recs': {}}
 
-    skill_name = os.path.basename(os.path.normpath(skill_dir))
-    if skill_name in _visiting:
-        raise ValueError(f"Circular recommendation detected: {skill_name}")
 
-    _visiting = _visiting | {skill_name}
+def _locate(name: str, resolution: dict) -> str | None:
+    locations = resolution['locations']
+    if name not in locations:
+        info = find_skill(name)
+        locations[name] = info.base_dir if info else None
+    return locations[name]
+
+
+def _resolve_recs(skill_name: str, skill_dir: str, resolution: dict, visiting: set) -> list[dict]:
+    if skill_name in resolution['recs']:
+        return resolution['recs'][skill_name]
+    if skill_name in visiting:
+        raise ValueError(f"Circular recommendation detected: {skill_name}")
 
+    visiting.add(skill_name)
     metadata = read_skill_metadata(skill_dir)
     recs = []
 
     if metadata and metadata.recommends:
         for rec in metadata.recommends:
-            rec_info = find_skill(rec.name)
-            if rec_info:
-                sub_tree = resolve_recommendation_tree(rec_info.base_dir, _visiting)
-                sub_tree["source"] = rec.source
-                recs.append(sub_tree)
+            rec_dir = _locate(rec.name, resolution)
+            # Children of a skill are resolved once; parents share the list.
+            sub_recs = _resolve_recs(rec.name, rec_dir, resolution, visiting) if rec_dir else []
+            recs.append({"name": rec.name, "recs": sub_recs, "source": rec.source})
+
+    visiting.discard(skill_name)
+    resolution['recs'][skill_name] = recs
+    return recs
+
+
+def resolve_recommendation_tree(skill_dir: str, _resolution: dict | None = None) -> dict:
+    resolution = _new_resolution() if _resolution is None else _resolution
+    skill_name = os.path.basename(os.path.normpath(skill_dir))
+    return {"name": skill_name, "recs": _resolve_recs(skill_name, skill_dir, resolution, set())}
+
+
+def resolve_recommendation_trees(skill_dirs: list[str]) -> list[dict]:
+    resolution = _new_resolution()
+    return [resolve_recommendation_tree(skill_dir, resolution) for skill_dir in skill_dirs]
+
+
+def build_recommendation_graph(skills: list | None = None) -> RecommendationGraph:
+    skills = find_all_skills() if skills is None else skills
+    graph = RecommendationGraph(nodes={skill.name: skill.path for skill in skills}, edges={})
+
+    indexed = read_indexed_metadata([skill.path for skill in skills])
+    for skill in skills:
+        metadata = indexed[skill.path] if skill.path in indexed else read_skill_metadata(skill.path)
+        graph.edges[skill.name] = list(metadata.recommends) if metadata and metadata.recommends else []
+
+    return graph
+
+
+def _successors(graph: RecommendationGraph, name: str) -> list[str]:
+    return list(dict.fromkeys(rec.name for rec in graph.edges.get(name, []) if rec.name in graph.nodes))
+
+
+def find_cycles(graph: RecommendationGraph) -> list[list[str]]:
+    # Tarjan's SCC algorithm, iterative so long chains don't hit the recursion limit.
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    cycles = []
+
+    def visit(name: str) -> None:
+        index[name] = low[name] = len(index)
+        stack.append(name)
+        on_stack.add(name)
+
+    for root in sorted(graph.nodes):
+        if root in index:
+            continue
+        visit(root)
+        work = [(root, iter(_successors(graph, root)))]
+
+        while work:
+            name, children = work[-1]
+            for child in children:
+                if child not in index:
+                    visit(child)
+                    work.append((child, iter(_successors(graph, child))))
+                    break
+                if child in on_stack:
+                    low[name] = min(low[name], index[child])
             else:
-                recs.append({"name": rec.name, "source": rec.source, "recs": []})
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[name])
+                if low[name] == index[name]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    if len(component) > 1 or name in _successors(graph, name):
+                        cycles.append(sorted(component))
+
+    return sorted(cycles)
+
 
-    return {"name": skill_name, "recs": recs}
+def check_recommendation_graph(graph: RecommendationGraph) -> dict:
+    missing = {}
+    satisfied = {}
+
+    for name, recs in graph.edges.items():
+        missing[name] = [rec for rec in recs if rec.name not in graph.nodes]
+        satisfied[name] = [rec for rec in recs if rec.name in graph.nodes]
+
+    return {"missing": missing, "satisfied": satisfied, "cycles": find_cycles(graph)}
+
+
+def _graph_recs(graph: RecommendationGraph, name: str, expanded: set, path: set) -> list[dict]:
+    recs = []
+    for rec in graph.edges.get(name, []):
+        node = {"name": rec.name, "recs": [], "source": rec.source}
+        if rec.name in path:
+            node["cycle"] = True
+        elif rec.name in expanded:
+            node["seen"] = True
+        elif rec.name in graph.nodes:
+            expanded.add(rec.name)
+            path.add(rec.name)
+            node["recs"] = _graph_recs(graph, rec.name, expanded, path)
+            path.discard(rec.name)
+        recs.append(node)
+    return recs
+
+
+def graph_recommendation_trees(graph: RecommendationGraph, names: list[str]) -> list[dict]:
+    # Each skill is expanded at most once per tree: an edge back into the
+    # current path becomes a cycle leaf and any other repeat a "seen" leaf,
+    # so a tree never grows beyond the edges reachable from its root.
+    return [{"name": name, "recs": _graph_recs(graph, name, {name}, {name})} for name in names]
+
+
+def export_recommendation_graph(graph: RecommendationGraph) -> dict:
+    # Every skill appears once no matter how many skills recommend it, so the
+    # export stays linear in nodes + edges rather than in tree size.
+    nodes = {name: {"name": name, "status": "installed", "path": path} for name, path in graph.nodes.items()}
+    edges = {}
+
+    for name in sorted(graph.edges):
+        for rec in graph.edges[name]:
+            if rec.name not in nodes:
+                nodes[rec.name] = {"name": rec.name, "status": "missing", "source": rec.source}
+            elif nodes[rec.name]["status"] == "missing" and not nodes[rec.name]["source"]:
+                nodes[rec.name]["source"] = rec.source
+            edges.setdefault((name, rec.name), {"from": name, "to": rec.name, "source": rec.source})
+
+    return {
+        "nodes": [nodes[name] for name in sorted(nodes)],
+        "edges": list(edges.values()),
+        "cycles": find_cycles(graph),
+    }
 
 
 def check_recommendations(skill_dir: str) -> dict:
@@ -50,16 +193,27 @@ def check_recommendations(skill_dir: str) -> dict:
 
 
 def get_recommenders(skill_name: str) -> list[dict]:
-    all_skills = find_all_skills()
     recommenders = []
-
-    for skill in all_skills:
-        metadata = read_skill_metadata(skill.path)
-        if metadata and metadata.recommends:
-            for rec in metadata.recommends:
-                if rec.name == skill_name:
-                    recommenders.append({"name": skill.name, "location": skill.location})
-                    break
+    seen = set()
+
+    # Each search directory keeps a reverse index in its registry; a skill
+    # shadowed by one in an earlier directory is skipped, as in find_all_skills.
+    for directory in get_search_dirs():
+        indexed = find_indexed_recommenders(directory, skill_name)
+        if indexed is not None:
+            names, installed = indexed
+        else:
+            registry = load_registry(directory)
+            if not registry:
+                continue
+            names = registry['recommenders'].get(skill_name, [])
+            installed = {name for name, entry in registry['entries'].items() if entry.get('skill') is not None}
+
+        location = 'project' if os.getcwd() in directory else 'global'
+        for name in names:
+            if name not in seen:
+                recommenders.append({"name": name, "location": location})
+        seen.update(installed)
 
     return recommenders
 
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Iterator
+
+from openskills.dirs import get_registry_dir
+from openskills.locks import LOCK_SUFFIX, file_lock
+from openskills.metadata import SKILL_METADATA_FILE, read_skill_metadata
+from openskills.models import SkillSourceMetadata
+from openskills.staging import is_staging_name
+from openskills.yaml_utils import read_skill_frontmatter
+
+REGISTRY_VERSION = 2
+# Stats this close to the time of the scan may still change within the same
+# timestamp tick, so they are not trusted on the next run.
+RACY_WINDOW_NS = 2_000_000_000
+UNTRUSTED_KEY = [-1, -1, -1]
+
+
+def get_registry_path(directory: str) -> str:
+    key = hashlib.sha256(os.path.abspath(directory).encode()).hexdigest()[:16]
+    return os.path.join(get_registry_dir(), f'{key}.json')
+
+
+def stat_key(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def trusted_stat_key(key: list[int] | None, now_ns: int) -> list[int] | None:
+    # A racy stat is recorded as a key no real file can match, so the entry
+    # is re-read next time while still counting as present.
+    if key is not None and now_ns - key[1] < RACY_WINDOW_NS:
+        return UNTRUSTED_KEY
+    return key
+
+
+def read_registry(directory: str) -> dict:
+    try:
+        with open(get_registry_path(directory), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != REGISTRY_VERSION:
+        return {}
+    if data.get('directory') != os.path.abspath(directory) or not isinstance(data.get('entries'), dict):
+        return {}
+    return data
+
+
+def _build_index(entries: dict) -> dict[str, list[str]]:
+    recommenders: dict[str, list[str]] = {}
+    for name, entry in sorted(entries.items()):
+        if entry.get('skill') is None:
+            continue
+        for rec_name in entry.get('recommends', []):
+            recommenders.setdefault(rec_name, []).append(name)
+    return recommenders
+
+
+def write_registry(directory: str, dir_mtime_ns: int | None, entries: dict) -> dict:
+    path = get_registry_path(directory)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    data = {
+        'version': REGISTRY_VERSION,
+        'directory': os.path.abspath(directory),
+        'mtime_ns': dir_mtime_ns,
+        'entries': entries,
+        'recommenders': _build_index(entries),
+    }
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The registry is only a cache; listing still works without it.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return data
+
+
+def list_skill_dirs(directory: str) -> list[str]:
+    names = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if is_staging_name(entry.name):
+                continue
+            try:
+                if entry.is_dir():
+                    names.append(entry.name)
+            except OSError:
+                continue
+    return sorted(names)
+
+
+def read_skill_description(skill_md: str) -> str:
+    fields = read_skill_frontmatter(skill_md) or {}
+    return fields.get('description', '').strip()
+
+
+def _read_recommends(skill_dir: str) -> list[str]:
+    metadata = read_skill_metadata(skill_dir)
+    if not metadata or not metadata.recommends:
+        return []
+    return [rec.name for rec in metadata.recommends]
+
+
+def diff_skill_stats(
+    directory: str,
+    names: list[str],
+    previous: dict[str, tuple[list[int] | None, list[int] | None]],
+    now_ns: int,
+) -> Iterator[tuple[str, list[int] | None, list[int] | None, str | None, bool]]:
+    # Shared by the JSON registry and the SQLite index. `previous` maps names to
+    # their recorded (skill, meta) stat keys; yields (name, skill_key, meta_key,
+    # description, meta_changed) with keys ready to record. description is None
+    # when SKILL.md is unchanged, skill_key is None when SKILL.md is missing,
+    # and a skill whose SKILL.md cannot be read is left out.
+    for name in names:
+        skill_dir = os.path.join(directory, name)
+        skill_md = os.path.join(skill_dir, 'SKILL.md')
+        skill_key = stat_key(skill_md)
+        meta_key = stat_key(os.path.join(skill_dir, SKILL_METADATA_FILE))
+        previous_skill, previous_meta = previous.get(name, (None, None))
+
+        if not skill_key:
+            yield name, None, None, None, False
+            continue
+
+        description = None
+        if previous_skill != skill_key:
+            try:
+                description = read_skill_description(skill_md)
+            except (OSError, UnicodeDecodeError):
+                continue
+
+        meta_changed = previous_skill is None or previous_meta != meta_key
+        yield name, trusted_stat_key(skill_key, now_ns), trusted_stat_key(meta_key, now_ns), description, meta_changed
+
+
+def _refresh_registry(directory: str) -> dict:
+    try:
+        dir_mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {}
+
+    cached = read_registry(directory)
+    cached_entries = cached.get('entries', {})
+
+    # Adding, removing or swapping a skill changes the directory mtime, so an
+    # unchanged mtime means the cached name list can be reused without scandir.
+    if cached and cached.get('mtime_ns') == dir_mtime_ns:
+        names = sorted(cached_entries)
+    else:
+        try:
+            names = list_skill_dirs(directory)
+        except OSError:
+            return {}
+
+    now_ns = time.time_ns()
+    previous = {name: (entry.get('skill'), entry.get('meta')) for name, entry in cached_entries.items()}
+    entries = {}
+
+    for name, skill_key, meta_key, description, meta_changed in diff_skill_stats(directory, names, previous, now_ns):
+        if skill_key is None:
+            entries[name] = {'skill': None, 'meta': None, 'description': '', 'recommends': []}
+            continue
+
+        entry = cached_entries.get(name) or {}
+        if meta_changed:
+            recommends = _read_recommends(os.path.join(directory, name)) if meta_key is not None else []
+        else:
+            recommends = entry.get('recommends', [])
+
+        entries[name] = {
+            'skill': skill_key,
+            'meta': meta_key,
+            'description': entry.get('description', '') if description is None else description,
+            'recommends': recommends,
+        }
+
+    recorded_mtime = None if now_ns - dir_mtime_ns < RACY_WINDOW_NS else dir_mtime_ns
+    if cached and cached.get('mtime_ns') == recorded_mtime and cached_entries == entries:
+        return cached
+    return write_registry(directory, recorded_mtime, entries)
+
+
+def _entries_unchanged(directory: str, entries: dict) -> bool:
+    # Files edited in place leave the directory mtime alone, so every entry is
+    # checked against its own stat keys.
+    for name, entry in entries.items():
+        skill_dir = os.path.join(directory, name)
+        if stat_key(os.path.join(skill_dir, 'SKILL.md')) != entry.get('skill'):
+            return False
+        if entry.get('skill') is not None and stat_key(os.path.join(skill_dir, SKILL_METADATA_FILE)) != entry.get('meta'):
+            return False
+    return True
+
+
+def load_registry(directory: str) -> dict:
+    try:
+        dir_mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {}
+    data = read_registry(directory)
+    if (data and data.get('mtime_ns') == dir_mtime_ns and isinstance(data.get('recommenders'), dict)
+            and _entries_unchanged(directory, data['entries'])):
+        return data
+    return _refresh_registry(directory)
+
+
+def scan_directory(directory: str) -> list[tuple[str, str]]:
+    data = _refresh_registry(directory)
+    return [
+        (name, entry['description'])
+        for name, entry in sorted(data.get('entries', {}).items())
+        if entry.get('skill') is not None
+    ]
+
+
+def record_skill_metadata(skill_dir: str, metadata: SkillSourceMetadata) -> None:
+    directory, name = os.path.split(os.path.normpath(skill_dir))
+    if is_staging_name(name):
+        return
+
+    with file_lock(get_registry_path(directory) + LOCK_SUFFIX):
+        data = read_registry(directory)
+        entry = data.get('entries', {}).get(name)
+        if not entry or entry.get('skill') is None:
+            return
+        meta_key = stat_key(os.path.join(skill_dir, SKILL_METADATA_FILE))
+        entry['meta'] = trusted_stat_key(meta_key, time.time_ns())
+        entry['recommends'] = [rec.name for rec in metadata.recommends or []]
+        write_registry(directory, data.get('mtime_ns'), data['entries'])
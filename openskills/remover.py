@@ -7,7 +7,10 @@ from typing import Any
 import click
 
 from openskills.finder import find_skill, find_all_skills
+from openskills.locks import target_lock
+from openskills.lockfile import is_project_target, remove_locked_skill
 from openskills.recommends import get_recommenders
+from openskills.skilldb import forget_indexed_skill
 
 
 def _prompt_for_selection(message: str, choices: list[dict[str, Any]]) -> list[str]:
@@ -53,7 +56,11 @@ def remove_skill(skill_name: str) -> None:
             click.echo(click.style(f"Aborted. \"{skill_name}\" was not removed.", fg='yellow'))
             return
 
-    shutil.rmtree(skill.base_dir, ignore_errors=True)
+    with target_lock(skill.base_dir):
+        shutil.rmtree(skill.base_dir, ignore_errors=True)
+    forget_indexed_skill(skill.base_dir)
+    if is_project_target(skill.base_dir):
+        remove_locked_skill(skill_name)
 
     location = 'global' if str(Path.home()) in skill.source else 'project'
     click.echo(f"✅ Removed: {skill_name}")
@@ -88,7 +95,11 @@ def manage_skills() -> None:
         for skill_name in to_remove:
             skill = find_skill(skill_name)
             if skill:
-                shutil.rmtree(skill.base_dir, ignore_errors=True)
+                with target_lock(skill.base_dir):
+                    shutil.rmtree(skill.base_dir, ignore_errors=True)
+                forget_indexed_skill(skill.base_dir)
+                if is_project_target(skill.base_dir):
+                    remove_locked_skill(skill_name)
                 location = 'project' if os.getcwd() in skill.source else 'global'
                 click.echo(click.style(f"✅ Removed: {skill_name} ({location})", fg='green'))
 
@@ -0,0 +1,312 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from openskills.dirs import get_skills_dir
+from openskills.metadata import SKILL_METADATA_FILE, read_skill_metadata
+from openskills.models import SkillRecommendation, SkillSourceMetadata
+from openskills.registry import RACY_WINDOW_NS, diff_skill_stats, list_skill_dirs, stat_key, trusted_stat_key
+from openskills.staging import is_staging_name
+
+SKILL_DB_ENV = 'OPENSKILLS_SKILL_DB'
+SKILL_DB_FILE = '.openskills.db'
+SKILL_DB_VERSION = 3
+SKILL_DB_TIMEOUT = 30
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER);
+CREATE TABLE IF NOT EXISTS skills (
+    name TEXT PRIMARY KEY,
+    skill_key TEXT,
+    meta_key TEXT,
+    description TEXT NOT NULL DEFAULT '',
+    source TEXT,
+    source_type TEXT,
+    repo_url TEXT,
+    subpath TEXT,
+    local_path TEXT,
+    installed_at TEXT,
+    commit_sha TEXT,
+    tree_hash TEXT,
+    source_manifest TEXT,
+    file_manifest TEXT
+);
+CREATE TABLE IF NOT EXISTS recommends (
+    skill TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (skill, position)
+);
+CREATE INDEX IF NOT EXISTS recommends_name ON recommends (name);
+'''
+
+_METADATA_COLUMNS = (
+    'source', 'source_type', 'repo_url', 'subpath', 'local_path',
+    'installed_at', 'commit_sha', 'tree_hash', 'source_manifest', 'file_manifest',
+)
+
+
+def is_skill_db_enabled() -> bool:
+    return os.environ.get(SKILL_DB_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_skill_db_path(directory: str) -> str:
+    return os.path.join(directory, SKILL_DB_FILE)
+
+
+def _is_managed_root(directory: str) -> bool:
+    # Only the roots openskills installs into get an index; other tools' skill
+    # directories such as .claude/skills are read but never written to.
+    directory = os.path.normpath(os.path.abspath(directory))
+    return any(directory == os.path.normpath(get_skills_dir(global_install)) for global_install in (False, True))
+
+
+def _connect(directory: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(get_skill_db_path(directory), timeout=SKILL_DB_TIMEOUT)
+    try:
+        # A persistent journal is not created and deleted on every write, so
+        # the skills root keeps its mtime and the refresh fast path holds.
+        conn.execute('PRAGMA journal_mode=PERSIST')
+        if conn.execute('PRAGMA user_version').fetchone()[0] != SKILL_DB_VERSION:
+            with conn:
+                conn.execute('DROP TABLE IF EXISTS state')
+                conn.execute('DROP TABLE IF EXISTS skills')
+                conn.execute('DROP TABLE IF EXISTS recommends')
+                conn.executescript(_SCHEMA)
+                conn.execute(f'PRAGMA user_version={SKILL_DB_VERSION}')
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def _open(directory: str) -> sqlite3.Connection:
+    try:
+        return _connect(directory)
+    except sqlite3.DatabaseError:
+        # The index only mirrors .openskills.json files; a damaged one is rebuilt.
+        for suffix in ('', '-journal'):
+            try:
+                os.remove(get_skill_db_path(directory) + suffix)
+            except FileNotFoundError:
+                pass
+        return _connect(directory)
+
+
+def _encode_key(key: list[int] | None) -> str | None:
+    return json.dumps(key) if key is not None else None
+
+
+def _metadata_row(metadata: SkillSourceMetadata | None) -> tuple:
+    if metadata is None:
+        return (None,) * len(_METADATA_COLUMNS)
+    manifests = [
+        json.dumps(manifest) if manifest is not None else None
+        for manifest in (metadata.source_manifest, metadata.file_manifest)
+    ]
+    return (
+        metadata.source, metadata.source_type, metadata.repo_url, metadata.subpath, metadata.local_path,
+        metadata.installed_at, metadata.commit, metadata.tree_hash, *manifests,
+    )
+
+
+def _write_metadata(conn: sqlite3.Connection, name: str, metadata: SkillSourceMetadata | None) -> None:
+    assignments = ', '.join(f'{column} = ?' for column in _METADATA_COLUMNS)
+    conn.execute(f'UPDATE skills SET {assignments} WHERE name = ?', (*_metadata_row(metadata), name))
+    conn.execute('DELETE FROM recommends WHERE skill = ?', (name,))
+    if metadata and metadata.recommends:
+        conn.executemany(
+            'INSERT INTO recommends (skill, position, name, source) VALUES (?, ?, ?, ?)',
+            [(name, i, rec.name, rec.source or '') for i, rec in enumerate(metadata.recommends)],
+        )
+
+
+def _decode_key(key: str | None) -> list[int] | None:
+    return json.loads(key) if key is not None else None
+
+
+def _refresh(conn: sqlite3.Connection, directory: str) -> None:
+    dir_mtime_ns = os.stat(directory).st_mtime_ns
+    row = conn.execute("SELECT value FROM state WHERE key = 'mtime_ns'").fetchone()
+    recorded = row[0] if row else None
+    rows = {
+        name: (_decode_key(skill_key), _decode_key(meta_key))
+        for name, skill_key, meta_key in conn.execute('SELECT name, skill_key, meta_key FROM skills')
+    }
+
+    # Same rule as the JSON registry: an unchanged directory mtime means the
+    # set of skill directories is unchanged, so only per-skill stats are taken.
+    names = sorted(rows) if recorded == dir_mtime_ns else list_skill_dirs(directory)
+    now_ns = time.time_ns()
+    present = set()
+
+    with conn:
+        for name, skill_key, meta_key, description, meta_changed in diff_skill_stats(directory, names, rows, now_ns):
+            present.add(name)
+            if skill_key is None:
+                # Kept as a placeholder so a SKILL.md added later is noticed.
+                conn.execute(
+                    'INSERT OR REPLACE INTO skills (name, skill_key, meta_key) VALUES (?, NULL, NULL)', (name,)
+                )
+                conn.execute('DELETE FROM recommends WHERE skill = ?', (name,))
+                continue
+
+            if name not in rows:
+                conn.execute('INSERT INTO skills (name) VALUES (?)', (name,))
+            if description is not None:
+                conn.execute('UPDATE skills SET description = ? WHERE name = ?', (description, name))
+            if meta_changed:
+                skill_dir = os.path.join(directory, name)
+                _write_metadata(conn, name, read_skill_metadata(skill_dir) if meta_key is not None else None)
+
+            conn.execute(
+                'UPDATE skills SET skill_key = ?, meta_key = ? WHERE name = ?',
+                (_encode_key(skill_key), _encode_key(meta_key), name),
+            )
+
+        gone = [(name,) for name in rows.keys() - present]
+        conn.executemany('DELETE FROM skills WHERE name = ?', gone)
+        conn.executemany('DELETE FROM recommends WHERE skill = ?', gone)
+
+        trusted_mtime = None if now_ns - dir_mtime_ns < RACY_WINDOW_NS else dir_mtime_ns
+        conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('mtime_ns', ?)", (trusted_mtime,))
+
+
+def _open_fresh(directory: str) -> sqlite3.Connection | None:
+    if not is_skill_db_enabled() or not _is_managed_root(directory) or not os.path.isdir(directory):
+        return None
+    conn = _open(directory)
+    try:
+        _refresh(conn, directory)
+    except (OSError, sqlite3.Error):
+        conn.close()
+        raise
+    return conn
+
+
+def _metadata_from_row(row: tuple, recommends: list[SkillRecommendation]) -> SkillSourceMetadata | None:
+    source, source_type, repo_url, subpath, local_path, installed_at, commit, tree_hash, manifest, files = row
+    if source is None:
+        return None
+    return SkillSourceMetadata(
+        source=source,
+        source_type=source_type,
+        repo_url=repo_url,
+        subpath=subpath,
+        local_path=local_path,
+        installed_at=installed_at,
+        recommends=recommends or None,
+        commit=commit,
+        tree_hash=tree_hash,
+        source_manifest=json.loads(manifest) if manifest is not None else None,
+        file_manifest=json.loads(files) if files is not None else None,
+    )
+
+
+def list_indexed_skills(directory: str) -> list[tuple[str, str]] | None:
+    # None means "no usable index here"; callers fall back to the JSON registry.
+    try:
+        conn = _open_fresh(directory)
+        if conn is None:
+            return None
+        with closing(conn):
+            return conn.execute(
+                'SELECT name, description FROM skills WHERE skill_key IS NOT NULL ORDER BY name'
+            ).fetchall()
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _read_directory_metadata(directory: str) -> dict[str, SkillSourceMetadata | None] | None:
+    try:
+        conn = _open_fresh(directory)
+        if conn is None:
+            return None
+        with closing(conn):
+            recommends: dict[str, list[SkillRecommendation]] = {}
+            for skill, name, source in conn.execute(
+                'SELECT skill, name, source FROM recommends ORDER BY skill, position'
+            ):
+                recommends.setdefault(skill, []).append(SkillRecommendation(name=name, source=source))
+            columns = ', '.join(_METADATA_COLUMNS)
+            return {
+                row[0]: _metadata_from_row(row[1:], recommends.get(row[0], []))
+                for row in conn.execute(f'SELECT name, {columns} FROM skills WHERE skill_key IS NOT NULL')
+            }
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def read_indexed_metadata(skill_dirs: list[str]) -> dict[str, SkillSourceMetadata | None]:
+    # One query per skills root instead of one JSON parse per skill. Only
+    # directories covered by an index are returned.
+    if not is_skill_db_enabled():
+        return {}
+
+    by_root: dict[str, list[str]] = {}
+    for skill_dir in skill_dirs:
+        root, name = os.path.split(os.path.normpath(skill_dir))
+        by_root.setdefault(root, []).append(skill_dir)
+
+    results = {}
+    for root, dirs in by_root.items():
+        indexed = _read_directory_metadata(root)
+        if indexed is None:
+            continue
+        for skill_dir in dirs:
+            name = os.path.basename(os.path.normpath(skill_dir))
+            if name in indexed:
+                results[skill_dir] = indexed[name]
+    return results
+
+
+def find_indexed_recommenders(directory: str, skill_name: str) -> tuple[list[str], set[str]] | None:
+    try:
+        conn = _open_fresh(directory)
+        if conn is None:
+            return None
+        with closing(conn):
+            recommenders = [name for (name,) in conn.execute(
+                'SELECT DISTINCT r.skill FROM recommends r JOIN skills s ON s.name = r.skill '
+                'WHERE r.name = ? AND s.skill_key IS NOT NULL ORDER BY r.skill',
+                (skill_name,),
+            )]
+            installed = {name for (name,) in conn.execute('SELECT name FROM skills WHERE skill_key IS NOT NULL')}
+            return recommenders, installed
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _update_index(skill_dir: str, update) -> None:
+    directory, name = os.path.split(os.path.normpath(skill_dir))
+    if not is_skill_db_enabled() or is_staging_name(name) or not os.path.exists(get_skill_db_path(directory)):
+        return
+    try:
+        with closing(_open(directory)) as conn, conn:
+            update(conn, name)
+    except (OSError, sqlite3.Error):
+        # Left stale; the next refresh re-reads the changed files.
+        pass
+
+
+def record_indexed_metadata(skill_dir: str, metadata: SkillSourceMetadata) -> None:
+    def update(conn: sqlite3.Connection, name: str) -> None:
+        row = conn.execute('SELECT skill_key FROM skills WHERE name = ?', (name,)).fetchone()
+        if not row or row[0] is None:
+            return
+        _write_metadata(conn, name, metadata)
+        meta_key = trusted_stat_key(stat_key(os.path.join(skill_dir, SKILL_METADATA_FILE)), time.time_ns())
+        conn.execute('UPDATE skills SET meta_key = ? WHERE name = ?', (_encode_key(meta_key), name))
+
+    _update_index(skill_dir, update)
+
+
+def forget_indexed_skill(skill_dir: str) -> None:
+    def update(conn: sqlite3.Connection, name: str) -> None:
+        conn.execute('DELETE FROM skills WHERE name = ?', (name,))
+        conn.execute('DELETE FROM recommends WHERE skill = ?', (name,))
+
+    _update_index(skill_dir, update)
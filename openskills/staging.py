@@ -0,0 +1,221 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from openskills.hashing import build_file_manifest, hash_file, walk_tree
+from openskills.metadata import SKILL_METADATA_FILE, write_skill_metadata
+from openskills.models import SkillSourceMetadata
+
+STAGING_PREFIX = '.openskills-stage-'
+TRASH_PREFIX = '.openskills-old-'
+
+
+def is_staging_name(name: str) -> bool:
+    return name.startswith(STAGING_PREFIX) or name.startswith(TRASH_PREFIX)
+
+
+def stage_tree(source_dir: str, target_path: str) -> str:
+    # Staging happens next to the target so the final swap is a same-filesystem rename.
+    parent = os.path.dirname(os.path.abspath(target_path))
+    os.makedirs(parent, exist_ok=True)
+    staged = tempfile.mkdtemp(prefix=f"{STAGING_PREFIX}{os.path.basename(target_path)}-", dir=parent)
+    try:
+        shutil.copytree(source_dir, staged, dirs_exist_ok=True)
+    except BaseException:
+        shutil.rmtree(staged, ignore_errors=True)
+        raise
+    return staged
+
+
+def swap_into_place(staged: str, target_path: str) -> str | None:
+    parent = os.path.dirname(os.path.abspath(target_path))
+    old_path = None
+
+    if os.path.lexists(target_path):
+        old_path = tempfile.mkdtemp(prefix=f"{TRASH_PREFIX}{os.path.basename(target_path)}-", dir=parent)
+        os.rmdir(old_path)
+        os.rename(target_path, old_path)
+
+    try:
+        os.rename(staged, target_path)
+    except BaseException:
+        if old_path is not None:
+            os.rename(old_path, target_path)
+        raise
+
+    return old_path
+
+
+def discard_tree(path: str | None, background: bool = True) -> None:
+    if not path:
+        return
+    if not background:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    # Non-daemon so the interpreter waits for the delete instead of leaving
+    # a half-removed trash directory behind.
+    threading.Thread(target=shutil.rmtree, args=(path, True), name='openskills-discard').start()
+
+
+def _write_staged_metadata(staged: str, metadata: SkillSourceMetadata | None) -> None:
+    if metadata is None:
+        return
+    if metadata.file_manifest:
+        # Re-stat from the staged copy: renames keep these stats, while a file
+        # linked from the old tree may carry a different mtime than the source.
+        file_hashes = {rel_path: entry[0] for rel_path, entry in metadata.file_manifest.items()}
+        metadata.file_manifest = build_file_manifest(staged, file_hashes)
+    write_skill_metadata(staged, metadata)
+
+
+def install_tree(
+    source_dir: str,
+    target_path: str,
+    metadata: SkillSourceMetadata | None = None,
+    preserve_metadata: bool = False,
+) -> None:
+    staged = stage_tree(source_dir, target_path)
+
+    try:
+        staged_meta = os.path.join(staged, SKILL_METADATA_FILE)
+        current_meta = os.path.join(target_path, SKILL_METADATA_FILE)
+        if preserve_metadata and not os.path.exists(staged_meta) and os.path.exists(current_meta):
+            shutil.copy2(current_meta, staged_meta)
+
+        _write_staged_metadata(staged, metadata)
+
+        old_path = swap_into_place(staged, target_path)
+    except BaseException:
+        shutil.rmtree(staged, ignore_errors=True)
+        raise
+
+    discard_tree(old_path)
+
+
+def _walk_tree(root: str) -> tuple[dict[str, os.stat_result], set[str]]:
+    # Same view of the tree as install's copytree: symlinked directories are
+    # followed, so update stages their contents too.
+    files = {}
+    dirs = set()
+    for rel_path, entry in walk_tree(root):
+        if entry is None:
+            dirs.add(rel_path)
+            continue
+        if rel_path == SKILL_METADATA_FILE:
+            continue
+        try:
+            files[rel_path] = entry.stat()
+        except OSError:
+            continue
+    return files, dirs
+
+
+def _same_file(source: str, source_stat: os.stat_result, target: str, target_stat: os.stat_result | None) -> bool:
+    if target_stat is None or source_stat.st_size != target_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+        return True
+    return hash_file(source) == hash_file(target)
+
+
+def delta_bytes(source_dir: str, target_path: str) -> int:
+    # Upper bound on what staging will copy: files whose size or mtime differ.
+    # Content-identical files with a new mtime are counted but end up linked.
+    source_files, _ = _walk_tree(source_dir)
+    target_files = _walk_tree(target_path)[0] if os.path.isdir(target_path) else {}
+    needed = 0
+    for rel_path, source_stat in source_files.items():
+        target_stat = target_files.get(rel_path)
+        if (
+            target_stat is None
+            or target_stat.st_size != source_stat.st_size
+            or target_stat.st_mtime_ns != source_stat.st_mtime_ns
+        ):
+            needed += source_stat.st_size
+    return needed
+
+
+def stage_delta_tree(
+    source_dir: str,
+    target_path: str,
+    metadata: SkillSourceMetadata | None = None,
+    preserve_metadata: bool = False,
+) -> str:
+    parent = os.path.dirname(os.path.abspath(target_path))
+    os.makedirs(parent, exist_ok=True)
+    staged = tempfile.mkdtemp(prefix=f"{STAGING_PREFIX}{os.path.basename(target_path)}-", dir=parent)
+
+    try:
+        source_files, source_dirs = _walk_tree(source_dir)
+        target_files = _walk_tree(target_path)[0] if os.path.isdir(target_path) else {}
+
+        for rel_dir in sorted(source_dirs):
+            os.makedirs(os.path.join(staged, rel_dir), exist_ok=True)
+
+        for rel_path, source_stat in source_files.items():
+            source = os.path.join(source_dir, rel_path)
+            current = os.path.join(target_path, rel_path)
+            dest = os.path.join(staged, rel_path)
+            # Unchanged files are hard-linked from the installed tree, so only
+            # changed files cost a copy and their inodes survive the swap.
+            if _same_file(source, source_stat, current, target_files.get(rel_path)):
+                try:
+                    os.link(current, dest)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(source, dest)
+
+        # mkdtemp creates the root as 0700; like copytree, directories take
+        # the source's permissions once their contents are in place.
+        for rel_dir in sorted(source_dirs, reverse=True):
+            shutil.copystat(os.path.join(source_dir, rel_dir), os.path.join(staged, rel_dir))
+        shutil.copystat(source_dir, staged)
+
+        source_meta = os.path.join(source_dir, SKILL_METADATA_FILE)
+        current_meta = os.path.join(target_path, SKILL_METADATA_FILE)
+        staged_meta = os.path.join(staged, SKILL_METADATA_FILE)
+        if os.path.exists(source_meta):
+            shutil.copy2(source_meta, staged_meta)
+        elif preserve_metadata and os.path.exists(current_meta):
+            shutil.copy2(current_meta, staged_meta)
+
+        _write_staged_metadata(staged, metadata)
+    except BaseException:
+        shutil.rmtree(staged, ignore_errors=True)
+        raise
+
+    return staged
+
+
+def _restore(target_path: str, old_path: str | None) -> None:
+    parent = os.path.dirname(os.path.abspath(target_path))
+    failed = tempfile.mkdtemp(prefix=f"{TRASH_PREFIX}{os.path.basename(target_path)}-", dir=parent)
+    os.rmdir(failed)
+    os.rename(target_path, failed)
+    if old_path is not None:
+        os.rename(old_path, target_path)
+    discard_tree(failed)
+
+
+def commit_staged(pairs: list[tuple[str, str]]) -> None:
+    # Commit is renames only. Previous trees are kept until every swap has
+    # succeeded, so a failure part-way restores the whole batch.
+    committed: list[tuple[str, str | None]] = []
+    try:
+        for staged, target_path in pairs:
+            committed.append((target_path, swap_into_place(staged, target_path)))
+    except BaseException:
+        for target_path, old_path in reversed(committed):
+            _restore(target_path, old_path)
+        discard_staged(pairs[len(committed):])
+        raise
+
+    for _, old_path in committed:
+        discard_tree(old_path)
+
+
+def discard_staged(pairs: list[tuple[str, str]]) -> None:
+    for staged, _ in pairs:
+        shutil.rmtree(staged, ignore_errors=True)
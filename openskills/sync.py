@@ -0,0 +1,363 @@
+import os
+import shutil
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import click
+import yaml
+
+from openskills.cache import get_cache_path, get_remote_head, get_repo_commit, is_cache_fresh
+from openskills.dirs import get_skills_dir
+from openskills.hashing import compute_tree_hash, snapshot_tree
+from openskills.installer import (
+    INSTALL_WORKERS,
+    copy_skill,
+    expand_path,
+    find_skills_in_repo,
+    get_cached_repo,
+    is_git_url,
+    is_local_path,
+    split_git_source,
+)
+from openskills.locks import cache_lock, target_lock
+from openskills.lockfile import is_project_target, remove_locked_skill
+from openskills.market import find_skill_by_name
+from openskills.metadata import read_skill_metadata
+from openskills.models import ManifestEntry, SkillSourceMetadata, SkillSourceType, SyncAction
+from openskills.skilldb import forget_indexed_skill
+from openskills.staging import is_staging_name
+
+MANIFEST_FILE_NAME = 'skills.yaml'
+
+
+def load_manifest(path: str) -> list[ManifestEntry]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or {}
+
+    items = data.get('skills') if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError("expected a 'skills' list")
+
+    entries = []
+    for item in items:
+        if isinstance(item, str):
+            entries.append(ManifestEntry(source=item))
+            continue
+        if not isinstance(item, dict) or not item.get('source'):
+            raise ValueError(f"each skill needs a 'source': {item!r}")
+
+        names = item.get('names')
+        if isinstance(names, str):
+            names = [names]
+        if names is not None and not isinstance(names, list):
+            raise ValueError(f"'names' must be a list: {item!r}")
+
+        entries.append(ManifestEntry(
+            source=str(item['source']),
+            names=[str(n) for n in names] if names else None,
+            global_install=bool(item.get('global', False)),
+        ))
+
+    return entries
+
+
+def _resolve_source(source: str) -> tuple[SkillSourceType, str, str]:
+    if is_local_path(source) or os.path.isdir(expand_path(source)):
+        return SkillSourceType.LOCAL, expand_path(source), ''
+
+    if not is_git_url(source):
+        matches = find_skill_by_name(source)
+        if len(matches) != 1:
+            reason = 'not found in market' if not matches else 'ambiguous market name'
+            raise ValueError(f"{source}: {reason}")
+        source = matches[0].source
+
+    repo_url, subpath = split_git_source(source)
+    return SkillSourceType.GIT, repo_url, subpath
+
+
+def _list_source_skills(root: str, subpath: str) -> dict[str, str]:
+    skill_dirs = {}
+    for info in find_skills_in_repo(root):
+        name = info['skill_name']
+        # A subpath pointing straight at a skill installs under its directory name.
+        if subpath and info['skill_dir'] == root:
+            name = os.path.basename(subpath.rstrip('/'))
+        skill_dirs.setdefault(name, info['skill_dir'])
+    return skill_dirs
+
+
+def _list_installed(target_dir: str) -> dict[str, SkillSourceMetadata | None]:
+    installed = {}
+    if not os.path.isdir(target_dir):
+        return installed
+
+    with os.scandir(target_dir) as entries:
+        for entry in entries:
+            if is_staging_name(entry.name) or not entry.is_dir():
+                continue
+            if os.path.exists(os.path.join(entry.path, 'SKILL.md')):
+                installed[entry.name] = read_skill_metadata(entry.path)
+
+    return installed
+
+
+def _repo_head(repo_url: str, offline: bool) -> str | None:
+    # A fresh cache entry (or --offline) answers without the network; otherwise
+    # one ls-remote per repository, as `update --check` does.
+    cache_path = get_cache_path(repo_url)
+    if offline or is_cache_fresh(cache_path):
+        return get_repo_commit(cache_path) if os.path.isdir(cache_path) else None
+    head, _ = get_remote_head(repo_url)
+    return head
+
+
+def _is_current(action: SyncAction, metadata: SkillSourceMetadata | None, head: str | None = None) -> bool:
+    if metadata is None or metadata.source_type != action.source_type:
+        return False
+
+    if action.source_type == SkillSourceType.LOCAL:
+        if os.path.normpath(metadata.local_path or '') != os.path.normpath(action.skill_dir):
+            return False
+        if metadata.tree_hash and metadata.source_manifest == snapshot_tree(action.skill_dir):
+            return True
+        installed_hash = metadata.tree_hash or compute_tree_hash(action.target_path)
+        return compute_tree_hash(action.skill_dir) == installed_hash
+
+    if metadata.repo_url != action.repo_url:
+        return False
+    if action.subpath:
+        installed_subpath = metadata.subpath or ''
+        if installed_subpath != action.subpath and not installed_subpath.startswith(action.subpath.rstrip('/') + '/'):
+            return False
+    # When the head cannot be resolved the installed copy is left alone.
+    return head is None or metadata.commit == head
+
+
+def plan_sync(entries: list[ManifestEntry], offline: bool = False) -> tuple[list[SyncAction], int, list[str]]:
+    declared: dict[str, SyncAction] = {}
+    errors = []
+    scopes = {get_skills_dir(False)}
+
+    for entry in entries:
+        target_dir = get_skills_dir(entry.global_install)
+        scopes.add(target_dir)
+
+        try:
+            source_type, location, subpath = _resolve_source(entry.source)
+        except ValueError as e:
+            errors.append(str(e))
+            continue
+
+        skill_dirs = None
+        if source_type == SkillSourceType.LOCAL:
+            if not os.path.isdir(location):
+                errors.append(f"{entry.source}: path does not exist")
+                continue
+            skill_dirs = _list_source_skills(location, '')
+        elif entry.names is None:
+            # Listing every skill in a repo needs a checkout; an existing cache
+            # entry is read as-is so a converged project never hits the network.
+            cache_path = get_cache_path(location)
+            repo_dir = cache_path if os.path.isdir(cache_path) else get_cached_repo(location, offline=offline)
+            root = os.path.join(repo_dir, subpath) if subpath else repo_dir
+            with cache_lock(repo_dir, shared=True):
+                skill_dirs = _list_source_skills(root, subpath) if os.path.isdir(root) else {}
+
+        names = entry.names if entry.names is not None else sorted(skill_dirs)
+        if not names:
+            errors.append(f"{entry.source}: no skills found")
+
+        for name in names:
+            if source_type == SkillSourceType.LOCAL and name not in skill_dirs:
+                errors.append(f"{entry.source}: skill '{name}' not found")
+                continue
+            target_path = os.path.join(target_dir, name)
+            declared[target_path] = SyncAction(
+                action='install',
+                name=name,
+                target_path=target_path,
+                source=entry.source,
+                source_type=source_type,
+                repo_url=location if source_type == SkillSourceType.GIT else None,
+                subpath=subpath,
+                skill_dir=skill_dirs[name] if source_type == SkillSourceType.LOCAL else None,
+            )
+
+    # Only repositories with an installed skill to compare need their head.
+    repo_urls = sorted({
+        action.repo_url for target_path, action in declared.items()
+        if action.source_type == SkillSourceType.GIT and os.path.isdir(target_path)
+    })
+    with ThreadPoolExecutor(max_workers=max(1, min(INSTALL_WORKERS, len(repo_urls)))) as pool:
+        heads = dict(zip(repo_urls, pool.map(lambda url: _repo_head(url, offline), repo_urls)))
+
+    actions = []
+    in_sync = 0
+
+    for target_dir in sorted(scopes):
+        installed = _list_installed(target_dir)
+
+        for name in sorted(installed):
+            target_path = os.path.join(target_dir, name)
+            if target_path not in declared and installed[name] is not None:
+                actions.append(SyncAction(action='remove', name=name, target_path=target_path))
+
+        for target_path, action in sorted(declared.items()):
+            if os.path.dirname(target_path) != target_dir:
+                continue
+            if action.name not in installed:
+                actions.append(action)
+            elif _is_current(action, installed[action.name], heads.get(action.repo_url)):
+                in_sync += 1
+            else:
+                action.action = 'update'
+                actions.append(action)
+
+    return actions, in_sync, errors
+
+
+def _remove(target_path: str) -> None:
+    with target_lock(target_path):
+        shutil.rmtree(target_path, ignore_errors=True)
+    forget_indexed_skill(target_path)
+    if is_project_target(target_path):
+        remove_locked_skill(os.path.basename(target_path))
+
+
+def _prepare_git_jobs(actions: list[SyncAction], offline: bool, stack: ExitStack, results: dict) -> list[tuple]:
+    by_repo: dict[str, list[SyncAction]] = defaultdict(list)
+    for action in actions:
+        by_repo[action.repo_url].append(action)
+
+    jobs = []
+    for repo_url, repo_actions in by_repo.items():
+        repo_dir = get_cached_repo(repo_url, offline=offline)
+        stack.enter_context(cache_lock(repo_dir, shared=True))
+        commit = get_repo_commit(repo_dir)
+
+        listings = {}
+        for action in repo_actions:
+            if action.subpath not in listings:
+                root = os.path.join(repo_dir, action.subpath) if action.subpath else repo_dir
+                listings[action.subpath] = _list_source_skills(root, action.subpath) if os.path.isdir(root) else {}
+
+            skill_dir = listings[action.subpath].get(action.name)
+            if not skill_dir:
+                results[action.target_path] = f"skill not found in {action.source}"
+                continue
+
+            subpath = os.path.relpath(skill_dir, repo_dir).replace('\\', '/')
+            metadata = SkillSourceMetadata(
+                source=action.source,
+                source_type=SkillSourceType.GIT,
+                repo_url=repo_url,
+                subpath='' if subpath == '.' else subpath,
+            )
+            jobs.append((action, (copy_skill, skill_dir, action.target_path, metadata, commit)))
+
+    return jobs
+
+
+def _run_job(job: tuple) -> None:
+    func, *args = job
+    func(*args)
+
+
+def apply_sync(actions: list[SyncAction], offline: bool = False) -> dict[str, str | None]:
+    results: dict[str, str | None] = {}
+
+    with ExitStack() as stack:
+        git_actions = [a for a in actions if a.action != 'remove' and a.source_type == SkillSourceType.GIT]
+        jobs = _prepare_git_jobs(git_actions, offline, stack, results)
+
+        for action in actions:
+            if action.action == 'remove':
+                jobs.append((action, (_remove, action.target_path)))
+            elif action.source_type == SkillSourceType.LOCAL:
+                metadata = SkillSourceMetadata(
+                    source=action.source,
+                    source_type=SkillSourceType.LOCAL,
+                    local_path=action.skill_dir,
+                )
+                jobs.append((action, (copy_skill, action.skill_dir, action.target_path, metadata)))
+
+        for action, _ in jobs:
+            os.makedirs(os.path.dirname(action.target_path), exist_ok=True)
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(INSTALL_WORKERS, len(jobs))) as pool:
+                futures = [(action, pool.submit(_run_job, job)) for action, job in jobs]
+                for action, future in futures:
+                    try:
+                        future.result()
+                        results[action.target_path] = None
+                    except OSError as e:
+                        results[action.target_path] = str(e)
+
+    return results
+
+
+def _scope_label(target_path: str) -> str:
+    return 'project' if is_project_target(target_path) else 'global'
+
+
+def sync_skills(manifest_path: str, yes: bool = False, dry_run: bool = False, offline: bool = False) -> None:
+    if not os.path.exists(manifest_path):
+        click.echo(click.style(f"Error: Manifest not found: {manifest_path}", fg='red'))
+        sys.exit(1)
+
+    try:
+        entries = load_manifest(manifest_path)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        click.echo(click.style(f"Error: Invalid manifest {manifest_path}: {e}", fg='red'))
+        sys.exit(1)
+
+    actions, in_sync, errors = plan_sync(entries, offline)
+
+    for error in errors:
+        click.echo(click.style(f"Error: {error}", fg='red'))
+
+    if not actions:
+        if errors:
+            sys.exit(1)
+        click.echo(click.style(f"✅ Already in sync: {in_sync} skill(s)", fg='green'))
+        return
+
+    symbols = {'install': click.style('+', fg='green'), 'update': click.style('~', fg='yellow'), 'remove': click.style('-', fg='red')}
+    click.echo(click.style("Sync plan:", bold=True))
+    for action in actions:
+        click.echo(f"  {symbols[action.action]} {action.name.ljust(25)} {action.action} ({_scope_label(action.target_path)})")
+    click.echo('')
+
+    if dry_run:
+        return
+
+    removals = [a for a in actions if a.action == 'remove']
+    if removals and not yes:
+        if not click.confirm(click.style(f"Remove {len(removals)} undeclared skill(s)?", fg='yellow'), default=False):
+            click.echo(click.style("Sync cancelled.", fg='yellow'))
+            return
+
+    results = apply_sync(actions, offline)
+
+    failed = 0
+    counts = defaultdict(int)
+    for action in actions:
+        error = results.get(action.target_path)
+        if error:
+            failed += 1
+            click.echo(click.style(f"Failed: {action.name} ({error})", fg='red'))
+        else:
+            counts[action.action] += 1
+
+    click.echo(click.style(
+        f"\nSummary: {counts['install']} installed, {counts['update']} updated, "
+        f"{counts['remove']} removed, {in_sync} unchanged, {failed + len(errors)} failed",
+        dim=True
+    ))
+
+    if failed or errors:
+        sys.exit(1)
@@ -1,13 +1,29 @@
+import errno
 import os
 import shutil
 import subprocess
 import sys
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 import click
-from openskills.models import Skill, SkillSourceType, SkillSourceMetadata
+from openskills.models import Skill, SkillSourceType, SkillSourceMetadata, LockedSkill, UpdateStatus
+from openskills.cache import get_cache_path, get_remote_head, get_repo_commit, refresh_cached_repo
+from openskills.hashing import build_file_manifest, combine_file_hashes, compute_tree_hash, hash_tree, snapshot_tree
+from openskills.lockfile import is_project_target, read_lockfile, record_locked_skill
 from openskills.finder import find_all_skills, normalize_skill_names
-from openskills.metadata import read_skill_metadata, write_skill_metadata
-from openskills.yaml_utils import has_valid_frontmatter
+from openskills.locks import cache_lock, target_lock
+from openskills.staging import commit_staged, delta_bytes, discard_staged, stage_delta_tree
+from openskills.metadata import read_skill_metadata, write_skill_metadata, write_skill_metadata_if_changed
+from openskills.skilldb import read_indexed_metadata
+
+UPDATE_WORKERS = 4
+CHECK_WORKERS = 8
+DISK_SPACE_MARGIN = 16 * 1024 * 1024
+
+# Trees staged by the current batch update; committed together at the end.
+_batch = {'active': False, 'staged': {}, 'reserved': {}, 'error': None}
+_batch_lock = threading.Lock()
 
 
 def _is_path_inside(target_path: str, target_dir: str) -> bool:
@@ -17,7 +33,12 @@ def _is_path_inside(target_path: str, target_dir: str) -> bool:
     return resolved_target.startswith(resolved_dir_sep)
 
 
-def _update_skill_from_dir(target_path: str, source_dir: str) -> None:
+def _update_skill_from_dir(
+    target_path: str,
+    source_dir: str,
+    metadata: SkillSourceMetadata | None = None,
+    verify: bool = False
+) -> bool:
     target_dir = os.path.dirname(target_path)
     os.makedirs(target_dir, exist_ok=True)
 
@@ -25,58 +46,209 @@ def _update_skill_from_dir(target_path: str, source_dir: str) -> None:
         click.echo(click.style("Security error: Installation path outside target directory", fg='red'))
         sys.exit(1)
 
-    local_meta_path = os.path.join(target_path, '.openskills.json')
-    local_meta_backup = None
-    if os.path.exists(local_meta_path):
-        with open(local_meta_path, 'r', encoding='utf-8') as f:
-            local_meta_backup = f.read()
+    if metadata is not None:
+        file_hashes = hash_tree(source_dir)
+        source_hash = combine_file_hashes(file_hashes)
+        installed_hash = metadata.tree_hash
+        # The recorded fingerprint is trusted unless verification asks to
+        # re-hash what is actually on disk.
+        if verify and os.path.isdir(target_path):
+            installed_hash = compute_tree_hash(target_path)
+        metadata.tree_hash = source_hash
+        if installed_hash == source_hash and os.path.isdir(target_path):
+            write_skill_metadata_if_changed(target_path, metadata)
+            return False
+        metadata.file_manifest = build_file_manifest(source_dir, file_hashes)
+
+    reservation = _reserve_space(target_dir, delta_bytes(source_dir, target_path))
+    try:
+        # A local .openskills.json survives the update unless the source ships its own.
+        staged = stage_delta_tree(source_dir, target_path, metadata, preserve_metadata=True)
+    finally:
+        _release_space(reservation)
+
+    with _batch_lock:
+        if _batch['active']:
+            _batch['staged'][target_path] = (staged, metadata)
+            return True
+
+    commit_staged([(staged, target_path)])
+    return True
+
+
+def _reserve_space(target_dir: str, needed: int) -> tuple[int, int]:
+    # Parallel stagers share the free space, so each one claims its bytes
+    # against the device before copying.
+    device = os.stat(target_dir).st_dev
+    with _batch_lock:
+        reserved = _batch['reserved'].get(device, 0)
+        if reserved + needed + DISK_SPACE_MARGIN > shutil.disk_usage(target_dir).free:
+            raise OSError(errno.ENOSPC, f"not enough disk space to stage update ({needed} bytes needed)")
+        _batch['reserved'][device] = reserved + needed
+    return device, needed
 
-    shutil.rmtree(target_path, ignore_errors=True)
-    shutil.copytree(source_dir, target_path, dirs_exist_ok=True)
 
-    source_meta_path = os.path.join(source_dir, '.openskills.json')
-    if not os.path.exists(source_meta_path) and local_meta_backup is not None:
-        with open(local_meta_path, 'w', encoding='utf-8') as f:
-            f.write(local_meta_backup)
+def _release_space(reservation: tuple[int, int]) -> None:
+    # Once staged, the bytes show up in disk_usage() and need no reservation.
+    device, needed = reservation
+    with _batch_lock:
+        _batch['reserved'][device] = max(_batch['reserved'].get(device, 0) - needed, 0)
 
 
-def _update_skill_from_local(target_path: str, metadata: SkillSourceMetadata, skill_name: str) -> tuple[bool, str]:
+def _update_skill_from_local(
+    target_path: str,
+    metadata: SkillSourceMetadata,
+    skill_name: str,
+    verify: bool = False
+) -> tuple[UpdateStatus, str]:
     local_path = metadata.local_path
     if not local_path or not os.path.exists(local_path):
-        return False, 'Local source missing'
+        return UpdateStatus.FAILED, 'Local source missing'
 
     skill_md_path = os.path.join(local_path, 'SKILL.md')
     if not os.path.exists(skill_md_path):
-        return False, 'SKILL.md missing at local source'
+        return UpdateStatus.FAILED, 'SKILL.md missing at local source'
 
-    _update_skill_from_dir(target_path, local_path)
-    write_skill_metadata(target_path, metadata)
-    return True, ''
+    # Local sources are often edited in place; an unchanged stat snapshot
+    # answers "up to date" without reading a single file.
+    snapshot = snapshot_tree(local_path)
+    if not verify and metadata.tree_hash and metadata.source_manifest == snapshot and os.path.isdir(target_path):
+        return UpdateStatus.UP_TO_DATE, ''
+    metadata.source_manifest = snapshot
 
+    with target_lock(target_path):
+        changed = _update_skill_from_dir(target_path, local_path, metadata, verify)
+    return (UpdateStatus.UPDATED if changed else UpdateStatus.UP_TO_DATE), ''
 
-def _update_skill_from_git(target_path: str, metadata: SkillSourceMetadata, skill_name: str) -> tuple[bool, str]:
-    with tempfile.TemporaryDirectory() as temp_dir:
+
+def _fetch_repo(repo_url: str) -> tuple[str | None, str]:
+    cache_path = get_cache_path(repo_url)
+
+    with cache_lock(cache_path):
         try:
-            subprocess.run(
-                ['git', 'clone', '--depth', '1', '--quiet', metadata.repo_url, os.path.join(temp_dir, 'repo')],
-                check=True,
-                capture_output=True
-            )
-
-            repo_dir = os.path.join(temp_dir, 'repo')
-            subpath = metadata.subpath if metadata.subpath and metadata.subpath != '.' else ''
-            source_dir = os.path.join(repo_dir, subpath) if subpath else repo_dir
-
-            skill_md_path = os.path.join(source_dir, 'SKILL.md')
-            if not os.path.exists(skill_md_path):
-                return False, f"SKILL.md not found in repo at {subpath or '.'}"
-
-            _update_skill_from_dir(target_path, source_dir)
-            write_skill_metadata(target_path, metadata)
-            return True, ''
+            refresh_cached_repo(repo_url, cache_path)
         except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.decode().strip() if e.stderr else 'Unknown error'
-            return False, f"git clone failed: {error_msg}"
+            return None, e.stderr.decode().strip() if e.stderr else 'Unknown error'
+
+    return cache_path, ''
+
+
+def _get_repo(repo_url: str, fetched: dict[str, tuple[str | None, str]]) -> tuple[str | None, str]:
+    if repo_url not in fetched:
+        fetched[repo_url] = _fetch_repo(repo_url)
+    return fetched[repo_url]
+
+
+def _update_skill_from_git(
+    target_path: str,
+    metadata: SkillSourceMetadata,
+    skill_name: str,
+    fetched: dict[str, tuple[str | None, str]],
+    verify: bool = False
+) -> tuple[UpdateStatus, str]:
+    repo_dir, error = _get_repo(metadata.repo_url, fetched)
+    if not repo_dir:
+        return UpdateStatus.FAILED, f"git clone failed: {error}"
+
+    subpath = metadata.subpath if metadata.subpath and metadata.subpath != '.' else ''
+    source_dir = os.path.join(repo_dir, subpath) if subpath else repo_dir
+
+    with cache_lock(repo_dir, shared=True):
+        skill_md_path = os.path.join(source_dir, 'SKILL.md')
+        if not os.path.exists(skill_md_path):
+            return UpdateStatus.FAILED, f"SKILL.md not found in repo at {subpath or '.'}"
+
+        metadata.commit = get_repo_commit(repo_dir)
+        with target_lock(target_path):
+            changed = _update_skill_from_dir(target_path, source_dir, metadata, verify)
+
+    if not (changed and _batch['active']):
+        _relock_skill(target_path, metadata)
+    return (UpdateStatus.UPDATED if changed else UpdateStatus.UP_TO_DATE), ''
+
+
+def _relock_skill(target_path: str, metadata: SkillSourceMetadata) -> None:
+    if metadata.source_type == 'local' or not metadata.commit or not is_project_target(target_path):
+        return
+    name = os.path.basename(target_path)
+    # Only skills already pinned in the lockfile follow the update.
+    if not any(entry.name == name for entry in read_lockfile()):
+        return
+    record_locked_skill(LockedSkill(
+        name=name,
+        repo_url=metadata.repo_url,
+        commit=metadata.commit,
+        subpath=metadata.subpath or '',
+        tree_hash=metadata.tree_hash or compute_tree_hash(target_path),
+    ))
+
+
+def _update_group(
+    group: list[tuple[Skill, SkillSourceMetadata]],
+    fetched: dict[str, tuple[str | None, str]],
+    verify: bool = False
+) -> list[tuple[UpdateStatus, str]]:
+    results = []
+    for skill, metadata in group:
+        try:
+            if metadata.source_type == 'local':
+                results.append(_update_skill_from_local(skill.path, metadata, skill.name, verify=verify))
+            else:
+                results.append(_update_skill_from_git(skill.path, metadata, skill.name, fetched, verify=verify))
+        except OSError as e:
+            # A staging failure (disk full, permissions) aborts the whole batch.
+            with _batch_lock:
+                _batch['error'] = _batch['error'] or str(e)
+            results.append((UpdateStatus.FAILED, f"staging failed: {e}"))
+    return results
+
+
+def _commit_batch(results: dict[str, tuple[UpdateStatus, str]]) -> None:
+    staged = _batch['staged']
+    pairs = [(staged_path, target_path) for target_path, (staged_path, _) in sorted(staged.items())]
+
+    if _batch['error']:
+        discard_staged(pairs)
+        for target_path in staged:
+            results[target_path] = (UpdateStatus.FAILED, f"rolled back: {_batch['error']}")
+        return
+
+    try:
+        with ExitStack() as stack:
+            for _, target_path in pairs:
+                stack.enter_context(target_lock(target_path))
+            commit_staged(pairs)
+    except OSError as e:
+        for target_path in staged:
+            results[target_path] = (UpdateStatus.FAILED, f"rolled back: {e}")
+        return
+
+    for target_path, (_, metadata) in staged.items():
+        _relock_skill(target_path, metadata)
+
+
+def _run_update_groups(
+    groups: list[list[tuple[Skill, SkillSourceMetadata]]],
+    verify: bool = False
+) -> dict[str, tuple[UpdateStatus, str]]:
+    results = {}
+    # Repositories refreshed during this run, keyed by repo URL.
+    fetched: dict[str, tuple[str | None, str]] = {}
+    _batch.update(active=True, staged={}, reserved={}, error=None)
+    try:
+        # Stage every changed skill in parallel, then swap them all in at once.
+        with ThreadPoolExecutor(max_workers=max(1, min(UPDATE_WORKERS, len(groups)))) as pool:
+            group_results_iter = pool.map(lambda group: _update_group(group, fetched, verify), groups)
+            for group, group_results in zip(groups, group_results_iter):
+                for (skill, _), result in zip(group, group_results):
+                    results[skill.path] = result
+        _commit_batch(results)
+    except BaseException:
+        discard_staged([(staged_path, target) for target, (staged_path, _) in _batch['staged'].items()])
+        raise
+    finally:
+        _batch.update(active=False, staged={}, reserved={}, error=None)
+    return results
 
 
 def _is_local_path(source: str) -> bool:
@@ -190,7 +362,53 @@ def _display_error_summaries(error_categories: dict) -> None:
         click.echo(click.style(f"Clone failed ({len(error_categories['clone_failures'])}): {', '.join(error_categories['clone_failures'])}", fg='yellow'))
 
 
-def update_skills(skill_names: str | list[str] | None) -> None:
+def _read_metadata(skills: list[Skill]) -> list[tuple[Skill, SkillSourceMetadata | None]]:
+    indexed = read_indexed_metadata([skill.path for skill in skills])
+    return [
+        (skill, indexed[skill.path] if skill.path in indexed else read_skill_metadata(skill.path))
+        for skill in skills
+    ]
+
+
+def _plan_updates(
+    targets: list[Skill]
+) -> tuple[list[tuple[Skill, SkillSourceMetadata | None]], dict[str, list[tuple[Skill, SkillSourceMetadata]]]]:
+    planned: list[tuple[Skill, SkillSourceMetadata | None]] = []
+    groups: dict[str, list[tuple[Skill, SkillSourceMetadata]]] = {}
+
+    for skill, metadata in _read_metadata(targets):
+        planned.append((skill, metadata))
+
+        if not metadata:
+            continue
+        if metadata.source_type == 'local':
+            # Local sources need no fetch; each skill is its own unit of work.
+            groups[f"local:{skill.path}"] = [(skill, metadata)]
+        elif metadata.repo_url:
+            groups.setdefault(metadata.repo_url, []).append((skill, metadata))
+
+    return planned, groups
+
+
+def run_quiet_update() -> dict:
+    planned, groups = _plan_updates(find_all_skills())
+    results = _run_update_groups(list(groups.values())) if groups else {}
+
+    summary = {'updated': [], 'up_to_date': 0, 'failed': []}
+    for skill, _ in planned:
+        if skill.path not in results:
+            continue
+        status, _ = results[skill.path]
+        if status == UpdateStatus.FAILED:
+            summary['failed'].append(skill.name)
+        elif status == UpdateStatus.UP_TO_DATE:
+            summary['up_to_date'] += 1
+        else:
+            summary['updated'].append(skill.name)
+    return summary
+
+
+def update_skills(skill_names: str | list[str] | None, verify: bool = False) -> None:
     requested = normalize_skill_names(skill_names) if skill_names else []
     skills = find_all_skills()
 
@@ -215,6 +433,7 @@ def update_skills(skill_names: str | list[str] | None) -> None:
         return
 
     updated = 0
+    up_to_date = 0
     skipped = 0
 
     error_categories = {
@@ -227,10 +446,15 @@ def update_skills(skill_names: str | list[str] | None) -> None:
     }
 
     skills_without_metadata: list[Skill] = []
+    planned, groups = _plan_updates(targets)
 
-    for skill in targets:
-        metadata = read_skill_metadata(skill.path)
+    git_repos = sum(1 for key in groups if not key.startswith('local:'))
+    if git_repos:
+        click.echo(click.style(f"Fetching {git_repos} repositor{'y' if git_repos == 1 else 'ies'}...", dim=True))
 
+    results = _run_update_groups(list(groups.values()), verify) if groups else {}
+
+    for skill, metadata in planned:
         if not metadata:
             click.echo(click.style(f"Skipped: {skill.name} (no source metadata)", fg='yellow'))
             error_categories['missing_metadata'].append(skill.name)
@@ -239,8 +463,11 @@ def update_skills(skill_names: str | list[str] | None) -> None:
             continue
 
         if metadata.source_type == 'local':
-            success, error = _update_skill_from_local(skill.path, metadata, skill.name)
-            if success:
+            status, error = results[skill.path]
+            if status == UpdateStatus.UP_TO_DATE:
+                click.echo(click.style(f"Up to date: {skill.name}", dim=True))
+                up_to_date += 1
+            elif status == UpdateStatus.UPDATED:
                 click.echo(click.style(f"✅ Updated: {skill.name}", fg='green'))
                 updated += 1
             else:
@@ -258,8 +485,11 @@ def update_skills(skill_names: str | list[str] | None) -> None:
             skipped += 1
             continue
 
-        success, error = _update_skill_from_git(skill.path, metadata, skill.name)
-        if success:
+        status, error = results[skill.path]
+        if status == UpdateStatus.UP_TO_DATE:
+            click.echo(click.style(f"Up to date: {skill.name}", dim=True))
+            up_to_date += 1
+        elif status == UpdateStatus.UPDATED:
             click.echo(click.style(f"✅ Updated: {skill.name}", fg='green'))
             updated += 1
         else:
@@ -271,7 +501,7 @@ def update_skills(skill_names: str | list[str] | None) -> None:
                 error_categories['clone_failures'].append(skill.name)
             skipped += 1
 
-    click.echo(click.style(f"\nSummary: {updated} updated, {skipped} skipped ({len(targets)} total)", dim=True))
+    click.echo(click.style(f"\nSummary: {updated} updated, {up_to_date} up to date, {skipped} skipped ({len(targets)} total)", dim=True))
 
     _display_error_summaries(error_categories)
 
@@ -279,3 +509,64 @@ def update_skills(skill_names: str | list[str] | None) -> None:
         click.echo(click.style(f"\n{len(skills_without_metadata)} skill(s) have no source metadata. Add sources to enable future updates:", bold=True))
         for skill in skills_without_metadata:
             _prompt_add_source(skill)
+
+
+def _check_local(skill: Skill, metadata: SkillSourceMetadata) -> tuple[str, str]:
+    if not metadata.local_path or not os.path.isdir(metadata.local_path):
+        return 'error', 'Local source missing'
+    if compute_tree_hash(metadata.local_path) == compute_tree_hash(skill.path):
+        return 'current', ''
+    return 'behind', 'local source changed'
+
+
+def check_updates(skill_names: str | list[str] | None) -> None:
+    requested = normalize_skill_names(skill_names) if skill_names else []
+    skills = find_all_skills()
+    if requested:
+        skills = [s for s in skills if s.name in set(requested)]
+
+    if not skills:
+        click.echo(click.style("No matching skills to check.", fg='yellow'))
+        return
+
+    planned = _read_metadata(skills)
+    repo_urls = sorted({m.repo_url for _, m in planned if m and m.source_type != 'local' and m.repo_url})
+    local = [(s, m) for s, m in planned if m and m.source_type == 'local']
+
+    with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as pool:
+        remote_futures = {url: pool.submit(get_remote_head, url) for url in repo_urls}
+        local_futures = {s.path: pool.submit(_check_local, s, m) for s, m in local}
+        remote_heads = {url: future.result() for url, future in remote_futures.items()}
+        local_results = {path: future.result() for path, future in local_futures.items()}
+
+    behind = 0
+    unknown = 0
+    for skill, metadata in planned:
+        if not metadata:
+            status, detail = 'unknown', 'no source metadata'
+        elif metadata.source_type == 'local':
+            status, detail = local_results[skill.path]
+        elif not metadata.repo_url:
+            status, detail = 'unknown', 'missing repo URL metadata'
+        else:
+            head, error = remote_heads[metadata.repo_url]
+            if not head:
+                status, detail = 'error', error
+            elif not metadata.commit:
+                status, detail = 'unknown', 'installed commit not recorded'
+            elif head == metadata.commit:
+                status, detail = 'current', ''
+            else:
+                status, detail = 'behind', f"{metadata.commit[:7]} -> {head[:7]}"
+
+        if status == 'behind':
+            behind += 1
+            click.echo(f"{click.style('⬆', fg='cyan')} {skill.name.ljust(25)} {click.style(detail, dim=True)}")
+        elif status != 'current':
+            unknown += 1
+            click.echo(f"{click.style('?', fg='yellow')} {skill.name.ljust(25)} {click.style(detail, dim=True)}")
+
+    if behind:
+        click.echo(click.style(f"\n{behind} of {len(planned)} skill(s) can be updated. Run: openskills update", bold=True))
+    else:
+        click.echo(click.style(f"All {len(planned) - unknown} checked skill(s) are up to date.", fg='green'))
@@ -0,0 +1,87 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from openskills.finder import find_all_skills, normalize_skill_names
+from openskills.hashing import verify_file_manifest
+from openskills.metadata import read_skill_metadata
+from openskills.models import Skill, SkillSourceMetadata
+from openskills.skilldb import read_indexed_metadata
+
+VERIFY_WORKERS = 4
+
+
+def _verify_skill(skill: Skill, metadata: SkillSourceMetadata | None, deep: bool) -> dict[str, list[str]] | None:
+    if not metadata or not metadata.file_manifest:
+        return None
+    return verify_file_manifest(skill.path, metadata.file_manifest, deep=deep)
+
+
+def verify_skills(skill_names: str | list[str] | None, deep: bool = False) -> None:
+    requested = normalize_skill_names(skill_names) if skill_names else []
+    skills = find_all_skills()
+    if requested:
+        requested_set = set(requested)
+        missing = [name for name in requested if not any(s.name == name for s in skills)]
+        if missing:
+            click.echo(click.style(f"Skipping missing skills: {', '.join(missing)}", fg='yellow'))
+        skills = [s for s in skills if s.name in requested_set]
+
+    if not skills:
+        click.echo(click.style("No matching skills to verify.", fg='yellow'))
+        return
+
+    indexed = read_indexed_metadata([skill.path for skill in skills])
+    planned = [
+        (skill, indexed[skill.path] if skill.path in indexed else read_skill_metadata(skill.path))
+        for skill in skills
+    ]
+
+    # Skills are verified side by side, and each one hashes its candidate
+    # files in parallel as well.
+    with ThreadPoolExecutor(max_workers=min(VERIFY_WORKERS, len(planned))) as pool:
+        futures = [(skill, pool.submit(_verify_skill, skill, metadata, deep)) for skill, metadata in planned]
+        results = []
+        for skill, future in futures:
+            try:
+                results.append((skill, future.result(), None))
+            except OSError as e:
+                results.append((skill, None, str(e)))
+
+    ok = 0
+    changed = 0
+    unverified = 0
+    markers = (
+        ('modified', click.style('M', fg='yellow')),
+        ('missing', click.style('D', fg='red')),
+        ('extra', click.style('+', fg='cyan')),
+    )
+
+    for skill, report, error in sorted(results, key=lambda r: r[0].name):
+        if error:
+            changed += 1
+            click.echo(f"{click.style('✗', fg='red')} {skill.name.ljust(25)} {click.style(error, dim=True)}")
+        elif report is None:
+            unverified += 1
+            click.echo(f"{click.style('?', fg='yellow')} {skill.name.ljust(25)} "
+                       f"{click.style('no file manifest recorded (reinstall or update to record one)', dim=True)}")
+        elif any(report.values()):
+            changed += 1
+            counts = ', '.join(f"{len(report[kind])} {kind}" for kind, _ in markers if report[kind])
+            click.echo(f"{click.style('✗', fg='red')} {skill.name.ljust(25)} {click.style(counts, dim=True)}")
+            for kind, marker in markers:
+                for rel_path in report[kind]:
+                    click.echo(f"    {marker} {rel_path}")
+        else:
+            ok += 1
+            click.echo(f"{click.style('✓', fg='green')} {skill.name}")
+
+    click.echo(click.style(
+        f"\nSummary: {ok} intact, {changed} changed, {unverified} without manifest"
+        + ("" if deep else " (unchanged size and mtime trusted; use --deep to re-hash everything)"),
+        dim=True
+    ))
+
+    if changed:
+        sys.exit(1)
@@ -1,10 +1,167 @@
+import os
 import re
 
 
-def extract_yaml_field(content: str, field: str) -> str:
-    match = re.search(f'^{field}:\\s*(.+?)$', content, re.MULTILINE)
-    return match.group(1).strip() if match else ''
+FRONTMATTER_MAX_BYTES = 64 * 1024
 
 
-def has_valid_frontmatter(content: str) -> bool:
-    return content.strip().startswith('---')
+def read_frontmatter(path: str, max_bytes: int = FRONTMATTER_MAX_BYTES) -> str:
+    # Reads up to the closing '---' (or max_bytes) instead of the whole file.
+    lines = []
+    consumed = 0
+    fences = 0
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            lines.append(line)
+            consumed += len(line)
+            if line.strip() == '---':
+                fences += 1
+                if fences == 2:
+                    break
+            elif fences == 0 and line.strip():
+                break
+            if consumed >= max_bytes:
+                break
+
+    return ''.join(lines)
+
+
+_KEY_LINE = re.compile(r'^([^\s#:][^:]*?)\s*:(?:\s+(.*))?$')
+_BLOCK_HEADER = re.compile(r'^([|>])([+-]?)\d?\s*(?:#.*)?$')
+_DOUBLE_QUOTE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '"': '"', '\\': '\\', '/': '/', ' ': ' '}
+
+# Parsed frontmatter per path, keyed by the file's (dev, inode, mtime_ns, size).
+_frontmatter_cache: dict[str, tuple[tuple, dict[str, str] | None]] = {}
+
+
+def _fold(lines: list[str]) -> str:
+    while lines and not lines[-1]:
+        lines = lines[:-1]
+    parts = []
+    for line in lines:
+        if not line:
+            parts.append('\n')
+        elif parts and parts[-1] != '\n':
+            parts.append(' ' + line)
+        else:
+            parts.append(line)
+    return ''.join(parts)
+
+
+def _unescape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape[0] in 'xuU':
+        return chr(int(escape[1:], 16))
+    return _DOUBLE_QUOTE_ESCAPES.get(escape, escape)
+
+
+def _unquote(text: str) -> str:
+    quote = text[0]
+    i = 1
+    while i < len(text):
+        if quote == '"' and text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote:
+            if quote == "'" and text[i + 1:i + 2] == "'":
+                i += 2
+                continue
+            break
+        i += 1
+
+    inner = text[1:i]
+    if quote == "'":
+        return inner.replace("''", "'")
+    return re.sub(r'\\(x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|.)', _unescape, inner)
+
+
+def _block_scalar(style: str, chomp: str, block: list[str]) -> str:
+    content = [line for line in block if line.strip()]
+    if not content:
+        return ''
+    indent = len(content[0]) - len(content[0].lstrip(' '))
+    lines = [line[indent:] if line.strip() else '' for line in block]
+
+    trailing = 0
+    while lines and not lines[-1]:
+        lines.pop()
+        trailing += 1
+
+    if style == '|':
+        text = '\n'.join(lines)
+    elif any(line[:1].isspace() for line in lines):
+        # More-indented lines keep their line breaks; not worth folding around.
+        text = '\n'.join(lines)
+    else:
+        text = _fold(lines)
+
+    if chomp == '-':
+        return text
+    if chomp == '+':
+        return text + '\n' * (trailing + 1)
+    return text + '\n'
+
+
+def _parse_value(rest: str, block: list[str]) -> str:
+    header = _BLOCK_HEADER.match(rest)
+    if header:
+        return _block_scalar(header.group(1), header.group(2), block)
+
+    continuation = [line.strip() for line in block]
+    if rest[:1] in ('"', "'"):
+        return _unquote(_fold([rest] + continuation))
+
+    if not rest:
+        first = next((line for line in continuation if line and not line.startswith('#')), '')
+        # Nested mappings and sequences are not scalars.
+        if not first or first == '-' or first.startswith('- ') or _KEY_LINE.match(first):
+            return ''
+
+    rest = re.sub(r'\s+#.*$', '', rest)
+    continuation = [re.sub(r'\s+#.*$', '', line) for line in continuation if not line.startswith('#')]
+    return _fold([rest] + continuation if rest else continuation)
+
+
+def parse_frontmatter(content: str) -> dict[str, str] | None:
+    # One pass over the lines between the fences; returns None when the text
+    # has no frontmatter. Scalars are kept as strings, nested values are ''.
+    lines = content.splitlines()
+    start = 0
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    if start == len(lines) or lines[start].strip() != '---':
+        return None
+
+    body = []
+    for line in lines[start + 1:]:
+        if line.rstrip() in ('---', '...'):
+            break
+        body.append(line)
+
+    fields = {}
+    i = 0
+    while i < len(body):
+        match = _KEY_LINE.match(body[i])
+        j = i + 1
+        while j < len(body) and (not body[j].strip() or body[j][0] in ' \t'):
+            j += 1
+        if match:
+            key = match.group(1).strip('\'"')
+            fields[key] = _parse_value((match.group(2) or '').strip(), body[i + 1:j])
+        i = j
+
+    return fields
+
+
+def read_skill_frontmatter(path: str) -> dict[str, str] | None:
+    st = os.stat(path)
+    identity = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    cached = _frontmatter_cache.get(path)
+    if cached is None or cached[0] != identity:
+        cached = (identity, parse_frontmatter(read_frontmatter(path)))
+        _frontmatter_cache[path] = cached
+
+    fields = cached[1]
+    return dict(fields) if fields is not None else None
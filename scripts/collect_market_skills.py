@@ -17,7 +17,7 @@ from typing import Any, Dict, List
 # Add parent directory to path to import openskills modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from openskills.yaml_utils import has_valid_frontmatter, extract_yaml_field
+from openskills.yaml_utils import read_skill_frontmatter
 
 
 def load_sources_config(config_path: str = "market_sources.yaml") -> Dict[str, Any]:
@@ -71,22 +71,20 @@ def extract_skill_info(skill_dir: str, repo: str) -> Dict[str, Any] | None:
     if not os.path.exists(skill_md_path):
         return None
 
-    with open(skill_md_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    if not has_valid_frontmatter(content):
+    fields = read_skill_frontmatter(skill_md_path)
+    if fields is None:
         print(f"Warning: Invalid SKILL.md in {skill_dir} (missing YAML frontmatter)")
         return None
 
-    skill_name = extract_yaml_field(content, 'name')
+    skill_name = fields.get('name', '').strip()
     if not skill_name:
         skill_name = os.path.basename(skill_dir)
 
     skill_info = {
         'name': skill_name,
-        'description': extract_yaml_field(content, 'description') or '',
-        'version': extract_yaml_field(content, 'version') or '',
-        'author': extract_yaml_field(content, 'author') or '',
+        'description': fields.get('description', '').strip(),
+        'version': fields.get('version', '').strip(),
+        'author': fields.get('author', '').strip(),
     }
 
     return skill_info
@@ -0,0 +1,146 @@
+import json
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from openskills import autoupdate
+from openskills.autoupdate import (
+    is_auto_update_enabled,
+    is_stamp_fresh,
+    maybe_spawn_auto_update,
+    read_summary,
+    run_worker,
+    show_summary,
+    touch_stamp,
+    write_summary,
+)
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv(autoupdate.WORKER_ENV, raising=False)
+    return tmp_path
+
+
+class TestEnabled:
+    def test_disabled_by_default(self, home, monkeypatch):
+        monkeypatch.delenv(autoupdate.AUTO_UPDATE_ENV, raising=False)
+        assert is_auto_update_enabled() is False
+
+    def test_enabled_by_env(self, home, monkeypatch):
+        monkeypatch.setenv(autoupdate.AUTO_UPDATE_ENV, "1")
+        assert is_auto_update_enabled() is True
+
+    def test_never_enabled_inside_worker(self, home, monkeypatch):
+        monkeypatch.setenv(autoupdate.AUTO_UPDATE_ENV, "1")
+        monkeypatch.setenv(autoupdate.WORKER_ENV, "1")
+        assert is_auto_update_enabled() is False
+
+
+class TestMaybeSpawn:
+    def test_spawns_when_stamp_missing(self, home, monkeypatch):
+        monkeypatch.setenv(autoupdate.AUTO_UPDATE_ENV, "1")
+        mock_spawn = MagicMock()
+        monkeypatch.setattr("openskills.autoupdate.spawn_worker", mock_spawn)
+
+        assert maybe_spawn_auto_update() is True
+        mock_spawn.assert_called_once()
+        assert is_stamp_fresh()
+
+    def test_fresh_stamp_skips_spawn(self, home, monkeypatch):
+        monkeypatch.setenv(autoupdate.AUTO_UPDATE_ENV, "1")
+        touch_stamp()
+        mock_spawn = MagicMock()
+        monkeypatch.setattr("openskills.autoupdate.spawn_worker", mock_spawn)
+
+        assert maybe_spawn_auto_update() is False
+        mock_spawn.assert_not_called()
+
+    def test_stale_stamp_spawns(self, home, monkeypatch):
+        monkeypatch.setenv(autoupdate.AUTO_UPDATE_ENV, "1")
+        monkeypatch.setenv(autoupdate.AUTO_UPDATE_INTERVAL_ENV, "60")
+        touch_stamp()
+        old = time.time() - 120
+        os.utime(autoupdate.get_stamp_path(), (old, old))
+        mock_spawn = MagicMock()
+        monkeypatch.setattr("openskills.autoupdate.spawn_worker", mock_spawn)
+
+        assert maybe_spawn_auto_update() is True
+
+    def test_disabled_does_nothing(self, home, monkeypatch):
+        monkeypatch.delenv(autoupdate.AUTO_UPDATE_ENV, raising=False)
+        mock_spawn = MagicMock()
+        monkeypatch.setattr("openskills.autoupdate.spawn_worker", mock_spawn)
+
+        assert maybe_spawn_auto_update() is False
+        assert not os.path.exists(home / ".openskills" / "autoupdate.stamp")
+
+
+class TestWorker:
+    def test_writes_summary(self, home, monkeypatch):
+        monkeypatch.setattr(
+            "openskills.updater.run_quiet_update",
+            lambda: {"updated": ["a"], "up_to_date": 2, "failed": []}
+        )
+
+        run_worker()
+
+        summary = read_summary()
+        assert summary["updated"] == ["a"]
+        assert summary["shown"] is False
+        assert is_stamp_fresh()
+
+    def test_records_working_directory(self, home, monkeypatch):
+        monkeypatch.chdir(home)
+        monkeypatch.setattr("openskills.updater.run_quiet_update", lambda: {"updated": [], "up_to_date": 0, "failed": []})
+
+        run_worker()
+
+        assert read_summary()["cwd"] == str(home)
+
+    def test_exit_during_update_still_writes_summary(self, home, monkeypatch):
+        def exiting_update():
+            raise SystemExit(1)
+
+        monkeypatch.setattr("openskills.updater.run_quiet_update", exiting_update)
+
+        run_worker()
+
+        summary = read_summary()
+        assert summary["error"] == "update exited with status 1"
+        assert summary["shown"] is False
+        assert is_stamp_fresh()
+
+
+class TestShowSummary:
+    def test_shows_once(self, home, capsys):
+        write_summary({"updated": ["a", "b"], "up_to_date": 0, "failed": [], "shown": False, "cwd": os.getcwd()})
+
+        show_summary()
+        assert "2 updated (a, b)" in capsys.readouterr().out
+
+        show_summary()
+        assert capsys.readouterr().out == ""
+
+    def test_nothing_changed_is_silent(self, home, capsys):
+        write_summary({"updated": [], "up_to_date": 3, "failed": [], "shown": False, "cwd": os.getcwd()})
+        show_summary()
+        assert capsys.readouterr().out == ""
+        assert json.loads((home / ".openskills" / "autoupdate.json").read_text())["shown"] is True
+
+    def test_summary_from_another_directory_is_not_shown(self, home, tmp_path, capsys, monkeypatch):
+        write_summary({"updated": ["a"], "up_to_date": 0, "failed": [], "shown": False, "cwd": str(home)})
+        other = tmp_path / "other"
+        other.mkdir()
+        monkeypatch.chdir(other)
+
+        show_summary()
+        assert capsys.readouterr().out == ""
+        assert read_summary()["shown"] is False
+
+        monkeypatch.chdir(home)
+        show_summary()
+        assert "1 updated (a)" in capsys.readouterr().out
@@ -0,0 +1,309 @@
+import json
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+from openskills.cache import (
+    CACHE_MAX_BYTES_ENV,
+    CACHE_TTL_ENV,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_TTL,
+    clear_cache_entries,
+    gc_cache_entries,
+    get_cache_age,
+    get_cache_max_bytes,
+    get_cache_key,
+    get_cache_path,
+    get_cache_ttl,
+    is_cache_fresh,
+    list_cache_entries,
+    mark_cache_fetched,
+    parse_size,
+    read_cache_entry,
+    refresh_cached_repo,
+    remove_cache_entry,
+    touch_cache_entry,
+    write_cache_entry,
+)
+
+
+def _fake_home(monkeypatch, tmp_path):
+    from pathlib import Path
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setattr("pathlib.Path.home", lambda: Path(str(home)))
+    return home
+
+
+class TestGetCacheTtl:
+    def test_default_when_unset(self, monkeypatch):
+        monkeypatch.delenv(CACHE_TTL_ENV, raising=False)
+        assert get_cache_ttl() == DEFAULT_CACHE_TTL
+
+    def test_reads_env(self, monkeypatch):
+        monkeypatch.setenv(CACHE_TTL_ENV, "42")
+        assert get_cache_ttl() == 42
+
+    def test_invalid_value_falls_back(self, monkeypatch):
+        monkeypatch.setenv(CACHE_TTL_ENV, "soon")
+        assert get_cache_ttl() == DEFAULT_CACHE_TTL
+
+    def test_negative_clamped_to_zero(self, monkeypatch):
+        monkeypatch.setenv(CACHE_TTL_ENV, "-5")
+        assert get_cache_ttl() == 0
+
+
+class TestCacheEntry:
+    def test_cache_path_uses_key(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        url = "https://github.com/owner/repo"
+        expected = os.path.join(str(home), ".openskills", "cache", get_cache_key(url))
+        assert get_cache_path(url) == expected
+
+    def test_read_missing_entry_returns_empty(self, tmp_path):
+        assert read_cache_entry(str(tmp_path / "abc")) == {}
+
+    def test_write_merges_fields(self, tmp_path):
+        cache_path = str(tmp_path / "abc")
+        write_cache_entry(cache_path, repo_url="u")
+        write_cache_entry(cache_path, fetched_at=1.0)
+        assert read_cache_entry(cache_path) == {"repo_url": "u", "fetched_at": 1.0}
+
+    def test_concurrent_writers_use_separate_temp_files(self, tmp_path, monkeypatch):
+        cache_path = str(tmp_path / "abc")
+        barrier = threading.Barrier(2)
+        real_replace = os.replace
+        errors = []
+
+        def replace_after_both_wrote(src, dst):
+            barrier.wait(timeout=5)
+            real_replace(src, dst)
+
+        def write(value):
+            try:
+                write_cache_entry(cache_path, size=value)
+            except OSError as e:
+                errors.append(e)
+
+        monkeypatch.setattr("openskills.cache.os.replace", replace_after_both_wrote)
+        threads = [threading.Thread(target=write, args=(n,)) for n in (1, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert read_cache_entry(cache_path)["size"] in (1, 2)
+
+    def test_entry_is_sidecar_file(self, tmp_path):
+        cache_path = str(tmp_path / "abc")
+        mark_cache_fetched(cache_path, "u")
+        data = json.loads((tmp_path / "abc.json").read_text())
+        assert data["repo_url"] == "u"
+
+    def test_remove_entry(self, tmp_path):
+        cache_path = str(tmp_path / "abc")
+        mark_cache_fetched(cache_path, "u")
+        remove_cache_entry(cache_path)
+        remove_cache_entry(cache_path)
+        assert read_cache_entry(cache_path) == {}
+
+
+class TestIsCacheFresh:
+    def test_missing_directory_is_stale(self, tmp_path):
+        assert is_cache_fresh(str(tmp_path / "abc"), ttl=60) is False
+
+    def test_recent_fetch_is_fresh(self, tmp_path):
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        mark_cache_fetched(str(cache_path), "u")
+        assert is_cache_fresh(str(cache_path), ttl=60) is True
+
+    def test_old_fetch_is_stale(self, tmp_path):
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        write_cache_entry(str(cache_path), fetched_at=time.time() - 120)
+        assert is_cache_fresh(str(cache_path), ttl=60) is False
+        assert get_cache_age(str(cache_path)) >= 120
+
+    def test_zero_ttl_always_stale(self, tmp_path):
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        mark_cache_fetched(str(cache_path), "u")
+        assert is_cache_fresh(str(cache_path), ttl=0) is False
+
+    def test_no_timestamp_is_stale(self, tmp_path):
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        assert is_cache_fresh(str(cache_path), ttl=60) is False
+
+
+def _make_clone(home, key, size, accessed_at, repo_url=None):
+    cache_path = home / ".openskills" / "cache" / key
+    cache_path.mkdir(parents=True)
+    (cache_path / "blob").write_bytes(b"x" * size)
+    write_cache_entry(str(cache_path), repo_url=repo_url or key, size=size, accessed_at=accessed_at)
+    return cache_path
+
+
+class TestParseSize:
+    def test_plain_bytes(self):
+        assert parse_size("2048") == 2048
+
+    def test_suffixes(self):
+        assert parse_size("2K") == 2048
+        assert parse_size("1.5MB") == int(1.5 * 1024 * 1024)
+        assert parse_size("1gib") == 1024 ** 3
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+    def test_max_bytes_env(self, monkeypatch):
+        monkeypatch.setenv(CACHE_MAX_BYTES_ENV, "10M")
+        assert get_cache_max_bytes() == 10 * 1024 * 1024
+        monkeypatch.setenv(CACHE_MAX_BYTES_ENV, "nope")
+        assert get_cache_max_bytes() == DEFAULT_CACHE_MAX_BYTES
+
+
+class TestCacheLedger:
+    def test_mark_fetched_records_size_and_access(self, tmp_path):
+        cache_path = tmp_path / "abc"
+        (cache_path / "sub").mkdir(parents=True)
+        (cache_path / "sub" / "f").write_bytes(b"12345")
+        mark_cache_fetched(str(cache_path), "u")
+        entry = read_cache_entry(str(cache_path))
+        assert entry["size"] == 5
+        assert entry["accessed_at"] == entry["fetched_at"]
+
+    def test_touch_updates_access_only(self, tmp_path):
+        cache_path = str(tmp_path / "abc")
+        write_cache_entry(cache_path, fetched_at=1.0, accessed_at=1.0, size=3)
+        touch_cache_entry(cache_path)
+        entry = read_cache_entry(cache_path)
+        assert entry["fetched_at"] == 1.0
+        assert entry["accessed_at"] > 1.0
+        assert entry["size"] == 3
+
+    def test_list_uses_ledger_sizes(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        _make_clone(home, "aaa", 10, 1.0, repo_url="https://a")
+        write_cache_entry(str(home / ".openskills" / "cache" / "aaa"), size=999)
+        entries = list_cache_entries()
+        assert [(e.key, e.repo_url, e.size) for e in entries] == [("aaa", "https://a", 999)]
+
+    def test_list_measures_legacy_clone_once(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        legacy = home / ".openskills" / "cache" / "old"
+        legacy.mkdir(parents=True)
+        (legacy / "f").write_bytes(b"abcd")
+        entries = list_cache_entries()
+        assert entries[0].size == 4
+        assert read_cache_entry(str(legacy))["size"] == 4
+
+
+class TestCacheGc:
+    def test_evicts_least_recently_used_first(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        _make_clone(home, "old", 100, 1.0)
+        _make_clone(home, "mid", 100, 2.0)
+        _make_clone(home, "new", 100, 3.0)
+
+        evicted = gc_cache_entries(max_bytes=150)
+
+        assert [e.key for e in evicted] == ["old", "mid"]
+        assert [e.key for e in list_cache_entries()] == ["new"]
+        assert not (home / ".openskills" / "cache" / "old.json").exists()
+
+    def test_within_budget_evicts_nothing(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        _make_clone(home, "a", 100, 1.0)
+        assert gc_cache_entries(max_bytes=1000) == []
+
+    def test_keep_protects_entry_in_use(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        in_use = _make_clone(home, "old", 100, 1.0)
+        _make_clone(home, "new", 100, 2.0)
+
+        evicted = gc_cache_entries(max_bytes=100, keep={os.path.normpath(str(in_use))})
+
+        assert [e.key for e in evicted] == ["new"]
+        assert in_use.exists()
+
+    def test_clear_removes_everything(self, monkeypatch, tmp_path):
+        home = _fake_home(monkeypatch, tmp_path)
+        _make_clone(home, "a", 10, 1.0)
+        _make_clone(home, "b", 10, 2.0)
+        removed = clear_cache_entries()
+        assert len(removed) == 2
+        assert list_cache_entries() == []
+
+    def test_gc_skips_entries_locked_elsewhere(self, monkeypatch, tmp_path):
+        import threading
+        from openskills.locks import cache_lock
+
+        home = _fake_home(monkeypatch, tmp_path)
+        busy = _make_clone(home, "busy", 100, 1.0)
+        _make_clone(home, "idle", 100, 2.0)
+        held = threading.Event()
+        release = threading.Event()
+
+        def reader():
+            with cache_lock(str(busy), shared=True):
+                held.set()
+                release.wait()
+
+        t = threading.Thread(target=reader)
+        t.start()
+        held.wait()
+        try:
+            evicted = gc_cache_entries(max_bytes=0)
+        finally:
+            release.set()
+            t.join()
+
+        assert [e.key for e in evicted] == ["idle"]
+        assert busy.exists()
+
+
+class TestRefreshCachedRepo:
+    def _git(self, cwd, *args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=cwd, check=True, capture_output=True)
+
+    def test_follows_non_main_default_branch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("openskills.cache.enforce_cache_budget", lambda path: [])
+        origin = tmp_path / "origin"
+        origin.mkdir()
+        self._git(origin, "init", "-q", "-b", "trunk")
+        (origin / "SKILL.md").write_text("v1")
+        self._git(origin, "add", "-A")
+        self._git(origin, "commit", "-q", "-m", "v1")
+        cache_path = tmp_path / "cache" / "key"
+
+        refresh_cached_repo(str(origin), str(cache_path))
+        (origin / "SKILL.md").write_text("v2")
+        self._git(origin, "commit", "-q", "-am", "v2")
+        refresh_cached_repo(str(origin), str(cache_path))
+
+        assert (cache_path / "SKILL.md").read_text() == "v2"
+        assert read_cache_entry(str(cache_path))["repo_url"] == str(origin)
+
+    def test_broken_clone_is_recloned(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("openskills.cache.enforce_cache_budget", lambda path: [])
+        origin = tmp_path / "origin"
+        origin.mkdir()
+        self._git(origin, "init", "-q")
+        (origin / "SKILL.md").write_text("v1")
+        self._git(origin, "add", "-A")
+        self._git(origin, "commit", "-q", "-m", "v1")
+        cache_path = tmp_path / "cache" / "key"
+        cache_path.mkdir(parents=True)
+        (cache_path / "junk").write_text("not a repo")
+
+        refresh_cached_repo(str(origin), str(cache_path))
+
+        assert (cache_path / "SKILL.md").read_text() == "v1"
+        assert not (cache_path / "junk").exists()
@@ -2,7 +2,7 @@ import types
 from unittest.mock import MagicMock
 from click.testing import CliRunner
 from openskills.cli import cli, _format_tree
-from openskills.models import Skill, SkillLocation, SkillRecommendation
+from openskills.models import RecommendationGraph, Skill, SkillLocation, SkillRecommendation
 
 
 def test_version_flag():
@@ -99,7 +99,7 @@ def test_update_no_args(monkeypatch):
     runner = CliRunner()
     result = runner.invoke(cli, ['update'])
     assert result.exit_code == 0
-    mock_update.assert_called_once_with(None)
+    mock_update.assert_called_once_with(None, verify=False)
 
 
 def test_update_with_skill_names(monkeypatch):
@@ -108,7 +108,7 @@ def test_update_with_skill_names(monkeypatch):
     runner = CliRunner()
     result = runner.invoke(cli, ['update', 'skill1', 'skill2'])
     assert result.exit_code == 0
-    mock_update.assert_called_once_with(['skill1', 'skill2'])
+    mock_update.assert_called_once_with(['skill1', 'skill2'], verify=False)
 
 
 def test_market_list(monkeypatch):
@@ -153,12 +153,25 @@ def test_recommends_tree_no_args(monkeypatch):
 
 def test_recommends_tree_with_skill(monkeypatch):
     monkeypatch.setattr('openskills.cli.find_skill', lambda n: types.SimpleNamespace(base_dir='/fake'))
-    monkeypatch.setattr('openskills.cli.resolve_recommendation_tree', lambda d: {"name": "test", "recs": []})
+    monkeypatch.setattr('openskills.cli.build_recommendation_graph', lambda: RecommendationGraph(nodes={}, edges={}))
     runner = CliRunner()
     result = runner.invoke(cli, ['recommends', 'tree', 'my-skill'])
     assert result.exit_code == 0
 
 
+def test_recommends_tree_with_skill_renders_cycles(monkeypatch):
+    graph = RecommendationGraph(
+        nodes={'x': '/x', 'y': '/y'},
+        edges={'x': [SkillRecommendation(name='y', source='s')], 'y': [SkillRecommendation(name='x', source='s')]},
+    )
+    monkeypatch.setattr('openskills.cli.find_skill', lambda n: types.SimpleNamespace(base_dir='/x'))
+    monkeypatch.setattr('openskills.cli.build_recommendation_graph', lambda: graph)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['recommends', 'tree', 'x'])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ['x', '  └── y', '      └── x (cycle)']
+
+
 def test_recommends_install_with_skill(monkeypatch):
     monkeypatch.setattr('openskills.cli.find_skill', lambda n: types.SimpleNamespace(base_dir='/fake'))
     monkeypatch.setattr('openskills.cli.check_recommendations', lambda d: {"missing": [], "satisfied": []})
@@ -184,8 +197,10 @@ def test_recommends_install_shows_source(monkeypatch):
     monkeypatch.setattr('openskills.cli.find_skill', lambda n: types.SimpleNamespace(base_dir='/fake'))
     monkeypatch.setattr('openskills.cli.check_recommendations',
                         lambda d: {"missing": [rec], "satisfied": []})
-    mock_install = MagicMock()
-    monkeypatch.setattr('openskills.cli.install_skill', mock_install)
+    jobs = {"dep-a": {"name": "dep-a", "source": rec.source, "via": None, "recommends": []}}
+    monkeypatch.setattr('openskills.installer.plan_recommendation_installs', lambda *a: (jobs, {}))
+    mock_install = MagicMock(return_value={"dep-a": None})
+    monkeypatch.setattr('openskills.installer.install_recommended_skills', mock_install)
     monkeypatch.setattr('openskills.installer.prompt_for_selection',
                         lambda msg, choices: ["dep-a"])
     runner = CliRunner()
@@ -194,6 +209,7 @@ def test_recommends_install_shows_source(monkeypatch):
     assert 'dep-a' in result.output
     assert 'owner/dep-a' in result.output
     mock_install.assert_called_once()
+    assert list(mock_install.call_args[0][0]) == ["dep-a"]
 
 
 def test_recommends_tree_output_format():
@@ -211,3 +227,163 @@ def test_recommends_tree_output_format():
     assert "child-a" in result
     assert "child-b" in result
     assert "grandchild" in result
+
+
+def test_install_offline_flag(monkeypatch):
+    mock_install = MagicMock()
+    monkeypatch.setattr('openskills.cli.install_skill', mock_install)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['install', 'some-source', '--offline'])
+    assert result.exit_code == 0
+    opts = mock_install.call_args[0][1]
+    assert opts.offline is True
+
+
+def test_install_frozen_uses_lockfile(monkeypatch):
+    mock_frozen = MagicMock()
+    mock_install = MagicMock()
+    monkeypatch.setattr('openskills.cli.install_from_lockfile', mock_frozen)
+    monkeypatch.setattr('openskills.cli.install_skill', mock_install)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['install', '--frozen'])
+    assert result.exit_code == 0
+    mock_frozen.assert_called_once()
+    mock_install.assert_not_called()
+
+
+def test_install_frozen_rejects_source(monkeypatch):
+    mock_frozen = MagicMock()
+    monkeypatch.setattr('openskills.cli.install_from_lockfile', mock_frozen)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['install', 'some-source', '--frozen'])
+    assert result.exit_code != 0
+    mock_frozen.assert_not_called()
+
+
+def test_install_requires_source():
+    runner = CliRunner()
+    result = runner.invoke(cli, ['install'])
+    assert result.exit_code != 0
+    assert 'SOURCE' in result.output
+
+
+def test_cache_ls_empty(monkeypatch):
+    monkeypatch.setattr('openskills.cache.list_cache_entries', lambda: [])
+    runner = CliRunner()
+    result = runner.invoke(cli, ['cache', 'ls'])
+    assert result.exit_code == 0
+    assert 'Cache is empty' in result.output
+
+
+def test_cache_gc_passes_max_size(monkeypatch):
+    mock_gc = MagicMock()
+    monkeypatch.setattr('openskills.cli.cache_gc', mock_gc)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['cache', 'gc', '--max-size', '500MB'])
+    assert result.exit_code == 0
+    mock_gc.assert_called_once_with('500MB')
+
+
+def test_cache_gc_rejects_bad_size(monkeypatch):
+    runner = CliRunner()
+    result = runner.invoke(cli, ['cache', 'gc', '--max-size', 'huge'])
+    assert result.exit_code != 0
+    assert 'Invalid size' in result.output
+
+
+def test_cache_clear_requires_confirmation(monkeypatch):
+    mock_clear = MagicMock()
+    monkeypatch.setattr('openskills.cli.cache_clear', mock_clear)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['cache', 'clear'], input='n\n')
+    assert result.exit_code == 0
+    mock_clear.assert_not_called()
+    result = runner.invoke(cli, ['cache', 'clear', '-y'])
+    mock_clear.assert_called_once()
+
+
+def test_sync_passes_options(monkeypatch):
+    mock_sync = MagicMock()
+    monkeypatch.setattr('openskills.cli.sync_skills', mock_sync)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['sync', '-f', 'team.yaml', '--dry-run'])
+    assert result.exit_code == 0
+    mock_sync.assert_called_once_with('team.yaml', yes=False, dry_run=True, offline=False)
+
+
+def test_update_check_does_not_update(monkeypatch):
+    mock_check = MagicMock()
+    mock_update = MagicMock()
+    monkeypatch.setattr('openskills.cli.check_updates', mock_check)
+    monkeypatch.setattr('openskills.cli.update_skills', mock_update)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['update', '--check', 'a'])
+    assert result.exit_code == 0
+    mock_check.assert_called_once_with(['a'])
+    mock_update.assert_not_called()
+
+
+def test_update_verify_flag(monkeypatch):
+    mock_update = MagicMock()
+    monkeypatch.setattr('openskills.cli.update_skills', mock_update)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['update', '--verify'])
+    assert result.exit_code == 0
+    mock_update.assert_called_once_with(None, verify=True)
+
+
+def test_commands_trigger_auto_update_check(monkeypatch):
+    mock_spawn = MagicMock()
+    monkeypatch.setattr('openskills.cli.maybe_spawn_auto_update', mock_spawn)
+    monkeypatch.setattr('openskills.cli.find_all_skills', lambda: [])
+    monkeypatch.setattr('openskills.cli.show_summary', lambda: None)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['list'])
+    assert result.exit_code == 0
+    mock_spawn.assert_called_once()
+
+
+def test_recommends_check_no_args_reports_cycles(monkeypatch):
+    from openskills.models import RecommendationGraph
+    skills = [
+        Skill(name='a', description='', location=SkillLocation.PROJECT, path='/p/a'),
+        Skill(name='b', description='', location=SkillLocation.PROJECT, path='/p/b'),
+    ]
+    graph = RecommendationGraph(
+        nodes={'a': '/p/a', 'b': '/p/b'},
+        edges={
+            'a': [SkillRecommendation(name='b', source=''), SkillRecommendation(name='gone', source='')],
+            'b': [SkillRecommendation(name='a', source='')],
+        },
+    )
+    monkeypatch.setattr('openskills.cli.find_all_skills', lambda: skills)
+    monkeypatch.setattr('openskills.cli.build_recommendation_graph', lambda s: graph)
+    runner = CliRunner()
+    result = runner.invoke(cli, ['recommends', 'check'])
+    assert result.exit_code == 0
+    assert '✗ a has uninstalled recommendations' in result.output
+    assert '✓ b - all recommendations satisfied' in result.output
+    assert 'Circular recommendation between: a, b' in result.output
+    assert '1 cycle(s)' in result.output
+
+
+def test_recommends_graph_formats(monkeypatch):
+    import json
+    from openskills.models import RecommendationGraph
+    graph = RecommendationGraph(
+        nodes={'a': '/p/a'},
+        edges={'a': [SkillRecommendation(name='gone', source='https://github.com/o/r')]},
+    )
+    monkeypatch.setattr('openskills.cli.build_recommendation_graph', lambda: graph)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ['recommends', 'graph'])
+    assert result.exit_code == 0
+    assert result.output.startswith('digraph recommends {')
+    assert '"gone" [style=dashed, color=red];' in result.output
+    assert '"a" -> "gone" [tooltip="https://github.com/o/r"];' in result.output
+
+    result = runner.invoke(cli, ['recommends', 'graph', '--format', 'json'])
+    data = json.loads(result.output)
+    assert [n['status'] for n in data['nodes']] == ['installed', 'missing']
+    assert data['edges'] == [{'from': 'a', 'to': 'gone', 'source': 'https://github.com/o/r'}]
@@ -19,6 +19,13 @@ SKILL_MD = (
 )
 
 
+@pytest.fixture(autouse=True)
+def registry_dir(tmp_path, monkeypatch):
+    path = tmp_path / "registry"
+    path.mkdir()
+    monkeypatch.setattr("openskills.registry.get_registry_dir", lambda: str(path))
+
+
 def _make_skill_dir(parent, name, content=SKILL_MD):
     skill_dir = parent / name
     skill_dir.mkdir(parents=True, exist_ok=True)
@@ -193,3 +200,15 @@ class TestFindSkill:
         )
         result = find_skill("early-skill")
         assert result.source == str(dir_a)
+
+
+class TestFindAllSkillsSkipsStaging:
+    def test_staging_and_trash_dirs_are_ignored(self, monkeypatch, tmp_path):
+        from openskills.staging import STAGING_PREFIX, TRASH_PREFIX
+        base = tmp_path / "skills"
+        _make_skill_dir(base, "real")
+        _make_skill_dir(base, f"{STAGING_PREFIX}real-abc")
+        _make_skill_dir(base, f"{TRASH_PREFIX}real-def")
+        monkeypatch.setattr("openskills.finder.get_search_dirs", lambda: [str(base)])
+
+        assert [s.name for s in find_all_skills()] == ["real"]
@@ -0,0 +1,154 @@
+import os
+
+from openskills.hashing import compute_tree_hash, hash_file, list_tree_files
+
+
+def _make_tree(root):
+    (root / "sub").mkdir(parents=True)
+    (root / "SKILL.md").write_text("---\nname: a\n---\n")
+    (root / "sub" / "ref.txt").write_text("reference")
+    return root
+
+
+class TestHashFile:
+    def test_matches_sha256(self, tmp_path):
+        import hashlib
+        path = tmp_path / "f.txt"
+        path.write_bytes(b"hello")
+        assert hash_file(str(path)) == hashlib.sha256(b"hello").hexdigest()
+
+
+class TestListTreeFiles:
+    def test_sorted_posix_paths(self, tmp_path):
+        _make_tree(tmp_path)
+        assert list_tree_files(str(tmp_path)) == ["SKILL.md", "sub/ref.txt"]
+
+    def test_excludes_metadata_file(self, tmp_path):
+        _make_tree(tmp_path)
+        (tmp_path / ".openskills.json").write_text("{}")
+        assert ".openskills.json" not in list_tree_files(str(tmp_path))
+
+    def test_descends_into_symlinked_directories(self, tmp_path):
+        shared = _make_tree(tmp_path / "shared")
+        skill = tmp_path / "skill"
+        skill.mkdir()
+        (skill / "SKILL.md").write_text("x")
+        os.symlink(shared / "sub", skill / "refs")
+        os.symlink(skill, skill / "refs" / "loop")
+
+        assert list_tree_files(str(skill)) == ["SKILL.md", "refs/ref.txt"]
+        assert compute_tree_hash(str(skill))
+
+
+class TestComputeTreeHash:
+    def test_same_content_same_hash(self, tmp_path):
+        a = _make_tree(tmp_path / "a")
+        b = _make_tree(tmp_path / "b")
+        assert compute_tree_hash(str(a)) == compute_tree_hash(str(b))
+
+    def test_ignores_metadata_file(self, tmp_path):
+        tree = _make_tree(tmp_path / "a")
+        before = compute_tree_hash(str(tree))
+        (tree / ".openskills.json").write_text('{"installedAt": "now"}')
+        assert compute_tree_hash(str(tree)) == before
+
+    def test_content_change_changes_hash(self, tmp_path):
+        tree = _make_tree(tmp_path / "a")
+        before = compute_tree_hash(str(tree))
+        (tree / "sub" / "ref.txt").write_text("changed")
+        assert compute_tree_hash(str(tree)) != before
+
+    def test_rename_changes_hash(self, tmp_path):
+        tree = _make_tree(tmp_path / "a")
+        before = compute_tree_hash(str(tree))
+        (tree / "sub" / "ref.txt").rename(tree / "sub" / "other.txt")
+        assert compute_tree_hash(str(tree)) != before
+
+
+class TestSnapshotTree:
+    def test_records_size_and_mtime(self, tmp_path):
+        from openskills.hashing import snapshot_tree
+        _make_tree(tmp_path)
+        os.utime(tmp_path / "sub" / "ref.txt", ns=(1, 123))
+
+        snapshot = snapshot_tree(str(tmp_path))
+
+        assert sorted(snapshot) == ["SKILL.md", "sub/ref.txt"]
+        assert snapshot["sub/ref.txt"] == [len("reference"), 123]
+
+    def test_excludes_metadata_file(self, tmp_path):
+        from openskills.hashing import snapshot_tree
+        _make_tree(tmp_path)
+        (tmp_path / ".openskills.json").write_text("{}")
+        assert ".openskills.json" not in snapshot_tree(str(tmp_path))
+
+
+    def test_dangling_symlink_does_not_raise(self, tmp_path):
+        from openskills.hashing import snapshot_tree
+        _make_tree(tmp_path)
+        os.symlink(tmp_path / "missing.txt", tmp_path / "sub" / "broken")
+
+        snapshot = snapshot_tree(str(tmp_path))
+
+        assert "sub/broken" in snapshot
+        before = compute_tree_hash(str(tmp_path))
+        os.remove(tmp_path / "sub" / "broken")
+        os.symlink(tmp_path / "other.txt", tmp_path / "sub" / "broken")
+        assert compute_tree_hash(str(tmp_path)) != before
+
+    def test_follows_symlinked_directories(self, tmp_path):
+        from openskills.hashing import snapshot_tree
+        shared = _make_tree(tmp_path / "shared")
+        skill = tmp_path / "skill"
+        skill.mkdir()
+        os.symlink(shared / "sub", skill / "refs")
+        os.symlink(shared / "SKILL.md", skill / "SKILL.md")
+
+        before = snapshot_tree(str(skill))
+        (shared / "sub" / "ref.txt").write_text("edited reference")
+        (shared / "SKILL.md").write_text("edited")
+
+        after = snapshot_tree(str(skill))
+        assert sorted(after) == ["SKILL.md", "refs/ref.txt"]
+        assert after["refs/ref.txt"] != before["refs/ref.txt"]
+        assert after["SKILL.md"] != before["SKILL.md"]
+
+
+class TestFileManifest:
+    def _manifest(self, tree):
+        from openskills.hashing import build_file_manifest, hash_tree
+        return build_file_manifest(str(tree), hash_tree(str(tree)))
+
+    def test_records_hash_and_stat(self, tmp_path):
+        tree = _make_tree(tmp_path / "a")
+        manifest = self._manifest(tree)
+        st = os.stat(tree / "sub" / "ref.txt")
+        assert sorted(manifest) == ["SKILL.md", "sub/ref.txt"]
+        assert manifest["sub/ref.txt"][0] == hash_file(str(tree / "sub" / "ref.txt"))
+        assert manifest["sub/ref.txt"][1:] == [st.st_size, st.st_mtime_ns]
+
+    def test_reports_modified_missing_and_extra(self, tmp_path):
+        from openskills.hashing import verify_file_manifest
+        tree = _make_tree(tmp_path / "a")
+        manifest = self._manifest(tree)
+        (tree / "SKILL.md").write_text("---\nname: changed\n---\n")
+        (tree / "sub" / "ref.txt").unlink()
+        (tree / "new.txt").write_text("x")
+
+        assert verify_file_manifest(str(tree), manifest) == {
+            "modified": ["SKILL.md"], "missing": ["sub/ref.txt"], "extra": ["new.txt"],
+        }
+
+    def test_unchanged_stat_skips_hashing_unless_deep(self, tmp_path):
+        from unittest.mock import patch
+        from openskills.hashing import verify_file_manifest
+        tree = _make_tree(tmp_path / "a")
+        manifest = self._manifest(tree)
+        st = os.stat(tree / "sub" / "ref.txt")
+        # Same size, same mtime, different content: only --deep notices.
+        (tree / "sub" / "ref.txt").write_text("REFERENCE")
+        os.utime(tree / "sub" / "ref.txt", ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        with patch("openskills.hashing.hash_file", side_effect=AssertionError("hashed")):
+            assert verify_file_manifest(str(tree), manifest)["modified"] == []
+        assert verify_file_manifest(str(tree), manifest, deep=True)["modified"] == ["sub/ref.txt"]
@@ -4,14 +4,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from openskills.cache import get_cache_key
 from openskills.installer import (
     _format_source,
     _terminal_link,
     expand_path,
     find_skills_in_repo,
     format_size,
-    get_cache_key,
-    get_directory_size,
     get_repo_name,
     is_git_url,
     is_local_path,
@@ -140,22 +139,6 @@ class TestGetRepoName:
         assert get_repo_name("https://github.com/owner/") is None
 
 
-class TestGetDirectorySize:
-    def test_empty_directory(self, tmp_path):
-        assert get_directory_size(str(tmp_path)) == 0
-
-    def test_directory_with_files(self, tmp_path):
-        (tmp_path / "file.txt").write_bytes(b"hello world")
-        assert get_directory_size(str(tmp_path)) == 11
-
-    def test_counts_nested_files(self, tmp_path):
-        subdir = tmp_path / "sub"
-        subdir.mkdir()
-        (tmp_path / "a.txt").write_bytes(b"aaaa")
-        (subdir / "b.txt").write_bytes(b"bbbbb")
-        assert get_directory_size(str(tmp_path)) == 9
-
-
 class TestFormatSize:
     def test_bytes(self):
         assert format_size(512) == "512B"
@@ -242,6 +225,14 @@ class TestFindSkillsInRepo:
         result = find_skills_in_repo(str(tmp_path))
         assert result[0]["skill_name"] == "my-skill"
 
+    def test_ignores_name_in_markdown_body(self, tmp_path):
+        (tmp_path / "SKILL.md").write_text(
+            "---\ndescription: >\n  Multi-line\n  description\n---\nname: not-this\n", encoding="utf-8"
+        )
+        result = find_skills_in_repo(str(tmp_path))
+        assert result[0]["skill_name"] != "not-this"
+        assert result[0]["description"] == "Multi-line description"
+
     def test_falls_back_to_directory_name(self, tmp_path):
         sub = tmp_path / "fallback-name"
         sub.mkdir()
@@ -249,6 +240,54 @@ class TestFindSkillsInRepo:
         result = find_skills_in_repo(str(tmp_path))
         assert result[0]["skill_name"] == "fallback-name"
 
+    def test_prunes_vcs_and_dependency_dirs(self, tmp_path):
+        for pruned in (".git", "node_modules"):
+            d = tmp_path / pruned / "vendored"
+            d.mkdir(parents=True)
+            (d / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+        real = tmp_path / "real"
+        real.mkdir()
+        (real / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+
+        result = find_skills_in_repo(str(tmp_path))
+
+        assert [info["skill_name"] for info in result] == ["real"]
+
+    def test_sizes_include_nested_files(self, tmp_path):
+        (tmp_path / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+        nested = tmp_path / "skills" / "inner"
+        nested.mkdir(parents=True)
+        (nested / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+        (nested / "data.bin").write_bytes(b"x" * 100)
+
+        result = {info["skill_dir"]: info["size"] for info in find_skills_in_repo(str(tmp_path))}
+
+        skill_md = len(SKILL_MD_WITH_NAME.encode())
+        assert result[str(nested)] == skill_md + 100
+        assert result[str(tmp_path)] == 2 * skill_md + 100
+
+    def test_parallel_stat_matches_sequential(self, tmp_path):
+        for i in range(5):
+            d = tmp_path / f"skill-{i}"
+            d.mkdir()
+            (d / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+            (d / "payload").write_bytes(b"y" * (i * 10))
+
+        sequential = find_skills_in_repo(str(tmp_path), workers=1)
+        parallel = find_skills_in_repo(str(tmp_path), workers=4)
+
+        assert sequential == parallel
+
+    def test_root_skill_listed_first(self, tmp_path):
+        sub = tmp_path / "a-sub"
+        sub.mkdir()
+        (sub / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+        (tmp_path / "SKILL.md").write_text(SKILL_MD_WITH_NAME, encoding="utf-8")
+
+        result = find_skills_in_repo(str(tmp_path))
+
+        assert [info["skill_dir"] for info in result] == [str(tmp_path), str(sub)]
+
 
 class TestTerminalLink:
     def test_link_with_text(self):
@@ -298,48 +337,184 @@ class TestInstallRecommendations:
         monkeypatch.setattr("openskills.installer.find_skill", lambda n: None)
         _install_recommendations(str(tmp_path), InstallOptions())
 
+    def _local_rec(self, tmp_path, name, recommends=None):
+        from openskills.metadata import write_skill_metadata
+        from openskills.models import SkillRecommendation, SkillSourceMetadata, SkillSourceType
+        src = tmp_path / "sources" / name
+        src.mkdir(parents=True)
+        (src / "SKILL.md").write_text(f"---\nname: {name}\ndescription: d\n---\n", encoding="utf-8")
+        if recommends:
+            write_skill_metadata(str(src), SkillSourceMetadata(
+                source=str(src),
+                source_type=SkillSourceType.LOCAL,
+                recommends=[SkillRecommendation(name=r, source=str(tmp_path / "sources" / r)) for r in recommends],
+            ))
+        return {"name": name, "source": str(src), "recs": []}
+
+    def _setup(self, tmp_path, monkeypatch, tree):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("openskills.installer.resolve_recommendation_tree", lambda d: tree)
+        monkeypatch.setattr("openskills.installer.find_skill", lambda n: None)
+
     def test_missing_recs_prompt_selective(self, tmp_path, monkeypatch):
         from openskills.installer import _install_recommendations
         from openskills.models import InstallOptions
-        tree = {
-            "name": "skill",
-            "recs": [
-                {"name": "rec-a", "source": "https://github.com/owner/rec-a", "recs": []},
-                {"name": "rec-b", "source": "https://github.com/owner/rec-b", "recs": []},
-            ]
-        }
-        monkeypatch.setattr("openskills.installer.resolve_recommendation_tree",
-                            lambda d: tree)
-        monkeypatch.setattr("openskills.installer.find_skill", lambda n: None)
+        tree = {"name": "skill", "recs": [self._local_rec(tmp_path, "rec-a"), self._local_rec(tmp_path, "rec-b")]}
+        self._setup(tmp_path, monkeypatch, tree)
+        prompts = []
         monkeypatch.setattr("openskills.installer.prompt_for_selection",
-                            lambda msg, choices: ["rec-a"])
+                            lambda msg, choices: prompts.append(choices) or ["rec-a"])
+
+        _install_recommendations(str(tmp_path), InstallOptions())
+
+        assert len(prompts) == 1
+        assert (tmp_path / ".agents" / "skills" / "rec-a" / "SKILL.md").exists()
+        assert not (tmp_path / ".agents" / "skills" / "rec-b").exists()
+
+    def test_missing_recs_yes_flag_installs_all(self, tmp_path, monkeypatch, capsys):
+        from openskills.installer import _install_recommendations
+        from openskills.models import InstallOptions
+        tree = {"name": "skill", "recs": [self._local_rec(tmp_path, "rec-a"), self._local_rec(tmp_path, "rec-b")]}
+        self._setup(tmp_path, monkeypatch, tree)
         mock_install = MagicMock()
         monkeypatch.setattr("openskills.installer.install_skill", mock_install)
 
-        _install_recommendations(str(tmp_path), InstallOptions())
+        _install_recommendations(str(tmp_path), InstallOptions(yes=True))
+
+        mock_install.assert_not_called()
+        for name in ("rec-a", "rec-b"):
+            assert (tmp_path / ".agents" / "skills" / name / "SKILL.md").exists()
+        assert "2 recommendation(s) installed, 0 failed" in capsys.readouterr().out
+
+    def test_transitive_recommendations_installed_dependencies_first(self, tmp_path, monkeypatch, capsys):
+        from openskills.installer import _install_recommendations
+        from openskills.metadata import read_skill_metadata
+        from openskills.models import InstallOptions
+        self._local_rec(tmp_path, "base")
+        tree = {"name": "skill", "recs": [self._local_rec(tmp_path, "top", recommends=["base"])]}
+        self._setup(tmp_path, monkeypatch, tree)
+        order = []
+        from openskills.installer import copy_skill as real_copy
+        monkeypatch.setattr("openskills.installer.copy_skill",
+                            lambda src, target, *a: order.append(os.path.basename(target)) or real_copy(src, target, *a))
+
+        _install_recommendations(str(tmp_path), InstallOptions(yes=True))
 
-        mock_install.assert_called_once()
-        assert mock_install.call_args[0][0] == "https://github.com/owner/rec-a"
+        assert order == ["base", "top"]
+        assert "via top" in capsys.readouterr().out
+        installed = read_skill_metadata(str(tmp_path / ".agents" / "skills" / "top"))
+        assert [r.name for r in installed.recommends] == ["base"]
 
-    def test_missing_recs_yes_flag_installs_all(self, tmp_path, monkeypatch):
+    def test_unresolvable_source_is_reported(self, tmp_path, monkeypatch, capsys):
         from openskills.installer import _install_recommendations
         from openskills.models import InstallOptions
+        tree = {"name": "skill", "recs": [{"name": "ghost", "source": "", "recs": []}]}
+        self._setup(tmp_path, monkeypatch, tree)
+
+        _install_recommendations(str(tmp_path), InstallOptions(yes=True))
+
+        out = capsys.readouterr().out
+        assert "'ghost' is not found in market" in out
+        assert "none of the missing recommendations can be installed" in out
+
+
+class TestPlanRecommendationInstalls:
+    def test_fetches_each_repo_once(self, tmp_path, monkeypatch):
+        from openskills.installer import plan_recommendation_installs
+        from openskills.models import InstallOptions
+        repo = tmp_path / "repo"
+        for name in ("one", "two"):
+            (repo / "skills" / name).mkdir(parents=True)
+            (repo / "skills" / name / "SKILL.md").write_text(f"---\nname: {name}\n---\n", encoding="utf-8")
+        fetched = []
+        monkeypatch.setattr("openskills.installer.get_cached_repo",
+                            lambda url, offline=False: fetched.append(url) or str(repo))
+
+        jobs, errors = plan_recommendation_installs([
+            {"name": "one", "source": "https://github.com/owner/repo"},
+            {"name": "two", "source": "https://github.com/owner/repo/tree/main/skills/two"},
+        ], InstallOptions())
+
+        assert fetched == ["https://github.com/owner/repo"]
+        assert errors == {}
+        assert jobs["one"]["skill_dir"] == str(repo / "skills" / "one")
+        assert jobs["two"]["skill_dir"] == str(repo / "skills" / "two")
+
+    def test_market_sources_resolved_in_one_lookup(self, tmp_path, monkeypatch):
+        from openskills.installer import resolve_market_sources
+        from openskills.market import MarketSkill
+
+        def skill(name, repo):
+            return MarketSkill(name, "", repo, "main", subpath=f"skills/{name}")
+
+        index = {
+            "one": [skill("one", "https://github.com/a/repo")],
+            "two": [skill("two", "https://github.com/b/repo"), skill("two", "https://github.com/c/repo")],
+            "three": [skill("three", "https://github.com/b/repo"), skill("three", "https://github.com/c/repo")],
+        }
+        lookups = []
+        monkeypatch.setattr("openskills.installer.index_market_skills", lambda: lookups.append(1) or index)
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(tmp_path / url.split("/")[3]))
+        (tmp_path / "c").mkdir()
+        recs = [
+            {"name": "one", "source": ""},
+            {"name": "two", "source": "two"},
+            {"name": "three", "source": ""},
+            {"name": "local", "source": str(tmp_path)},
+        ]
+
+        errors = resolve_market_sources(recs, {"https://github.com/b/repo": "/cache/b"})
+
+        assert lookups == [1]
+        assert recs[0]["source"] == "https://github.com/a/repo/skills/one"
+        # Both variants of "two" and "three" are local; neither is picked.
+        assert errors == {"two": "'two' is ambiguous in market", "three": "'three' is ambiguous in market"}
+        assert recs[3]["source"] == str(tmp_path)
+
+    def test_market_variant_prefers_cached_repo(self, tmp_path, monkeypatch):
+        from openskills.installer import resolve_market_sources
+        from openskills.market import MarketSkill
+        index = {"two": [
+            MarketSkill("two", "", "https://github.com/b/repo", "main"),
+            MarketSkill("two", "", "https://github.com/c/repo", "main", subpath="two"),
+        ]}
+        monkeypatch.setattr("openskills.installer.index_market_skills", lambda: index)
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(tmp_path / url.split("/")[3]))
+        (tmp_path / "c").mkdir()
+        recs = [{"name": "two", "source": ""}]
+
+        assert resolve_market_sources(recs, {}) == {}
+        assert recs[0]["source"] == "https://github.com/c/repo/two"
+
+    def test_install_levels_put_cycles_last(self):
+        from openskills.installer import _install_levels
+        from openskills.models import SkillRecommendation
+
+        def job(*recs):
+            return {"recommends": [SkillRecommendation(name=r, source="") for r in recs]}
+
+        levels = _install_levels({"a": job("b"), "b": job("c"), "c": job(), "x": job("y"), "y": job("x")})
+        assert levels == [["c"], ["b"], ["a"], ["x", "y"]]
+
+
+class TestResolveMissingRecs:
+    def test_shared_missing_skill_listed_once(self, monkeypatch):
+        from openskills.installer import _resolve_missing_recs
+        shared = [{"name": "base", "source": "b", "recs": []}]
         tree = {
-            "name": "skill",
+            "name": "top",
             "recs": [
-                {"name": "rec-a", "source": "https://github.com/owner/rec-a", "recs": []},
-                {"name": "rec-b", "source": "https://github.com/owner/rec-b", "recs": []},
-            ]
+                {"name": "left", "source": "l", "recs": shared},
+                {"name": "right", "source": "r", "recs": shared},
+            ],
         }
-        monkeypatch.setattr("openskills.installer.resolve_recommendation_tree",
-                            lambda d: tree)
-        monkeypatch.setattr("openskills.installer.find_skill", lambda n: None)
-        mock_install = MagicMock()
-        monkeypatch.setattr("openskills.installer.install_skill", mock_install)
+        lookups = []
+        monkeypatch.setattr("openskills.installer.find_skill", lambda n: lookups.append(n) or None)
 
-        _install_recommendations(str(tmp_path), InstallOptions(yes=True))
+        missing = _resolve_missing_recs(tree)
 
-        assert mock_install.call_count == 2
+        assert [m["name"] for m in missing] == ["left", "base", "right"]
+        assert sorted(lookups) == ["base", "left", "right"]
 
 
 class TestInstallFromSubpathMultiSkill:
@@ -539,3 +714,298 @@ class TestInstallFromRepoChoices:
             assert not re.search(r'\x1b\[[0-9;]*m', choice['name']), (
                 f"Choice name contains ANSI escape codes: {repr(choice['name'])}"
             )
+
+
+class TestGetCachedRepo:
+    def test_fresh_cache_skips_fetch(self, tmp_path, monkeypatch):
+        from openskills.installer import get_cached_repo
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(cache_path))
+        monkeypatch.setattr("openskills.installer.is_cache_fresh", lambda path: True)
+        mock_run = MagicMock()
+        monkeypatch.setattr("openskills.installer.subprocess.run", mock_run)
+
+        assert get_cached_repo("https://github.com/o/r") == str(cache_path)
+        mock_run.assert_not_called()
+
+    def test_stale_cache_fetches_and_marks(self, tmp_path, monkeypatch):
+        from openskills.installer import get_cached_repo
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(cache_path))
+        monkeypatch.setattr("openskills.installer.is_cache_fresh", lambda path: False)
+        mock_run = MagicMock()
+        monkeypatch.setattr("openskills.installer.subprocess.run", mock_run)
+        mock_mark = MagicMock()
+        monkeypatch.setattr("openskills.cache.mark_cache_fetched", mock_mark)
+        mock_gc = MagicMock()
+        monkeypatch.setattr("openskills.cache.enforce_cache_budget", mock_gc)
+
+        get_cached_repo("https://github.com/o/r")
+
+        assert [c.args[0][:2] for c in mock_run.call_args_list] == [["git", "fetch"], ["git", "reset"]]
+        mock_mark.assert_called_once_with(str(cache_path), "https://github.com/o/r")
+        mock_gc.assert_called_once_with(str(cache_path))
+
+    def test_offline_uses_cache_without_network(self, tmp_path, monkeypatch):
+        from openskills.installer import get_cached_repo
+        cache_path = tmp_path / "abc"
+        cache_path.mkdir()
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(cache_path))
+        monkeypatch.setattr("openskills.installer.is_cache_fresh", lambda path: False)
+        mock_run = MagicMock()
+        monkeypatch.setattr("openskills.installer.subprocess.run", mock_run)
+
+        assert get_cached_repo("https://github.com/o/r", offline=True) == str(cache_path)
+        mock_run.assert_not_called()
+
+    def test_offline_without_cache_exits(self, tmp_path, monkeypatch):
+        from openskills.installer import get_cached_repo
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(tmp_path / "missing"))
+        mock_run = MagicMock()
+        monkeypatch.setattr("openskills.installer.subprocess.run", mock_run)
+
+        with pytest.raises(SystemExit):
+            get_cached_repo("https://github.com/o/r", offline=True)
+        mock_run.assert_not_called()
+
+
+def _git(cwd, *args):
+    import subprocess
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, check=True, capture_output=True
+    ).stdout.decode().strip()
+
+
+class TestInstallFromLockfile:
+    def _setup(self, tmp_path, monkeypatch):
+        from openskills.hashing import compute_tree_hash
+        from openskills.lockfile import write_lockfile
+        from openskills.models import LockedSkill
+
+        origin = tmp_path / "origin"
+        skill = origin / "skills" / "alpha"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text("---\nname: alpha\ndescription: A\n---\n")
+        (skill / "ref.txt").write_text("v1")
+        _git(origin, "init", "-q")
+        _git(origin, "add", "-A")
+        _git(origin, "commit", "-q", "-m", "v1")
+        commit = _git(origin, "rev-parse", "HEAD")
+
+        # Advance origin so the pinned commit is no longer HEAD.
+        (skill / "ref.txt").write_text("v2")
+        _git(origin, "commit", "-q", "-am", "v2")
+
+        cache = tmp_path / "cache"
+        _git(tmp_path, "clone", "-q", str(origin), str(cache))
+
+        project = tmp_path / "project"
+        project.mkdir()
+        monkeypatch.chdir(project)
+        target_dir = project / ".agents" / "skills"
+        monkeypatch.setattr("openskills.installer.get_skills_dir", lambda global_install=False: str(target_dir))
+        monkeypatch.setattr("openskills.installer.get_cache_path", lambda url: str(cache))
+
+        expected = tmp_path / "expected"
+        expected.mkdir()
+        (expected / "SKILL.md").write_text("---\nname: alpha\ndescription: A\n---\n")
+        (expected / "ref.txt").write_text("v1")
+
+        write_lockfile([LockedSkill(
+            name="alpha", repo_url=str(origin), commit=commit,
+            subpath="skills/alpha", tree_hash=compute_tree_hash(str(expected))
+        )])
+        return target_dir
+
+    def test_installs_pinned_commit(self, tmp_path, monkeypatch, capsys):
+        from openskills.installer import install_from_lockfile
+        from openskills.models import InstallOptions
+        target_dir = self._setup(tmp_path, monkeypatch)
+
+        install_from_lockfile(InstallOptions(offline=True))
+
+        assert (target_dir / "alpha" / "ref.txt").read_text() == "v1"
+        assert (target_dir / "alpha" / ".openskills.json").exists()
+        assert "1 installed, 0 up to date" in capsys.readouterr().out
+        from openskills.hashing import verify_file_manifest
+        from openskills.metadata import read_skill_metadata
+        manifest = read_skill_metadata(str(target_dir / "alpha")).file_manifest
+        assert sorted(manifest) == ["SKILL.md", "ref.txt"]
+        assert verify_file_manifest(str(target_dir / "alpha"), manifest) == {"modified": [], "missing": [], "extra": []}
+
+    def test_matching_tree_is_skipped(self, tmp_path, monkeypatch, capsys):
+        from openskills.installer import install_from_lockfile
+        from openskills.models import InstallOptions
+        target_dir = self._setup(tmp_path, monkeypatch)
+
+        install_from_lockfile(InstallOptions(offline=True))
+        capsys.readouterr()
+        mock_run = MagicMock()
+        monkeypatch.setattr("openskills.installer.subprocess.run", mock_run)
+
+        install_from_lockfile(InstallOptions(offline=True))
+
+        mock_run.assert_not_called()
+        assert "0 installed, 1 up to date" in capsys.readouterr().out
+
+    @pytest.mark.parametrize("name, link", [("../evil", None), ("/abs/evil", None), ("link", "/etc/passwd")])
+    def test_export_without_data_filter_rejects_unsafe_members(self, tmp_path, monkeypatch, name, link):
+        import io
+        import tarfile
+        from openskills.installer import _export_commit
+
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            info = tarfile.TarInfo(name)
+            if link:
+                info.type = tarfile.SYMTYPE
+                info.linkname = link
+                tar.addfile(info)
+            else:
+                info.size = 4
+                tar.addfile(info, io.BytesIO(b"evil"))
+        monkeypatch.setattr("openskills.installer.subprocess.run", lambda *a, **k: MagicMock(stdout=buffer.getvalue()))
+        monkeypatch.delattr(tarfile, "data_filter", raising=False)
+        dest = tmp_path / "export" / "dest"
+        dest.mkdir(parents=True)
+
+        with pytest.raises(ValueError):
+            _export_commit(str(tmp_path), "abc", {""}, str(dest))
+
+        assert not (tmp_path / "export" / "evil").exists()
+        assert os.listdir(dest) == []
+
+    def test_missing_lockfile_exits(self, tmp_path, monkeypatch):
+        from openskills.installer import install_from_lockfile
+        from openskills.models import InstallOptions
+        monkeypatch.chdir(tmp_path)
+
+        with pytest.raises(SystemExit):
+            install_from_lockfile(InstallOptions())
+
+
+class TestCopySkillRecordsLock:
+    def test_project_git_install_is_locked(self, tmp_path, monkeypatch):
+        from openskills.installer import copy_skill
+        from openskills.lockfile import read_lockfile
+        from openskills.models import SkillSourceMetadata, SkillSourceType
+
+        monkeypatch.chdir(tmp_path)
+        skills_dir = tmp_path / ".agents" / "skills"
+        monkeypatch.setattr("openskills.lockfile.get_skills_dir", lambda global_install=False: str(skills_dir))
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "SKILL.md").write_text("---\nname: a\n---\n")
+        metadata = SkillSourceMetadata(
+            source="https://github.com/o/r/a", source_type=SkillSourceType.GIT,
+            repo_url="https://github.com/o/r", subpath="a"
+        )
+
+        copy_skill(str(source), str(skills_dir / "a"), metadata, "c" * 40)
+
+        entries = read_lockfile()
+        assert [(e.name, e.commit, e.subpath) for e in entries] == [("a", "c" * 40, "a")]
+        assert entries[0].tree_hash
+
+        from openskills.metadata import read_skill_metadata
+        assert read_skill_metadata(str(skills_dir / "a")).commit == "c" * 40
+
+    def test_global_install_is_not_locked(self, tmp_path, monkeypatch):
+        from openskills.installer import copy_skill
+        from openskills.models import SkillSourceMetadata, SkillSourceType
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("openskills.lockfile.get_skills_dir", lambda global_install=False: str(tmp_path / "project"))
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "SKILL.md").write_text("---\nname: a\n---\n")
+        metadata = SkillSourceMetadata(
+            source="https://github.com/o/r", source_type=SkillSourceType.GIT, repo_url="https://github.com/o/r"
+        )
+
+        copy_skill(str(source), str(tmp_path / "global" / "a"), metadata, "c" * 40)
+
+        assert not (tmp_path / "openskills.lock").exists()
+
+
+class TestInstallFromGit:
+    def test_commit_is_read_under_the_shared_cache_lock(self, tmp_path, monkeypatch):
+        import contextlib
+        from openskills.installer import _install_from_git
+        from openskills.models import InstallOptions
+
+        held = []
+
+        @contextlib.contextmanager
+        def fake_lock(path, shared=False):
+            held.append(shared)
+            yield True
+            held.pop()
+
+        def fake_commit(repo_dir):
+            assert held == [True]
+            return "c" * 40
+
+        installed = []
+        monkeypatch.setattr("openskills.installer.get_cached_repo", lambda url, offline=False: str(tmp_path))
+        monkeypatch.setattr("openskills.installer.cache_lock", fake_lock)
+        monkeypatch.setattr("openskills.installer.get_repo_commit", fake_commit)
+        monkeypatch.setattr("openskills.installer.install_from_repo",
+                            lambda repo_dir, target_dir, options, name, info: installed.append(info["commit"]))
+
+        _install_from_git("https://github.com/o/r", str(tmp_path / "skills"), True, InstallOptions())
+
+        assert installed == ["c" * 40]
+
+    def test_recommendations_run_after_the_cache_lock_is_released(self, tmp_path, monkeypatch):
+        import contextlib
+        from openskills.installer import _install_from_git
+        from openskills.models import InstallOptions
+
+        held = []
+
+        @contextlib.contextmanager
+        def fake_lock(path, shared=False):
+            held.append(shared)
+            yield True
+            held.pop()
+
+        skill_dir = str(tmp_path / "skills" / "a")
+        recommended = []
+        monkeypatch.setattr("openskills.installer.get_cached_repo", lambda url, offline=False: str(tmp_path))
+        monkeypatch.setattr("openskills.installer.cache_lock", fake_lock)
+        monkeypatch.setattr("openskills.installer.get_repo_commit", lambda repo_dir: None)
+        monkeypatch.setattr("openskills.installer.install_from_repo", lambda *args: skill_dir)
+        monkeypatch.setattr("openskills.installer._install_recommendations",
+                            lambda path, options: recommended.append((path, list(held))))
+
+        _install_from_git("https://github.com/o/r", str(tmp_path / "skills"), True, InstallOptions())
+
+        assert recommended == [(skill_dir, [])]
+
+
+class TestCopySkill:
+    def test_symlinked_directory_is_copied_and_hashed(self, tmp_path, monkeypatch):
+        from openskills.installer import copy_skill
+        from openskills.metadata import read_skill_metadata
+        from openskills.models import SkillSourceMetadata, SkillSourceType
+
+        monkeypatch.chdir(tmp_path)
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        (shared / "guide.md").write_text("guide")
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "SKILL.md").write_text("---\nname: a\n---\n")
+        os.symlink(shared, source / "refs")
+        target = tmp_path / "global" / "a"
+
+        copy_skill(str(source), str(target), SkillSourceMetadata(
+            source=str(source), source_type=SkillSourceType.LOCAL, local_path=str(source)
+        ))
+
+        assert (target / "refs" / "guide.md").read_text() == "guide"
+        assert sorted(read_skill_metadata(str(target)).file_manifest) == ["SKILL.md", "refs/guide.md"]
@@ -0,0 +1,62 @@
+import json
+
+from openskills.lockfile import (
+    LOCKFILE_VERSION,
+    is_project_target,
+    read_lockfile,
+    record_locked_skill,
+    remove_locked_skill,
+    write_lockfile,
+)
+from openskills.models import LockedSkill
+
+
+def _entry(name, commit="a" * 40):
+    return LockedSkill(name=name, repo_url="https://github.com/o/r", commit=commit, subpath=f"skills/{name}", tree_hash="f" * 64)
+
+
+class TestReadWriteLockfile:
+    def test_missing_file_is_empty(self, tmp_path):
+        assert read_lockfile(str(tmp_path / "openskills.lock")) == []
+
+    def test_round_trip_sorted_by_name(self, tmp_path):
+        path = str(tmp_path / "openskills.lock")
+        write_lockfile([_entry("b"), _entry("a")], path)
+
+        data = json.loads(open(path).read())
+        assert data["version"] == LOCKFILE_VERSION
+        assert [s["name"] for s in data["skills"]] == ["a", "b"]
+        assert read_lockfile(path) == [_entry("a"), _entry("b")]
+
+    def test_corrupt_file_is_empty(self, tmp_path):
+        path = tmp_path / "openskills.lock"
+        path.write_text("not json")
+        assert read_lockfile(str(path)) == []
+
+
+class TestRecordLockedSkill:
+    def test_replaces_existing_entry(self, tmp_path):
+        path = str(tmp_path / "openskills.lock")
+        record_locked_skill(_entry("a"), path)
+        record_locked_skill(_entry("a", commit="b" * 40), path)
+
+        entries = read_lockfile(path)
+        assert len(entries) == 1
+        assert entries[0].commit == "b" * 40
+
+    def test_remove_entry(self, tmp_path):
+        path = str(tmp_path / "openskills.lock")
+        write_lockfile([_entry("a"), _entry("b")], path)
+
+        assert remove_locked_skill("a", path) is True
+        assert [e.name for e in read_lockfile(path)] == ["b"]
+        assert remove_locked_skill("missing", path) is False
+
+
+class TestIsProjectTarget:
+    def test_project_and_global_targets(self, tmp_path, monkeypatch):
+        skills_dir = tmp_path / ".agents" / "skills"
+        monkeypatch.setattr("openskills.lockfile.get_skills_dir", lambda global_install=False: str(skills_dir))
+
+        assert is_project_target(str(skills_dir / "a")) is True
+        assert is_project_target(str(tmp_path / "elsewhere" / "a")) is False
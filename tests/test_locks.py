@@ -0,0 +1,72 @@
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from openskills import locks
+from openskills.locks import cache_lock, file_lock, get_target_lock_path, target_lock
+
+pytestmark = pytest.mark.skipif(locks.fcntl is None, reason="advisory locks require fcntl")
+
+
+def _try_in_thread(lock_path, shared=False):
+    result = {}
+
+    def worker():
+        with file_lock(lock_path, shared=shared, blocking=False) as acquired:
+            result['acquired'] = acquired
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    return result['acquired']
+
+
+class TestFileLock:
+    def test_exclusive_blocks_other_holders(self, tmp_path):
+        lock_path = str(tmp_path / "x.lock")
+        with file_lock(lock_path) as acquired:
+            assert acquired is True
+            assert _try_in_thread(lock_path) is False
+            assert _try_in_thread(lock_path, shared=True) is False
+        assert _try_in_thread(lock_path) is True
+
+    def test_shared_locks_coexist(self, tmp_path):
+        lock_path = str(tmp_path / "x.lock")
+        with file_lock(lock_path, shared=True):
+            assert _try_in_thread(lock_path, shared=True) is True
+            assert _try_in_thread(lock_path) is False
+
+    def test_reentrant_in_same_thread(self, tmp_path):
+        lock_path = str(tmp_path / "x.lock")
+        with file_lock(lock_path, shared=True):
+            with file_lock(lock_path) as nested:
+                assert nested is True
+            assert _try_in_thread(lock_path) is False
+        assert _try_in_thread(lock_path) is True
+
+    def test_non_blocking_probe_fails_for_own_lock(self, tmp_path):
+        lock_path = str(tmp_path / "x.lock")
+        with file_lock(lock_path):
+            with file_lock(lock_path, blocking=False) as nested:
+                assert nested is False
+
+
+class TestLockPaths:
+    def test_cache_lock_is_sidecar(self, tmp_path):
+        cache_path = tmp_path / "abc"
+        with cache_lock(str(cache_path)):
+            assert (tmp_path / "abc.lock").exists()
+
+    def test_target_lock_path_under_locks_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("pathlib.Path.home", lambda: Path(str(tmp_path)))
+        path = get_target_lock_path("/some/skills/pdf")
+        assert path.startswith(os.path.join(str(tmp_path), ".openskills", "locks"))
+        assert path == get_target_lock_path("/some/skills/pdf")
+        assert path != get_target_lock_path("/some/skills/docx")
+
+    def test_target_lock_excludes_other_threads(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("pathlib.Path.home", lambda: Path(str(tmp_path)))
+        with target_lock("/some/skills/pdf"):
+            assert _try_in_thread(get_target_lock_path("/some/skills/pdf")) is False
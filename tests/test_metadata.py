@@ -165,3 +165,77 @@ def test_recommends_roundtrip(tmp_path):
     assert len(result.recommends) == 2
     assert result.recommends[0].name == "brainstorming"
     assert result.recommends[1].source == "superpowers"
+
+
+def test_commit_roundtrip(tmp_path):
+    meta = SkillSourceMetadata(
+        source="https://github.com/example/repo",
+        source_type=SkillSourceType.GIT,
+        repo_url="https://github.com/example/repo",
+        commit="a" * 40,
+    )
+    write_skill_metadata(str(tmp_path), meta)
+    assert read_skill_metadata(str(tmp_path)).commit == "a" * 40
+
+
+def test_commit_omitted_when_unknown(tmp_path):
+    meta = SkillSourceMetadata(source="/src", source_type=SkillSourceType.LOCAL, local_path="/src")
+    write_skill_metadata(str(tmp_path), meta)
+    data = json.loads(tmp_path.joinpath(".openskills.json").read_text())
+    assert "commit" not in data
+
+
+def test_repeated_reads_parse_once(tmp_path, monkeypatch):
+    import openskills.metadata as metadata_module
+    write_skill_metadata(str(tmp_path), SkillSourceMetadata(source="s", source_type=SkillSourceType.LOCAL))
+    decodes = []
+    real_decode = metadata_module._decode_metadata
+    monkeypatch.setattr(metadata_module, "_decode_metadata", lambda p: decodes.append(p) or real_decode(p))
+
+    first = read_skill_metadata(str(tmp_path))
+    first.recommends = [SkillRecommendation(name="x", source="")]
+    second = read_skill_metadata(str(tmp_path))
+
+    assert len(decodes) == 1
+    assert second.recommends is None
+
+
+def test_write_invalidates_cached_read(tmp_path):
+    write_skill_metadata(str(tmp_path), SkillSourceMetadata(source="old", source_type=SkillSourceType.LOCAL))
+    assert read_skill_metadata(str(tmp_path)).source == "old"
+
+    # Same size and, on coarse clocks, possibly the same mtime.
+    write_skill_metadata(str(tmp_path), SkillSourceMetadata(source="new", source_type=SkillSourceType.LOCAL))
+    assert read_skill_metadata(str(tmp_path)).source == "new"
+
+
+def test_external_change_is_picked_up(tmp_path):
+    import os
+    write_skill_metadata(str(tmp_path), SkillSourceMetadata(source="old", source_type=SkillSourceType.LOCAL))
+    assert read_skill_metadata(str(tmp_path)).source == "old"
+
+    path = tmp_path / ".openskills.json"
+    path.write_text(json.dumps({"source": "edited", "source_type": "local"}))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert read_skill_metadata(str(tmp_path)).source == "edited"
+
+    path.unlink()
+    assert read_skill_metadata(str(tmp_path)) is None
+
+
+def test_read_during_write_does_not_leave_stale_cache(tmp_path, monkeypatch):
+    import os
+    write_skill_metadata(str(tmp_path), SkillSourceMetadata(source="old", source_type=SkillSourceType.LOCAL))
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # A reader racing the writer still sees the complete old file.
+        assert read_skill_metadata(str(tmp_path)).source == "old"
+        real_replace(src, dst)
+
+    monkeypatch.setattr("openskills.metadata.os.replace", replace)
+    write_skill_metadata(str(tmp_path), SkillSourceMetadata(source="new", source_type=SkillSourceType.LOCAL))
+
+    assert read_skill_metadata(str(tmp_path)).source == "new"
+    assert os.listdir(tmp_path) == [".openskills.json"]
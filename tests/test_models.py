@@ -93,6 +93,7 @@ def test_install_options_defaults():
     opts = InstallOptions()
     assert opts.global_install is False
     assert opts.yes is False
+    assert opts.offline is False
 
 
 def test_install_options_non_defaults():
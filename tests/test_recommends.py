@@ -2,6 +2,7 @@ import json
 import os
 
 import pytest
+from unittest.mock import patch
 
 from openskills.recommends import (
     resolve_recommendation_tree,
@@ -111,6 +112,59 @@ class TestResolveRecommendationTree:
         assert result["recs"][0]["recs"] == []
 
 
+class TestDiamondResolution:
+    def _diamond(self, tmp_path, monkeypatch):
+        # top -> left, right; left -> base; right -> base; base -> leaf (missing)
+        _create_skill(str(tmp_path), "top", recommends=[
+            SkillRecommendation(name="left", source="s"),
+            SkillRecommendation(name="right", source="s"),
+        ])
+        _create_skill(str(tmp_path), "left", recommends=[SkillRecommendation(name="base", source="from-left")])
+        _create_skill(str(tmp_path), "right", recommends=[SkillRecommendation(name="base", source="from-right")])
+        _create_skill(str(tmp_path), "base", recommends=[SkillRecommendation(name="leaf", source="s")])
+
+        calls = {"find": [], "meta": []}
+
+        def mock_find(name):
+            calls["find"].append(name)
+            p = str(tmp_path / name)
+            if os.path.exists(p):
+                import types
+                return types.SimpleNamespace(base_dir=p)
+            return None
+
+        def counting_read(skill_dir):
+            calls["meta"].append(os.path.basename(skill_dir))
+            return read_skill_metadata(skill_dir)
+
+        monkeypatch.setattr("openskills.recommends.find_skill", mock_find)
+        monkeypatch.setattr("openskills.recommends.read_skill_metadata", counting_read)
+        return calls
+
+    def test_shared_subtree_is_resolved_once(self, tmp_path, monkeypatch):
+        calls = self._diamond(tmp_path, monkeypatch)
+
+        tree = resolve_recommendation_tree(str(tmp_path / "top"))
+
+        left, right = tree["recs"]
+        assert left["recs"][0]["source"] == "from-left"
+        assert right["recs"][0]["source"] == "from-right"
+        assert left["recs"][0]["recs"] is right["recs"][0]["recs"]
+        assert left["recs"][0]["recs"][0] == {"name": "leaf", "recs": [], "source": "s"}
+        assert sorted(calls["meta"]) == ["base", "left", "right", "top"]
+        assert sorted(calls["find"]) == ["base", "leaf", "left", "right"]
+
+    def test_many_roots_share_one_resolution(self, tmp_path, monkeypatch):
+        from openskills.recommends import resolve_recommendation_trees
+        calls = self._diamond(tmp_path, monkeypatch)
+
+        trees = resolve_recommendation_trees([str(tmp_path / n) for n in ("base", "left", "right", "top")])
+
+        assert [t["name"] for t in trees] == ["base", "left", "right", "top"]
+        assert sorted(calls["meta"]) == ["base", "left", "right", "top"]
+        assert sorted(calls["find"]) == ["base", "leaf", "left", "right"]
+
+
 class TestCheckRecommendations:
     def test_all_satisfied(self, tmp_path, monkeypatch):
         _create_skill(str(tmp_path), "child", recommends=[
@@ -147,52 +201,80 @@ class TestCheckRecommendations:
 
 
 class TestGetRecommenders:
-    def test_no_recommenders(self, tmp_path, monkeypatch):
-        _create_skill(str(tmp_path), "solo")
+    @pytest.fixture(autouse=True)
+    def search_dirs(self, tmp_path, monkeypatch):
+        registry = tmp_path / "registry"
+        registry.mkdir()
+        skills = tmp_path / "skills"
+        skills.mkdir()
+        monkeypatch.setattr("openskills.registry.get_registry_dir", lambda: str(registry))
+        monkeypatch.setattr("openskills.recommends.get_search_dirs", lambda: [str(skills)])
+        return skills
+
+    def test_no_recommenders(self, search_dirs):
+        _create_skill(str(search_dirs), "solo")
 
-        import types
-        monkeypatch.setattr("openskills.recommends.find_all_skills", lambda: [
-            types.SimpleNamespace(name="solo", path=str(tmp_path / "solo")),
-        ])
         result = get_recommenders("target")
         assert result == []
 
-    def test_has_recommenders(self, tmp_path, monkeypatch):
-        _create_skill(str(tmp_path), "child", recommends=[
+    def test_has_recommenders(self, search_dirs):
+        _create_skill(str(search_dirs), "child", recommends=[
             SkillRecommendation(name="parent", source="test"),
         ])
-        _create_skill(str(tmp_path), "parent")
+        _create_skill(str(search_dirs), "parent")
 
-        import types
-        monkeypatch.setattr("openskills.recommends.find_all_skills", lambda: [
-            types.SimpleNamespace(name="child", path=str(tmp_path / "child"), location="project"),
-            types.SimpleNamespace(name="parent", path=str(tmp_path / "parent"), location="project"),
-        ])
         result = get_recommenders("parent")
         assert len(result) == 1
         assert result[0]["name"] == "child"
 
-    def test_multiple_recommenders(self, tmp_path, monkeypatch):
-        _create_skill(str(tmp_path), "child-a", recommends=[
+    def test_multiple_recommenders(self, search_dirs):
+        _create_skill(str(search_dirs), "child-a", recommends=[
             SkillRecommendation(name="parent", source="test"),
         ])
-        _create_skill(str(tmp_path), "child-b", recommends=[
+        _create_skill(str(search_dirs), "child-b", recommends=[
             SkillRecommendation(name="parent", source="test"),
         ])
-        _create_skill(str(tmp_path), "parent")
+        _create_skill(str(search_dirs), "parent")
 
-        import types
-        monkeypatch.setattr("openskills.recommends.find_all_skills", lambda: [
-            types.SimpleNamespace(name="child-a", path=str(tmp_path / "child-a"), location="project"),
-            types.SimpleNamespace(name="child-b", path=str(tmp_path / "child-b"), location="project"),
-            types.SimpleNamespace(name="parent", path=str(tmp_path / "parent"), location="project"),
-        ])
         result = get_recommenders("parent")
         assert len(result) == 2
         names = [d["name"] for d in result]
         assert "child-a" in names
         assert "child-b" in names
 
+    def test_lookup_uses_index_without_reading_metadata(self, search_dirs):
+        _create_skill(str(search_dirs), "child", recommends=[SkillRecommendation(name="parent", source="test")])
+        _create_skill(str(search_dirs), "parent")
+        past = os.stat(search_dirs).st_mtime - 60
+        # Freshly written files are re-read until their stats settle.
+        for path in search_dirs.glob("*/*"):
+            os.utime(path, (past, past))
+        os.utime(search_dirs, (past, past))
+        get_recommenders("parent")
+
+        with patch("openskills.registry.read_skill_metadata", side_effect=AssertionError("read")), \
+             patch("openskills.registry.os.scandir", side_effect=AssertionError("scanned")):
+            assert [d["name"] for d in get_recommenders("parent")] == ["child"]
+
+    def test_index_follows_add_recommendation(self, search_dirs):
+        _create_skill(str(search_dirs), "child")
+        _create_skill(str(search_dirs), "parent")
+        past = os.stat(search_dirs).st_mtime - 60
+        os.utime(search_dirs, (past, past))
+        assert get_recommenders("parent") == []
+
+        add_recommendation(str(search_dirs / "child"), SkillRecommendation(name="parent", source="test"))
+
+        assert [d["name"] for d in get_recommenders("parent")] == ["child"]
+
+    def test_earlier_directory_shadows_recommender(self, tmp_path, search_dirs, monkeypatch):
+        project = tmp_path / "project"
+        _create_skill(str(project), "child")
+        _create_skill(str(search_dirs), "child", recommends=[SkillRecommendation(name="parent", source="test")])
+        monkeypatch.setattr("openskills.recommends.get_search_dirs", lambda: [str(project), str(search_dirs)])
+
+        assert get_recommenders("parent") == []
+
 
 def _create_skill_without_metadata(base_dir, name):
     skill_dir = os.path.join(base_dir, name)
@@ -279,3 +361,106 @@ class TestAddRecommendation:
         assert metadata.repo_url == "https://github.com/test/repo"
         assert metadata.subpath == "skills/myskill"
         assert metadata.installed_at == "2024-01-01T00:00:00"
+
+
+class TestRecommendationGraph:
+    def _graph(self, edges, installed=None):
+        from openskills.models import RecommendationGraph
+        names = installed if installed is not None else list(edges)
+        return RecommendationGraph(
+            nodes={name: f"/skills/{name}" for name in names},
+            edges={name: [SkillRecommendation(name=r, source=f"src-{r}") for r in recs] for name, recs in edges.items()},
+        )
+
+    def test_build_reads_each_skill_once(self, tmp_path, monkeypatch):
+        import types
+        from openskills.recommends import build_recommendation_graph
+        _create_skill(str(tmp_path), "a", recommends=[SkillRecommendation(name="b", source="s")])
+        _create_skill(str(tmp_path), "b")
+        reads = []
+        monkeypatch.setattr("openskills.recommends.read_skill_metadata",
+                            lambda d: reads.append(d) or read_skill_metadata(d))
+        monkeypatch.setattr("openskills.recommends.find_skill", lambda n: pytest.fail("find_skill called"))
+
+        graph = build_recommendation_graph([
+            types.SimpleNamespace(name=n, path=str(tmp_path / n)) for n in ("a", "b")
+        ])
+
+        assert sorted(graph.nodes) == ["a", "b"]
+        assert [r.name for r in graph.edges["a"]] == ["b"]
+        assert len(reads) == 2
+
+    def test_find_cycles_reports_every_component(self):
+        from openskills.recommends import find_cycles
+        graph = self._graph({
+            "a": ["b"], "b": ["c"], "c": ["a"],
+            "d": ["d"],
+            "e": ["f"], "f": ["e", "a"],
+            "g": ["a", "missing"],
+        })
+        assert find_cycles(graph) == [["a", "b", "c"], ["d"], ["e", "f"]]
+
+    def test_find_cycles_handles_long_chains(self):
+        from openskills.recommends import find_cycles
+        edges = {f"s{i}": [f"s{i + 1}"] for i in range(5000)}
+        edges["s5000"] = []
+        assert find_cycles(self._graph(edges)) == []
+
+    def test_check_graph_splits_missing_and_satisfied(self):
+        from openskills.recommends import check_recommendation_graph
+        report = check_recommendation_graph(self._graph({"a": ["b", "gone"], "b": []}))
+        assert [r.name for r in report["missing"]["a"]] == ["gone"]
+        assert [r.name for r in report["satisfied"]["a"]] == ["b"]
+        assert report["cycles"] == []
+
+    def test_trees_mark_cycles_instead_of_raising(self):
+        from openskills.recommends import graph_recommendation_trees
+        graph = self._graph({"a": ["b"], "b": ["a", "c"], "c": []})
+
+        tree_a, tree_c = graph_recommendation_trees(graph, ["a", "c"])
+
+        b = tree_a["recs"][0]
+        assert b["name"] == "b"
+        assert b["recs"][0] == {"name": "a", "recs": [], "source": "src-a", "cycle": True}
+        assert b["recs"][1] == {"name": "c", "recs": [], "source": "src-c"}
+        assert tree_c == {"name": "c", "recs": []}
+
+    def test_dense_cycle_expands_each_skill_once(self):
+        from openskills.recommends import graph_recommendation_trees
+        names = [f"s{i}" for i in range(9)]
+        graph = self._graph({name: [other for other in names if other != name] for name in names})
+
+        def count(node):
+            return 1 + sum(count(rec) for rec in node["recs"])
+
+        trees = graph_recommendation_trees(graph, names)
+
+        # Root, the 8 expanded skills and one leaf for every other edge.
+        assert [count(tree) for tree in trees] == [1 + 9 * 8] * 9
+        expanded = []
+
+        def walk(node):
+            if node["recs"]:
+                expanded.append(node["name"])
+            for rec in node["recs"]:
+                walk(rec)
+
+        walk(trees[0])
+        assert sorted(expanded) == names
+        assert trees[0]["recs"][0]["recs"][0] == {"name": "s0", "recs": [], "source": "src-s0", "cycle": True}
+        assert trees[0]["recs"][1] == {"name": "s2", "recs": [], "source": "src-s2", "seen": True}
+
+    def test_export_deduplicates_nodes_and_edges(self):
+        from openskills.recommends import export_recommendation_graph
+        graph = self._graph({"a": ["b", "gone", "b"], "b": ["gone", "a"]})
+
+        data = export_recommendation_graph(graph)
+
+        assert [(n["name"], n["status"]) for n in data["nodes"]] == [
+            ("a", "installed"), ("b", "installed"), ("gone", "missing"),
+        ]
+        assert data["nodes"][2]["source"] == "src-gone"
+        assert [(e["from"], e["to"]) for e in data["edges"]] == [
+            ("a", "b"), ("a", "gone"), ("b", "gone"), ("b", "a"),
+        ]
+        assert data["cycles"] == [["a", "b"]]
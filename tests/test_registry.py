@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from openskills.registry import UNTRUSTED_KEY, get_registry_path, load_registry, read_registry, scan_directory
+
+
+@pytest.fixture(autouse=True)
+def registry_dir(tmp_path, monkeypatch):
+    path = tmp_path / "registry"
+    path.mkdir()
+    monkeypatch.setattr("openskills.registry.get_registry_dir", lambda: str(path))
+    return path
+
+
+def _age(path, seconds=60):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def _make_skill(parent, name, description="A skill"):
+    skill_dir = parent / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n")
+    _age(skill_dir / "SKILL.md")
+    return skill_dir
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    directory = tmp_path / "skills"
+    directory.mkdir()
+    _make_skill(directory, "alpha", "First")
+    _make_skill(directory, "beta", "Second")
+    (directory / "no-skill").mkdir()
+    _age(directory)
+    return directory
+
+
+class TestScanDirectory:
+    def test_lists_skills_and_records_registry(self, skills_dir):
+        assert scan_directory(str(skills_dir)) == [("alpha", "First"), ("beta", "Second")]
+        assert sorted(read_registry(str(skills_dir))["entries"]) == ["alpha", "beta", "no-skill"]
+
+    def test_unchanged_directory_reads_no_files(self, skills_dir):
+        scan_directory(str(skills_dir))
+
+        with patch("openskills.registry.read_skill_description", side_effect=AssertionError("read")), \
+             patch("openskills.registry.os.scandir", side_effect=AssertionError("scanned")):
+            assert scan_directory(str(skills_dir)) == [("alpha", "First"), ("beta", "Second")]
+
+    def test_changed_skill_is_reread(self, skills_dir):
+        scan_directory(str(skills_dir))
+        (skills_dir / "beta" / "SKILL.md").write_text("---\nname: beta\ndescription: Updated\n---\n")
+
+        assert scan_directory(str(skills_dir))[1] == ("beta", "Updated")
+
+    def test_added_and_removed_skills_are_picked_up(self, skills_dir):
+        import shutil
+        scan_directory(str(skills_dir))
+        shutil.rmtree(skills_dir / "alpha")
+        _make_skill(skills_dir, "gamma", "Third")
+
+        assert scan_directory(str(skills_dir)) == [("beta", "Second"), ("gamma", "Third")]
+
+    def test_skill_md_added_to_existing_dir(self, skills_dir):
+        scan_directory(str(skills_dir))
+        (skills_dir / "no-skill" / "SKILL.md").write_text("---\ndescription: Late\n---\n")
+
+        assert ("no-skill", "Late") in scan_directory(str(skills_dir))
+
+    def test_recent_stats_are_not_trusted(self, tmp_path):
+        directory = tmp_path / "fresh"
+        (directory / "alpha").mkdir(parents=True)
+        (directory / "alpha" / "SKILL.md").write_text("---\ndescription: Fresh\n---\n")
+
+        scan_directory(str(directory))
+
+        data = read_registry(str(directory))
+        assert data["mtime_ns"] is None
+        assert data["entries"]["alpha"]["skill"] == UNTRUSTED_KEY
+        assert scan_directory(str(directory)) == [("alpha", "Fresh")]
+
+    def test_corrupt_registry_is_ignored(self, skills_dir):
+        with open(get_registry_path(str(skills_dir)), "w") as f:
+            f.write("{not json")
+
+        assert scan_directory(str(skills_dir)) == [("alpha", "First"), ("beta", "Second")]
+
+    def test_missing_directory(self, tmp_path):
+        assert scan_directory(str(tmp_path / "missing")) == []
+
+
+class TestDiffSkillStats:
+    def test_only_changed_parts_are_reread(self, skills_dir):
+        from openskills.registry import diff_skill_stats, stat_key
+        now_ns = time.time_ns()
+        alpha = str(skills_dir / "alpha" / "SKILL.md")
+        previous = {"alpha": (stat_key(alpha), None), "beta": ([0, 0, 0], None)}
+
+        diff = {name: rest for name, *rest in diff_skill_stats(str(skills_dir), ["alpha", "beta", "no-skill"], previous, now_ns)}
+
+        assert diff["alpha"] == [stat_key(alpha), None, None, False]
+        assert diff["beta"][2:] == ["Second", False]
+        assert diff["no-skill"] == [None, None, None, False]
+
+
+class TestLoadRegistry:
+    def _write_recommends(self, skill_dir, names, age):
+        meta = skill_dir / ".openskills.json"
+        meta.write_text(json.dumps({
+            "source": "/local", "source_type": "local",
+            "recommends": [{"name": n, "source": ""} for n in names],
+        }))
+        _age(meta, age)
+
+    def test_in_place_metadata_edit_is_picked_up(self, skills_dir):
+        self._write_recommends(skills_dir / "alpha", ["beta"], 60)
+        _age(skills_dir)
+        assert load_registry(str(skills_dir))["recommenders"] == {"beta": ["alpha"]}
+
+        dir_mtime_ns = os.stat(skills_dir).st_mtime_ns
+        self._write_recommends(skills_dir / "alpha", ["gamma"], 30)
+        assert os.stat(skills_dir).st_mtime_ns == dir_mtime_ns
+
+        assert load_registry(str(skills_dir))["recommenders"] == {"gamma": ["alpha"]}
+
+    def test_unchanged_directory_reads_no_files(self, skills_dir):
+        self._write_recommends(skills_dir / "alpha", ["beta"], 60)
+        _age(skills_dir)
+        load_registry(str(skills_dir))
+
+        with patch("openskills.registry.read_skill_description", side_effect=AssertionError("read")), \
+             patch("openskills.registry.read_skill_metadata", side_effect=AssertionError("read")), \
+             patch("openskills.registry.os.scandir", side_effect=AssertionError("scanned")):
+            assert load_registry(str(skills_dir))["recommenders"] == {"beta": ["alpha"]}
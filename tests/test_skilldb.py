@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from openskills.metadata import write_skill_metadata
+from openskills.models import SkillRecommendation, SkillSourceMetadata, SkillSourceType
+from openskills.skilldb import (
+    SKILL_DB_ENV,
+    find_indexed_recommenders,
+    forget_indexed_skill,
+    get_skill_db_path,
+    list_indexed_skills,
+    read_indexed_metadata,
+)
+
+
+@pytest.fixture(autouse=True)
+def enabled(tmp_path, monkeypatch):
+    registry = tmp_path / "registry"
+    registry.mkdir()
+    monkeypatch.setattr("openskills.registry.get_registry_dir", lambda: str(registry))
+    monkeypatch.setenv(SKILL_DB_ENV, "1")
+
+
+def _age(path, seconds=60):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def _make_skill(parent, name, description="A skill", recommends=None):
+    skill_dir = parent / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {description}\n---\n")
+    _age(skill_dir / "SKILL.md")
+    write_skill_metadata(str(skill_dir), SkillSourceMetadata(
+        source="https://github.com/owner/repo",
+        source_type=SkillSourceType.GIT,
+        repo_url="https://github.com/owner/repo",
+        subpath=f"skills/{name}",
+        recommends=[SkillRecommendation(name=r, source=f"src-{r}") for r in recommends] if recommends else None,
+    ))
+    _age(skill_dir / ".openskills.json")
+    return skill_dir
+
+
+@pytest.fixture
+def skills_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "skills"
+    directory.mkdir()
+    monkeypatch.setattr("openskills.skilldb.get_skills_dir", lambda global_install=False: str(
+        tmp_path / "global" if global_install else directory
+    ))
+    _make_skill(directory, "alpha", "First", recommends=["beta", "gone"])
+    _make_skill(directory, "beta", "Second")
+    (directory / "no-skill").mkdir()
+    return directory
+
+
+class TestListIndexedSkills:
+    def test_lists_skills_and_creates_index(self, skills_dir):
+        assert list_indexed_skills(str(skills_dir)) == [("alpha", "First"), ("beta", "Second")]
+        assert os.path.exists(get_skill_db_path(str(skills_dir)))
+
+    def test_disabled_returns_none(self, skills_dir, monkeypatch):
+        monkeypatch.delenv(SKILL_DB_ENV)
+        assert list_indexed_skills(str(skills_dir)) is None
+        assert not os.path.exists(get_skill_db_path(str(skills_dir)))
+
+    def test_unchanged_directory_reads_no_files(self, skills_dir):
+        list_indexed_skills(str(skills_dir))
+        _age(skills_dir)
+        list_indexed_skills(str(skills_dir))
+
+        with patch("openskills.registry.read_skill_description", side_effect=AssertionError("read")), \
+             patch("openskills.skilldb.read_skill_metadata", side_effect=AssertionError("read")), \
+             patch("openskills.skilldb.list_skill_dirs", side_effect=AssertionError("scanned")):
+            assert list_indexed_skills(str(skills_dir)) == [("alpha", "First"), ("beta", "Second")]
+
+    def test_changes_on_disk_are_picked_up(self, skills_dir):
+        list_indexed_skills(str(skills_dir))
+        (skills_dir / "beta" / "SKILL.md").write_text("---\nname: beta\ndescription: Updated\n---\n")
+        _make_skill(skills_dir, "gamma", "Third")
+        (skills_dir / "no-skill" / "SKILL.md").write_text("---\ndescription: Late\n---\n")
+
+        assert list_indexed_skills(str(skills_dir)) == [
+            ("alpha", "First"), ("beta", "Updated"), ("gamma", "Third"), ("no-skill", "Late"),
+        ]
+
+    def test_only_queried_columns_are_indexed(self, skills_dir):
+        list_indexed_skills(str(skills_dir))
+        with sqlite3.connect(get_skill_db_path(str(skills_dir))) as conn:
+            indexes = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL ORDER BY name"
+            ).fetchall()
+        assert indexes == [("recommends_name",)]
+
+    def test_unmanaged_directory_gets_no_index(self, skills_dir, tmp_path):
+        other = tmp_path / ".claude" / "skills"
+        _make_skill(other, "alpha")
+
+        assert list_indexed_skills(str(other)) is None
+        assert read_indexed_metadata([str(other / "alpha")]) == {}
+        assert not os.path.exists(get_skill_db_path(str(other)))
+
+    def test_corrupt_index_is_rebuilt(self, skills_dir):
+        with open(get_skill_db_path(str(skills_dir)), "wb") as f:
+            f.write(b"not a database" * 100)
+
+        assert list_indexed_skills(str(skills_dir)) == [("alpha", "First"), ("beta", "Second")]
+
+
+class TestIndexedMetadata:
+    def test_mirrors_metadata_and_recommendations(self, skills_dir):
+        paths = [str(skills_dir / "alpha"), str(skills_dir / "beta"), str(skills_dir / "missing")]
+
+        indexed = read_indexed_metadata(paths)
+
+        assert sorted(indexed) == paths[:2]
+        alpha = indexed[paths[0]]
+        assert alpha.repo_url == "https://github.com/owner/repo"
+        assert alpha.subpath == "skills/alpha"
+        assert [(r.name, r.source) for r in alpha.recommends] == [("beta", "src-beta"), ("gone", "src-gone")]
+        assert indexed[paths[1]].recommends is None
+
+    def test_metadata_writes_update_index(self, skills_dir):
+        list_indexed_skills(str(skills_dir))
+        _age(skills_dir)
+        list_indexed_skills(str(skills_dir))
+
+        write_skill_metadata(str(skills_dir / "beta"), SkillSourceMetadata(
+            source="/local/beta",
+            source_type=SkillSourceType.LOCAL,
+            recommends=[SkillRecommendation(name="alpha", source="")],
+        ))
+
+        with sqlite3.connect(get_skill_db_path(str(skills_dir))) as conn:
+            row = conn.execute("SELECT source, source_type FROM skills WHERE name = 'beta'").fetchone()
+            recs = conn.execute("SELECT name FROM recommends WHERE skill = 'beta'").fetchall()
+        assert row == ("/local/beta", "local")
+        assert recs == [("alpha",)]
+        assert find_indexed_recommenders(str(skills_dir), "alpha")[0] == ["beta"]
+
+    def test_recommenders_query(self, skills_dir):
+        assert find_indexed_recommenders(str(skills_dir), "gone") == (["alpha"], {"alpha", "beta"})
+        assert find_indexed_recommenders(str(skills_dir), "alpha") == ([], {"alpha", "beta"})
+
+    def test_forget_removes_rows(self, skills_dir):
+        list_indexed_skills(str(skills_dir))
+        forget_indexed_skill(str(skills_dir / "alpha"))
+
+        with sqlite3.connect(get_skill_db_path(str(skills_dir))) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM skills WHERE name = 'alpha'").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM recommends WHERE skill = 'alpha'").fetchone()[0] == 0
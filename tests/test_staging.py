@@ -0,0 +1,268 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from openskills.metadata import read_skill_metadata
+from openskills.models import SkillSourceMetadata, SkillSourceType
+from openskills.staging import (
+    STAGING_PREFIX,
+    TRASH_PREFIX,
+    commit_staged,
+    delta_bytes,
+    discard_staged,
+    install_tree,
+    is_staging_name,
+    stage_delta_tree,
+    stage_tree,
+    swap_into_place,
+)
+
+
+def _make_source(parent, name="src", body="v2"):
+    src = parent / name
+    src.mkdir()
+    (src / "SKILL.md").write_text(f"---\nname: x\n---\n{body}\n", encoding="utf-8")
+    return src
+
+
+def _wait_for_discards():
+    for t in threading.enumerate():
+        if t.name == 'openskills-discard':
+            t.join()
+
+
+def _meta():
+    return SkillSourceMetadata(source="s", source_type=SkillSourceType.LOCAL, local_path="/x")
+
+
+class TestIsStagingName:
+    def test_recognizes_prefixes(self):
+        assert is_staging_name(f"{STAGING_PREFIX}pdf-abc") is True
+        assert is_staging_name(f"{TRASH_PREFIX}pdf-abc") is True
+        assert is_staging_name("pdf") is False
+
+
+class TestInstallTree:
+    def test_fresh_install_writes_metadata(self, tmp_path):
+        src = _make_source(tmp_path)
+        target = tmp_path / "skills" / "x"
+
+        install_tree(str(src), str(target), _meta())
+
+        assert (target / "SKILL.md").read_text(encoding="utf-8").endswith("v2\n")
+        assert read_skill_metadata(str(target)).local_path == "/x"
+        assert os.listdir(tmp_path / "skills") == ["x"]
+
+    def test_replaces_existing_and_discards_old_tree(self, tmp_path):
+        src = _make_source(tmp_path)
+        skills = tmp_path / "skills"
+        target = skills / "x"
+        target.mkdir(parents=True)
+        (target / "stale.txt").write_text("old")
+
+        install_tree(str(src), str(target))
+        _wait_for_discards()
+
+        assert not (target / "stale.txt").exists()
+        assert os.listdir(skills) == ["x"]
+
+    def test_failed_copy_leaves_target_untouched(self, tmp_path):
+        src = _make_source(tmp_path)
+        skills = tmp_path / "skills"
+        target = skills / "x"
+        target.mkdir(parents=True)
+        (target / "SKILL.md").write_text("old")
+
+        with patch("openskills.staging.shutil.copytree", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                install_tree(str(src), str(target))
+
+        assert (target / "SKILL.md").read_text() == "old"
+        assert os.listdir(skills) == ["x"]
+
+    def test_preserve_metadata_keeps_local_file(self, tmp_path):
+        src = _make_source(tmp_path)
+        target = tmp_path / "skills" / "x"
+        target.mkdir(parents=True)
+        (target / ".openskills.json").write_text('{"source": "keep", "source_type": "local"}')
+
+        install_tree(str(src), str(target), preserve_metadata=True)
+
+        assert read_skill_metadata(str(target)).source == "keep"
+
+    def test_source_metadata_wins_when_present(self, tmp_path):
+        src = _make_source(tmp_path)
+        (src / ".openskills.json").write_text('{"source": "from-source", "source_type": "git"}')
+        target = tmp_path / "skills" / "x"
+        target.mkdir(parents=True)
+        (target / ".openskills.json").write_text('{"source": "keep", "source_type": "local"}')
+
+        install_tree(str(src), str(target), preserve_metadata=True)
+
+        assert read_skill_metadata(str(target)).source == "from-source"
+
+
+class TestSwapIntoPlace:
+    def test_failed_swap_restores_previous_tree(self, tmp_path):
+        src = _make_source(tmp_path)
+        target = tmp_path / "skills" / "x"
+        target.mkdir(parents=True)
+        (target / "SKILL.md").write_text("old")
+        staged = stage_tree(str(src), str(target))
+
+        real_rename = os.rename
+
+        def flaky_rename(a, b):
+            if a == staged:
+                raise OSError("boom")
+            return real_rename(a, b)
+
+        with patch("openskills.staging.os.rename", side_effect=flaky_rename):
+            with pytest.raises(OSError):
+                swap_into_place(staged, str(target))
+
+        assert (target / "SKILL.md").read_text() == "old"
+
+
+class TestStageDeltaTree:
+    def _installed(self, tmp_path):
+        src = _make_source(tmp_path)
+        (src / "refs").mkdir()
+        (src / "refs" / "a.md").write_text("a")
+        target = tmp_path / "skills" / "x"
+        install_tree(str(src), str(target))
+        return src, target
+
+    def _apply(self, src, target, **kwargs):
+        staged = stage_delta_tree(str(src), str(target), **kwargs)
+        commit_staged([(staged, str(target))])
+
+    def test_unchanged_files_are_hard_linked(self, tmp_path):
+        src, target = self._installed(tmp_path)
+        untouched_inode = os.stat(target / "refs" / "a.md").st_ino
+
+        (src / "SKILL.md").write_text("---\nname: x\n---\nv3\n")
+        self._apply(src, target)
+
+        assert "v3" in (target / "SKILL.md").read_text()
+        assert os.stat(target / "refs" / "a.md").st_ino == untouched_inode
+
+    def test_file_manifest_is_stamped_from_installed_files(self, tmp_path):
+        from openskills.hashing import build_file_manifest, hash_tree
+        src, target = self._installed(tmp_path)
+        # Same content, newer mtime in the source: the installed file is linked.
+        os.utime(src / "refs" / "a.md", ns=(0, os.stat(target / "refs" / "a.md").st_mtime_ns + 10**9))
+        metadata = SkillSourceMetadata(source=str(src), source_type=SkillSourceType.LOCAL)
+        metadata.file_manifest = build_file_manifest(str(src), hash_tree(str(src)))
+
+        self._apply(src, target, metadata=metadata)
+
+        recorded = read_skill_metadata(str(target)).file_manifest["refs/a.md"]
+        st = os.stat(target / "refs" / "a.md")
+        assert recorded[1:] == [st.st_size, st.st_mtime_ns]
+        assert recorded[2] != os.stat(src / "refs" / "a.md").st_mtime_ns
+
+    def test_delta_bytes_counts_only_changed_files(self, tmp_path):
+        src, target = self._installed(tmp_path)
+        assert delta_bytes(str(src), str(target)) == 0
+
+        (src / "refs" / "b.md").write_text("bbbb")
+        assert delta_bytes(str(src), str(target)) == 4
+
+    def test_removed_files_and_dirs_are_deleted(self, tmp_path):
+        import shutil
+        src, target = self._installed(tmp_path)
+        shutil.rmtree(src / "refs")
+
+        self._apply(src, target)
+
+        assert not (target / "refs").exists()
+        assert (target / "SKILL.md").exists()
+
+    def test_preserves_local_metadata_when_source_has_none(self, tmp_path):
+        src, target = self._installed(tmp_path)
+        (target / ".openskills.json").write_text('{"source": "keep", "source_type": "local"}')
+
+        self._apply(src, target, preserve_metadata=True)
+        assert read_skill_metadata(str(target)).source == "keep"
+
+        self._apply(src, target)
+        assert not (target / ".openskills.json").exists()
+
+    def test_file_replaced_by_directory(self, tmp_path):
+        src, target = self._installed(tmp_path)
+        (src / "extra").write_text("file")
+        self._apply(src, target)
+
+        (src / "extra").unlink()
+        (src / "extra").mkdir()
+        (src / "extra" / "inner.md").write_text("inner")
+        self._apply(src, target)
+
+        assert (target / "extra" / "inner.md").read_text() == "inner"
+
+    def test_directory_modes_follow_the_source(self, tmp_path):
+        import stat
+        src, target = self._installed(tmp_path)
+        os.chmod(src, 0o755)
+        os.chmod(src / "refs", 0o750)
+
+        self._apply(src, target)
+
+        assert stat.S_IMODE(os.stat(target).st_mode) == 0o755
+        assert stat.S_IMODE(os.stat(target / "refs").st_mode) == 0o750
+
+    def test_symlinked_directory_contents_are_staged(self, tmp_path):
+        src, target = self._installed(tmp_path)
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        (shared / "guide.md").write_text("guide")
+        os.symlink(shared, src / "linked")
+        install_tree(str(src), str(target))
+        assert (target / "linked" / "guide.md").exists()
+
+        (src / "SKILL.md").write_text("---\nname: x\n---\nv3\n")
+        self._apply(src, target)
+
+        assert (target / "linked" / "guide.md").read_text() == "guide"
+
+
+class TestCommitStaged:
+    def test_failed_swap_restores_every_target(self, tmp_path):
+        targets = []
+        pairs = []
+        for name in ("a", "b", "c"):
+            target = tmp_path / "skills" / name
+            install_tree(str(_make_source(tmp_path, f"src-{name}", body="v1")), str(target))
+            staged = stage_delta_tree(str(_make_source(tmp_path, f"new-{name}", body="v2")), str(target))
+            targets.append(target)
+            pairs.append((staged, str(target)))
+
+        real_swap = swap_into_place
+        calls = []
+
+        def flaky_swap(staged, target_path):
+            calls.append(target_path)
+            if len(calls) == 2:
+                raise OSError("rename failed")
+            return real_swap(staged, target_path)
+
+        with patch("openskills.staging.swap_into_place", side_effect=flaky_swap):
+            with pytest.raises(OSError):
+                commit_staged(pairs)
+
+        for target in targets:
+            assert "v1" in (target / "SKILL.md").read_text()
+        assert not [n for n in os.listdir(tmp_path / "skills") if n.startswith(STAGING_PREFIX)]
+
+    def test_discard_staged_leaves_targets_untouched(self, tmp_path):
+        target = tmp_path / "skills" / "x"
+        install_tree(str(_make_source(tmp_path, body="v1")), str(target))
+        staged = stage_delta_tree(str(_make_source(tmp_path, "new", body="v2")), str(target))
+
+        discard_staged([(staged, str(target))])
+
+        assert not os.path.exists(staged)
+        assert "v1" in (target / "SKILL.md").read_text()
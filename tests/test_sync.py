@@ -0,0 +1,218 @@
+import os
+
+import pytest
+
+from openskills.metadata import read_skill_metadata
+from openskills.models import ManifestEntry
+from openskills.sync import apply_sync, load_manifest, plan_sync, sync_skills
+
+
+def _make_skill(root, name, body="v1"):
+    skill = root / name
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: {body}\n---\n")
+    return skill
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    monkeypatch.setattr("openskills.sync.get_skills_dir", lambda global_install=False: str(
+        tmp_path / "home" / ".agents/skills" if global_install else project / ".agents/skills"
+    ))
+    monkeypatch.setattr("openskills.lockfile.get_skills_dir", lambda global_install=False: str(project / ".agents/skills"))
+    return project
+
+
+class TestLoadManifest:
+    def test_entries_and_defaults(self, tmp_path):
+        path = tmp_path / "skills.yaml"
+        path.write_text(
+            "skills:\n"
+            "  - source: https://github.com/o/r\n"
+            "    names: [a, b]\n"
+            "    global: true\n"
+            "  - ./local\n"
+        )
+        assert load_manifest(str(path)) == [
+            ManifestEntry(source="https://github.com/o/r", names=["a", "b"], global_install=True),
+            ManifestEntry(source="./local"),
+        ]
+
+    def test_missing_source_is_rejected(self, tmp_path):
+        path = tmp_path / "skills.yaml"
+        path.write_text("skills:\n  - names: [a]\n")
+        with pytest.raises(ValueError):
+            load_manifest(str(path))
+
+
+class TestPlanSync:
+    def test_installs_missing_local_skills(self, tmp_path, project):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+        _make_skill(source, "beta")
+
+        actions, in_sync, errors = plan_sync([ManifestEntry(source=str(source), names=["alpha"])])
+
+        assert errors == []
+        assert in_sync == 0
+        assert [(a.action, a.name) for a in actions] == [("install", "alpha")]
+
+    def test_converged_project_is_noop(self, tmp_path, project):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+        entries = [ManifestEntry(source=str(source))]
+
+        apply_sync(plan_sync(entries)[0])
+        actions, in_sync, errors = plan_sync(entries)
+
+        assert actions == []
+        assert in_sync == 1
+
+    def test_changed_local_source_is_updated(self, tmp_path, project):
+        source = tmp_path / "src"
+        skill = _make_skill(source, "alpha")
+        entries = [ManifestEntry(source=str(source))]
+        apply_sync(plan_sync(entries)[0])
+
+        (skill / "extra.md").write_text("new")
+        actions, _, _ = plan_sync(entries)
+
+        assert [(a.action, a.name) for a in actions] == [("update", "alpha")]
+
+    def test_undeclared_managed_skill_is_removed(self, tmp_path, project):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+        _make_skill(source, "beta")
+        apply_sync(plan_sync([ManifestEntry(source=str(source))])[0])
+        _make_skill(project / ".agents/skills", "handmade")
+
+        actions, in_sync, _ = plan_sync([ManifestEntry(source=str(source), names=["alpha"])])
+
+        # Skills without .openskills.json were not installed by openskills and are left alone.
+        assert [(a.action, a.name) for a in actions] == [("remove", "beta")]
+        assert in_sync == 1
+
+    def test_unknown_local_name_is_an_error(self, tmp_path, project):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+
+        actions, _, errors = plan_sync([ManifestEntry(source=str(source), names=["missing"])])
+
+        assert actions == []
+        assert errors and "missing" in errors[0]
+
+    def _git_skill(self, project, commit):
+        from openskills.metadata import write_skill_metadata
+        from openskills.models import SkillSourceMetadata, SkillSourceType
+        skill = _make_skill(project / ".agents/skills", "alpha")
+        write_skill_metadata(str(skill), SkillSourceMetadata(
+            source="https://github.com/o/r", source_type=SkillSourceType.GIT,
+            repo_url="https://github.com/o/r", subpath="skills/alpha", commit=commit
+        ))
+
+    def test_git_names_match_installed_metadata_without_fetch(self, tmp_path, project, monkeypatch):
+        self._git_skill(project, "1" * 40)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("network access")
+        monkeypatch.setattr("openskills.sync.get_cached_repo", fail)
+        heads = []
+        monkeypatch.setattr("openskills.sync.get_remote_head", lambda url: heads.append(url) or ("1" * 40, ""))
+
+        actions, in_sync, errors = plan_sync([ManifestEntry(source="https://github.com/o/r", names=["alpha"])])
+
+        assert (actions, in_sync, errors) == ([], 1, [])
+        assert heads == ["https://github.com/o/r"]
+
+    def test_git_skill_behind_remote_head_is_updated(self, tmp_path, project, monkeypatch):
+        self._git_skill(project, "1" * 40)
+        monkeypatch.setattr("openskills.sync.get_remote_head", lambda url: ("2" * 40, ""))
+
+        actions, in_sync, _ = plan_sync([ManifestEntry(source="https://github.com/o/r", names=["alpha"])])
+
+        assert [(a.name, a.action) for a in actions] == [("alpha", "update")]
+        assert in_sync == 0
+
+    def test_offline_compares_against_cached_commit(self, tmp_path, project, monkeypatch):
+        self._git_skill(project, "1" * 40)
+        cache_path = tmp_path / "cache"
+        cache_path.mkdir()
+        monkeypatch.setattr("openskills.sync.get_cache_path", lambda url: str(cache_path))
+        monkeypatch.setattr("openskills.sync.get_repo_commit", lambda repo_dir: "2" * 40)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("network access")
+        monkeypatch.setattr("openskills.sync.get_remote_head", fail)
+
+        actions, _, _ = plan_sync([ManifestEntry(source="https://github.com/o/r", names=["alpha"])], offline=True)
+
+        assert [(a.name, a.action) for a in actions] == [("alpha", "update")]
+
+
+class TestApplySync:
+    def test_git_repo_fetched_once_for_many_skills(self, tmp_path, project, monkeypatch):
+        repo = tmp_path / "repo"
+        _make_skill(repo / "skills", "alpha")
+        _make_skill(repo / "skills", "beta")
+        calls = []
+
+        def fake_cached_repo(repo_url, offline=False):
+            calls.append(repo_url)
+            return str(repo)
+        monkeypatch.setattr("openskills.sync.get_cached_repo", fake_cached_repo)
+        monkeypatch.setattr("openskills.sync.get_repo_commit", lambda repo_dir: None)
+
+        actions, _, _ = plan_sync([ManifestEntry(source="https://github.com/o/r", names=["alpha", "beta"])])
+        results = apply_sync(actions)
+
+        assert calls == ["https://github.com/o/r"]
+        assert all(error is None for error in results.values())
+        metadata = read_skill_metadata(str(project / ".agents/skills/beta"))
+        assert metadata.repo_url == "https://github.com/o/r"
+        assert metadata.subpath == "skills/beta"
+
+    def test_removal_forgets_indexed_skill(self, tmp_path, project, monkeypatch):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+        apply_sync(plan_sync([ManifestEntry(source=str(source))])[0])
+        forgotten = []
+        monkeypatch.setattr("openskills.sync.forget_indexed_skill", forgotten.append)
+
+        apply_sync(plan_sync([])[0])
+
+        target = str(project / ".agents/skills/alpha")
+        assert not os.path.exists(target)
+        assert forgotten == [target]
+
+
+class TestSyncSkills:
+    def test_missing_manifest_exits(self, tmp_path, project):
+        with pytest.raises(SystemExit):
+            sync_skills(str(tmp_path / "skills.yaml"))
+
+    def test_dry_run_changes_nothing(self, tmp_path, project, capsys):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+        manifest = project / "skills.yaml"
+        manifest.write_text(f"skills:\n  - source: {source}\n")
+
+        sync_skills(str(manifest), dry_run=True)
+
+        assert "alpha" in capsys.readouterr().out
+        assert not os.path.exists(project / ".agents/skills/alpha")
+
+    def test_sync_then_noop(self, tmp_path, project, capsys):
+        source = tmp_path / "src"
+        _make_skill(source, "alpha")
+        manifest = project / "skills.yaml"
+        manifest.write_text(f"skills:\n  - source: {source}\n")
+
+        sync_skills(str(manifest), yes=True)
+        assert (project / ".agents/skills/alpha/SKILL.md").exists()
+        capsys.readouterr()
+
+        sync_skills(str(manifest), yes=True)
+        assert "Already in sync: 1 skill(s)" in capsys.readouterr().out
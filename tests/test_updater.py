@@ -5,7 +5,7 @@ from unittest.mock import patch
 import click
 import pytest
 
-from openskills.models import Skill, SkillLocation, SkillSourceMetadata, SkillSourceType
+from openskills.models import Skill, SkillLocation, SkillSourceMetadata, SkillSourceType, UpdateStatus
 from openskills.updater import (
     _is_path_inside,
     _is_local_path,
@@ -100,7 +100,7 @@ class TestUpdateSkillsFiltering:
         output = capsys.readouterr().out
         assert "Skipping missing skills: ghost" in output
 
-    @patch("openskills.updater._update_skill_from_local", return_value=(True, ""))
+    @patch("openskills.updater._update_skill_from_local", return_value=(UpdateStatus.UPDATED, ""))
     @patch("openskills.updater.read_skill_metadata", return_value=_make_local_meta())
     def test_filters_to_requested_skills(self, _mock_meta, _mock_update, capsys):
         skill_a = _make_skill("alpha")
@@ -127,7 +127,7 @@ class TestUpdateSkillsNoMetadata:
 
 
 class TestUpdateSkillsLocal:
-    @patch("openskills.updater._update_skill_from_local", return_value=(True, ""))
+    @patch("openskills.updater._update_skill_from_local", return_value=(UpdateStatus.UPDATED, ""))
     @patch("openskills.updater.read_skill_metadata", return_value=_make_local_meta())
     def test_updates_local_skill(self, _mock_meta, mock_update, capsys):
         skill = _make_skill("local-skill")
@@ -140,7 +140,7 @@ class TestUpdateSkillsLocal:
 
     @patch(
         "openskills.updater._update_skill_from_local",
-        return_value=(False, "Local source missing"),
+        return_value=(UpdateStatus.FAILED, "Local source missing"),
     )
     @patch("openskills.updater.read_skill_metadata", return_value=_make_local_meta())
     def test_handles_local_update_failure(self, _mock_meta, mock_update, capsys):
@@ -154,7 +154,7 @@ class TestUpdateSkillsLocal:
 
 
 class TestUpdateSkillsGit:
-    @patch("openskills.updater._update_skill_from_git", return_value=(True, ""))
+    @patch("openskills.updater._update_skill_from_git", return_value=(UpdateStatus.UPDATED, ""))
     @patch("openskills.updater.read_skill_metadata", return_value=_make_git_meta())
     def test_updates_git_skill(self, _mock_meta, mock_update, capsys):
         skill = _make_skill("git-skill")
@@ -165,7 +165,7 @@ class TestUpdateSkillsGit:
         assert "Updated: git-skill" in output
         mock_update.assert_called_once()
 
-    @patch("openskills.updater._update_skill_from_git", return_value=(True, ""))
+    @patch("openskills.updater._update_skill_from_git", return_value=(UpdateStatus.UPDATED, ""))
     @patch(
         "openskills.updater.read_skill_metadata",
         return_value=_make_git_meta(subpath="skills/sub"),
@@ -194,7 +194,7 @@ class TestUpdateSkillsGit:
 
     @patch(
         "openskills.updater._update_skill_from_git",
-        return_value=(False, "git clone failed: error"),
+        return_value=(UpdateStatus.FAILED, "git clone failed: error"),
     )
     @patch("openskills.updater.read_skill_metadata", return_value=_make_git_meta())
     def test_handles_git_clone_failure(self, _mock_meta, mock_update, capsys):
@@ -208,7 +208,7 @@ class TestUpdateSkillsGit:
 
 
 class TestUpdateSkillsSummary:
-    @patch("openskills.updater._update_skill_from_local", return_value=(True, ""))
+    @patch("openskills.updater._update_skill_from_local", return_value=(UpdateStatus.UPDATED, ""))
     @patch("openskills.updater.read_skill_metadata", return_value=_make_local_meta())
     def test_summary_shows_updated_count(self, _mock_meta, _mock_update, capsys):
         skill_a = _make_skill("a")
@@ -421,3 +421,301 @@ class TestUpdateSkillsPromptMetadata:
                 update_skills(None)
 
         assert mock_prompt.call_count == 2
+
+
+class TestUpdateSkillsGrouped:
+    def _repo(self, tmp_path, *names):
+        repo = tmp_path / "repo"
+        for name in names:
+            skill = repo / "skills" / name
+            skill.mkdir(parents=True)
+            (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: new\n---\n")
+        return repo
+
+    def test_fetches_each_repo_once(self, tmp_path, capsys):
+        repo = self._repo(tmp_path, "a", "b", "c")
+        skills = [_make_skill(n, str(tmp_path / "installed" / n)) for n in ("a", "b", "c")]
+        metas = {s.path: _make_git_meta(subpath=f"skills/{s.name}") for s in skills}
+
+        with patch("openskills.updater.find_all_skills", return_value=skills), \
+             patch("openskills.updater.read_skill_metadata", side_effect=lambda p: metas[p]), \
+             patch("openskills.updater._fetch_repo", return_value=(str(repo), "")) as mock_fetch:
+            update_skills(None)
+
+        mock_fetch.assert_called_once_with("https://github.com/example/repo")
+        assert (tmp_path / "installed" / "b" / "SKILL.md").exists()
+        assert "3 updated" in capsys.readouterr().out
+
+    def test_distinct_repos_each_fetched(self, tmp_path, capsys):
+        repo = self._repo(tmp_path, "a")
+        skills = [_make_skill("x", str(tmp_path / "installed" / "x")), _make_skill("y", str(tmp_path / "installed" / "y"))]
+        metas = {
+            skills[0].path: _make_git_meta(repo_url="https://github.com/o/one", subpath="skills/a"),
+            skills[1].path: _make_git_meta(repo_url="https://github.com/o/two", subpath="skills/a"),
+        }
+
+        with patch("openskills.updater.find_all_skills", return_value=skills), \
+             patch("openskills.updater.read_skill_metadata", side_effect=lambda p: metas[p]), \
+             patch("openskills.updater._fetch_repo", return_value=(str(repo), "")) as mock_fetch:
+            update_skills(None)
+
+        assert sorted(c.args[0] for c in mock_fetch.call_args_list) == ["https://github.com/o/one", "https://github.com/o/two"]
+        output = capsys.readouterr().out
+        assert output.index("Updated: x") < output.index("Updated: y")
+
+    def test_fetch_failure_is_a_clone_failure_for_every_skill(self, tmp_path, capsys):
+        skills = [_make_skill("a"), _make_skill("b")]
+
+        with patch("openskills.updater.find_all_skills", return_value=skills), \
+             patch("openskills.updater.read_skill_metadata", return_value=_make_git_meta()), \
+             patch("openskills.updater._fetch_repo", return_value=(None, "not found")) as mock_fetch:
+            update_skills(None)
+
+        mock_fetch.assert_called_once()
+        assert "Clone failed (2): a, b" in capsys.readouterr().out
+
+    def test_each_run_fetches_again(self, tmp_path):
+        repo = self._repo(tmp_path, "a")
+        skill = _make_skill("a", str(tmp_path / "installed" / "a"))
+
+        with patch("openskills.updater.find_all_skills", return_value=[skill]), \
+             patch("openskills.updater.read_skill_metadata", return_value=_make_git_meta(subpath="skills/a")), \
+             patch("openskills.updater._fetch_repo", return_value=(str(repo), "")) as mock_fetch:
+            update_skills(None)
+            update_skills(None)
+
+        assert mock_fetch.call_count == 2
+
+
+class TestFetchRepo:
+    def test_clones_then_refreshes_cache(self, tmp_path, monkeypatch):
+        import subprocess
+        from openskills.updater import _fetch_repo
+
+        def git(cwd, *args):
+            subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=cwd, check=True, capture_output=True)
+
+        origin = tmp_path / "origin"
+        origin.mkdir()
+        (origin / "SKILL.md").write_text("v1")
+        git(origin, "init", "-q")
+        git(origin, "add", "-A")
+        git(origin, "commit", "-q", "-m", "v1")
+
+        cache_path = tmp_path / "cache" / "key"
+        monkeypatch.setattr("openskills.updater.get_cache_path", lambda url: str(cache_path))
+        monkeypatch.setattr("openskills.cache.enforce_cache_budget", lambda path: [])
+
+        assert _fetch_repo(str(origin)) == (str(cache_path), "")
+        assert (cache_path / "SKILL.md").read_text() == "v1"
+
+        (origin / "SKILL.md").write_text("v2")
+        git(origin, "commit", "-q", "-am", "v2")
+
+        assert _fetch_repo(str(origin)) == (str(cache_path), "")
+        assert (cache_path / "SKILL.md").read_text() == "v2"
+
+
+class TestCheckUpdates:
+    def test_reports_behind_git_skills_with_one_ls_remote_per_repo(self, capsys):
+        from openskills.updater import check_updates
+        skills = [_make_skill("a"), _make_skill("b"), _make_skill("c")]
+        metas = {
+            skills[0].path: _make_git_meta(),
+            skills[1].path: _make_git_meta(),
+            skills[2].path: _make_git_meta(),
+        }
+        metas[skills[0].path].commit = "1" * 40
+        metas[skills[1].path].commit = "2" * 40
+
+        with patch("openskills.updater.find_all_skills", return_value=skills), \
+             patch("openskills.updater.read_skill_metadata", side_effect=lambda p: metas[p]), \
+             patch("openskills.updater.get_remote_head", return_value=("2" * 40, "")) as mock_ls:
+            check_updates(None)
+
+        mock_ls.assert_called_once_with("https://github.com/example/repo")
+        output = capsys.readouterr().out
+        assert "a" in output and "1111111 -> 2222222" in output
+        assert "installed commit not recorded" in output
+        assert "1 of 3 skill(s) can be updated" in output
+
+    def test_local_sources_compare_tree_hashes(self, tmp_path, capsys):
+        from openskills.updater import check_updates
+        source = tmp_path / "src"
+        installed = tmp_path / "installed"
+        for d in (source, installed):
+            d.mkdir()
+            (d / "SKILL.md").write_text("same")
+        skill = _make_skill("local", str(installed))
+
+        with patch("openskills.updater.find_all_skills", return_value=[skill]), \
+             patch("openskills.updater.read_skill_metadata", return_value=_make_local_meta(str(source))):
+            check_updates(None)
+            assert "up to date" in capsys.readouterr().out
+
+            (source / "SKILL.md").write_text("changed")
+            check_updates(None)
+            assert "local source changed" in capsys.readouterr().out
+
+    def test_ls_remote_failure_is_reported(self, capsys):
+        from openskills.updater import check_updates
+        meta = _make_git_meta()
+        meta.commit = "1" * 40
+
+        with patch("openskills.updater.find_all_skills", return_value=[_make_skill("a")]), \
+             patch("openskills.updater.read_skill_metadata", return_value=meta), \
+             patch("openskills.updater.get_remote_head", return_value=(None, "timed out")):
+            check_updates(None)
+
+        assert "timed out" in capsys.readouterr().out
+
+
+class TestUpdateFingerprints:
+    def _setup(self, tmp_path):
+        from openskills.hashing import compute_tree_hash
+        source = tmp_path / "src"
+        target = tmp_path / "installed" / "local"
+        for d in (source, target):
+            d.mkdir(parents=True)
+            (d / "SKILL.md").write_text("same")
+        meta = _make_local_meta(str(source))
+        meta.tree_hash = compute_tree_hash(str(source))
+        return source, target, meta
+
+    def test_matching_fingerprint_is_up_to_date(self, tmp_path, capsys):
+        source, target, meta = self._setup(tmp_path)
+        skill = _make_skill("local", str(target))
+
+        with patch("openskills.updater.find_all_skills", return_value=[skill]), \
+             patch("openskills.updater.read_skill_metadata", return_value=meta), \
+             patch("openskills.updater.stage_delta_tree") as mock_stage:
+            update_skills(None)
+
+        mock_stage.assert_not_called()
+        output = capsys.readouterr().out
+        assert "Up to date: local" in output
+        assert "0 updated, 1 up to date" in output
+
+    def test_changed_source_is_synced_and_fingerprint_recorded(self, tmp_path, capsys):
+        from openskills.hashing import compute_tree_hash
+        from openskills.metadata import read_skill_metadata
+        source, target, meta = self._setup(tmp_path)
+        (source / "SKILL.md").write_text("changed")
+        skill = _make_skill("local", str(target))
+
+        with patch("openskills.updater.find_all_skills", return_value=[skill]), \
+             patch("openskills.updater.read_skill_metadata", return_value=meta):
+            update_skills(None)
+
+        assert (target / "SKILL.md").read_text() == "changed"
+        assert read_skill_metadata(str(target)).tree_hash == compute_tree_hash(str(source))
+        assert "1 updated" in capsys.readouterr().out
+
+    def test_verify_repairs_locally_modified_skill(self, tmp_path, capsys):
+        source, target, meta = self._setup(tmp_path)
+        (target / "SKILL.md").write_text("tampered")
+        skill = _make_skill("local", str(target))
+
+        with patch("openskills.updater.find_all_skills", return_value=[skill]), \
+             patch("openskills.updater.read_skill_metadata", return_value=meta):
+            update_skills(None)
+            assert (target / "SKILL.md").read_text() == "tampered"
+
+            update_skills(None, verify=True)
+
+        assert (target / "SKILL.md").read_text() == "same"
+
+
+class TestLocalManifestFastPath:
+    def _installed(self, tmp_path):
+        from openskills.installer import copy_skill
+        from openskills.metadata import read_skill_metadata
+        source = tmp_path / "src"
+        source.mkdir()
+        (source / "SKILL.md").write_text("v1")
+        (source / "big.txt").write_text("x" * 4096)
+        target = tmp_path / "installed" / "local"
+        copy_skill(str(source), str(target), _make_local_meta(str(source)))
+        return source, target, read_skill_metadata(str(target))
+
+    def test_install_records_source_manifest(self, tmp_path):
+        _, _, meta = self._installed(tmp_path)
+        assert sorted(meta.source_manifest) == ["SKILL.md", "big.txt"]
+
+    def test_unchanged_source_reads_no_files(self, tmp_path):
+        from openskills.updater import _update_skill_from_local
+        source, target, meta = self._installed(tmp_path)
+
+        with patch("openskills.updater.compute_tree_hash", side_effect=AssertionError("hashed")), \
+             patch("openskills.updater.stage_delta_tree", side_effect=AssertionError("staged")):
+            assert _update_skill_from_local(str(target), meta, "local") == (UpdateStatus.UP_TO_DATE, "")
+
+    def test_changed_file_is_copied(self, tmp_path):
+        from openskills.updater import _update_skill_from_local
+        from openskills.metadata import read_skill_metadata
+        source, target, meta = self._installed(tmp_path)
+        (source / "SKILL.md").write_text("v2")
+
+        assert _update_skill_from_local(str(target), meta, "local") == (UpdateStatus.UPDATED, "")
+        assert (target / "SKILL.md").read_text() == "v2"
+        assert read_skill_metadata(str(target)).source_manifest["SKILL.md"][0] == 2
+
+
+class TestTransactionalBatch:
+    def _installed(self, tmp_path, count=3):
+        from openskills.installer import copy_skill
+        from openskills.metadata import read_skill_metadata
+        skills = []
+        for i in range(count):
+            source = tmp_path / f"src{i}"
+            source.mkdir()
+            (source / "SKILL.md").write_text("v1")
+            target = tmp_path / "installed" / f"s{i}"
+            copy_skill(str(source), str(target), _make_local_meta(str(source)))
+            (source / "SKILL.md").write_text("v2")
+            skills.append((_make_skill(f"s{i}", str(target)), read_skill_metadata(str(target))))
+        return skills
+
+    def _run(self, skills):
+        from openskills.updater import _run_update_groups
+        return _run_update_groups([[pair] for pair in skills], False)
+
+    def test_all_changed_skills_commit_together(self, tmp_path):
+        skills = self._installed(tmp_path)
+
+        results = self._run(skills)
+
+        assert all(result == (UpdateStatus.UPDATED, "") for result in results.values())
+        for skill, _ in skills:
+            assert open(os.path.join(skill.path, "SKILL.md")).read() == "v2"
+
+    def test_insufficient_disk_space_aborts_batch(self, tmp_path):
+        import shutil
+        skills = self._installed(tmp_path)
+        usage = shutil.disk_usage(tmp_path)
+
+        with patch("openskills.updater.shutil.disk_usage", return_value=usage._replace(free=0)):
+            results = self._run(skills)
+
+        assert all(status == UpdateStatus.FAILED for status, _ in results.values())
+        for skill, _ in skills:
+            assert open(os.path.join(skill.path, "SKILL.md")).read() == "v1"
+
+    def test_one_staging_failure_rolls_back_the_others(self, tmp_path):
+        from openskills.staging import stage_delta_tree
+        skills = self._installed(tmp_path)
+
+        def flaky_stage(source_dir, target_path, *args, **kwargs):
+            if target_path.endswith("s1"):
+                raise OSError("read-only file system")
+            return stage_delta_tree(source_dir, target_path, *args, **kwargs)
+
+        with patch("openskills.updater.stage_delta_tree", side_effect=flaky_stage):
+            results = self._run(skills)
+
+        assert results[skills[1][0].path][1].startswith("staging failed")
+        assert results[skills[0][0].path][1].startswith("rolled back")
+        for skill, _ in skills:
+            assert open(os.path.join(skill.path, "SKILL.md")).read() == "v1"
+        leftovers = [n for n in os.listdir(tmp_path / "installed") if n.startswith(".openskills-")]
+        assert leftovers == []
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from openskills.cli import cli
+from openskills.installer import copy_skill
+from openskills.metadata import read_skill_metadata
+from openskills.models import SkillSourceMetadata, SkillSourceType
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    registry = tmp_path / "registry"
+    registry.mkdir()
+    monkeypatch.setattr("openskills.registry.get_registry_dir", lambda: str(registry))
+    monkeypatch.setattr("openskills.finder.get_search_dirs", lambda: [str(tmp_path / ".agents" / "skills")])
+    monkeypatch.chdir(tmp_path)
+
+    for name in ("alpha", "beta"):
+        source = tmp_path / "sources" / name
+        (source / "scripts").mkdir(parents=True)
+        (source / "SKILL.md").write_text(f"---\nname: {name}\ndescription: d\n---\n")
+        (source / "scripts" / "run.py").write_text("print('hi')\n")
+        (source / "reference.md").write_text("# Reference\n")
+        copy_skill(str(source), str(tmp_path / ".agents" / "skills" / name), SkillSourceMetadata(
+            source=str(source), source_type=SkillSourceType.LOCAL, local_path=str(source),
+        ))
+    return tmp_path / ".agents" / "skills"
+
+
+def test_install_records_file_manifest(project):
+    manifest = read_skill_metadata(str(project / "alpha")).file_manifest
+    st = os.stat(project / "alpha" / "scripts" / "run.py")
+    assert sorted(manifest) == ["SKILL.md", "reference.md", "scripts/run.py"]
+    assert manifest["scripts/run.py"][1:] == [st.st_size, st.st_mtime_ns]
+
+
+def test_verify_reports_changes(project):
+    (project / "beta" / "scripts" / "run.py").write_text("print('tampered')\n")
+    (project / "beta" / "reference.md").unlink()
+    (project / "beta" / "notes.txt").write_text("x")
+
+    result = CliRunner().invoke(cli, ["verify"])
+
+    assert result.exit_code == 1
+    assert "✓ alpha" in result.output
+    assert "1 modified, 1 missing, 1 extra" in result.output
+    assert "M scripts/run.py" in result.output
+    assert "D reference.md" in result.output
+    assert "+ notes.txt" in result.output
+
+
+def test_verify_selected_skills_without_manifest(project):
+    metadata = read_skill_metadata(str(project / "alpha"))
+    metadata.file_manifest = None
+    from openskills.metadata import write_skill_metadata
+    write_skill_metadata(str(project / "alpha"), metadata)
+
+    result = CliRunner().invoke(cli, ["verify", "alpha", "--deep"])
+
+    assert result.exit_code == 0
+    assert "no file manifest recorded" in result.output
+    assert "beta" not in result.output
+    assert "0 intact, 0 changed, 1 without manifest" in result.output
@@ -1,45 +1,74 @@
-from openskills.yaml_utils import extract_yaml_field, has_valid_frontmatter
+def test_read_frontmatter_stops_at_closing_fence(tmp_path):
+    from openskills.yaml_utils import read_frontmatter
+    path = tmp_path / "SKILL.md"
+    path.write_text("---\nname: test\n---\nname: body-name\nlots of body\n", encoding="utf-8")
+    assert read_frontmatter(str(path)) == "---\nname: test\n---\n"
 
 
-def test_extract_yaml_field_finds_value():
-    content = "name: my-skill\ndescription: A skill\n"
-    assert extract_yaml_field(content, "name") == "my-skill"
-    assert extract_yaml_field(content, "description") == "A skill"
+def test_read_frontmatter_without_fence_reads_first_line_only(tmp_path):
+    from openskills.yaml_utils import read_frontmatter
+    path = tmp_path / "SKILL.md"
+    path.write_text("# Title\nname: x\n", encoding="utf-8")
+    content = read_frontmatter(str(path))
+    assert content == "# Title\n"
 
 
-def test_extract_yaml_field_missing_returns_empty():
-    content = "name: my-skill\n"
-    assert extract_yaml_field(content, "version") == ""
+def test_read_frontmatter_respects_byte_budget(tmp_path):
+    from openskills.yaml_utils import read_frontmatter
+    path = tmp_path / "SKILL.md"
+    path.write_text("---\n" + "key: value\n" * 1000, encoding="utf-8")
+    assert len(read_frontmatter(str(path), max_bytes=100)) < 120
 
 
-def test_extract_yaml_field_handles_whitespace():
-    content = "name:   my-skill  \n"
-    assert extract_yaml_field(content, "name") == "my-skill"
+def test_parse_frontmatter_reads_all_keys_in_one_pass():
+    from openskills.yaml_utils import parse_frontmatter
+    content = "---\nname: test\ndescription: A skill # comment\nversion: 1.0\n---\nname: body-name\n"
+    assert parse_frontmatter(content) == {"name": "test", "description": "A skill", "version": "1.0"}
 
 
-def test_extract_yaml_field_multiline():
-    content = "---\nname: test\nversion: 1.0\n---\nSome body text\n"
-    assert extract_yaml_field(content, "name") == "test"
-    assert extract_yaml_field(content, "version") == "1.0"
+def test_parse_frontmatter_without_fence_returns_none():
+    from openskills.yaml_utils import parse_frontmatter
+    assert parse_frontmatter("name: test\n") is None
+    assert parse_frontmatter("") is None
 
 
-def test_extract_yaml_field_case_sensitive():
-    content = "Name: my-skill\n"
-    assert extract_yaml_field(content, "name") == ""
-    assert extract_yaml_field(content, "Name") == "my-skill"
+def test_parse_frontmatter_quoted_scalars():
+    from openskills.yaml_utils import parse_frontmatter
+    content = "---\na: \"say \\\"hi\\\" \\u00e9\"\nb: 'it''s: fine'\nc: \"spans\n  two lines\"\n---\n"
+    assert parse_frontmatter(content) == {"a": 'say "hi" é', "b": "it's: fine", "c": "spans two lines"}
 
 
-def test_has_valid_frontmatter_true():
-    assert has_valid_frontmatter("---\nname: test\n---\nbody") is True
+def test_parse_frontmatter_block_and_plain_multiline_scalars():
+    from openskills.yaml_utils import parse_frontmatter
+    content = (
+        "---\n"
+        "literal: |\n  line one\n  line two\n"
+        "folded: >-\n  folded\n  text\n\n  next\n"
+        "plain: starts here\n  and continues\n"
+        "---\n"
+    )
+    assert parse_frontmatter(content) == {
+        "literal": "line one\nline two\n",
+        "folded": "folded text\nnext",
+        "plain": "starts here and continues",
+    }
 
 
-def test_has_valid_frontmatter_false():
-    assert has_valid_frontmatter("name: test\n") is False
+def test_parse_frontmatter_nested_values_are_empty():
+    from openskills.yaml_utils import parse_frontmatter
+    content = "---\nmetadata:\n  version: 2\ntools:\n  - Bash\nname: x\n---\n"
+    assert parse_frontmatter(content) == {"metadata": "", "tools": "", "name": "x"}
 
 
-def test_has_valid_frontmatter_strips_whitespace():
-    assert has_valid_frontmatter("  ---\nname: test\n") is True
+def test_read_skill_frontmatter_caches_by_file_identity(tmp_path):
+    from unittest.mock import patch
+    from openskills.yaml_utils import read_skill_frontmatter
+    path = tmp_path / "SKILL.md"
+    path.write_text("---\nname: first\n---\n", encoding="utf-8")
+    assert read_skill_frontmatter(str(path)) == {"name": "first"}
 
+    with patch("openskills.yaml_utils.read_frontmatter", side_effect=AssertionError("read")):
+        assert read_skill_frontmatter(str(path)) == {"name": "first"}
 
-def test_has_valid_frontmatter_empty_string():
-    assert has_valid_frontmatter("") is False
+    path.write_text("---\nname: second-version\n---\n", encoding="utf-8")
+    assert read_skill_frontmatter(str(path)) == {"name": "second-version"}